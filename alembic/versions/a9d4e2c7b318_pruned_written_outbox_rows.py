@@ -0,0 +1,29 @@
+"""Pruned written chunk_outbox rows
+
+Revision ID: a9d4e2c7b318
+Revises: f2b7c4e90a15
+Create Date: 2026-10-18 21:12:40.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4e2c7b318'
+down_revision: Union[str, Sequence[str], None] = 'f2b7c4e90a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Replays now delete rows once written, the ones kept before only held dead payloads
+    op.execute("DELETE FROM chunk_outbox WHERE state = 'WRITTEN'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
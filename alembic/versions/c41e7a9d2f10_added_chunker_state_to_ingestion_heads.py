@@ -0,0 +1,32 @@
+"""Added chunker_state to ingestion_heads
+
+Existing heads keep a NULL chunker_state; the next ingestion of such a session deletes its
+chunks from Weaviate and re-chunks it from the start to seed the state.
+
+Revision ID: c41e7a9d2f10
+Revises: b3fb426ff74e
+Create Date: 2026-10-18 09:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7a9d2f10'
+down_revision: Union[str, Sequence[str], None] = 'b3fb426ff74e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ingestion_heads', sa.Column('chunker_state', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('ingestion_heads', 'chunker_state')
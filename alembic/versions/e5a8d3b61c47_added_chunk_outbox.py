@@ -0,0 +1,44 @@
+"""Added chunk_outbox
+
+Revision ID: e5a8d3b61c47
+Revises: c41e7a9d2f10
+Create Date: 2026-10-18 14:03:11.527840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a8d3b61c47'
+down_revision: Union[str, Sequence[str], None] = 'c41e7a9d2f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chunk_outbox',
+    sa.Column('chunk_id', sa.UUID(), nullable=False),
+    sa.Column('session_id', sa.UUID(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('embedding', postgresql.ARRAY(sa.Float()), nullable=True),
+    sa.Column('state', sa.Enum('PENDING', 'WRITTEN', 'FAILED', name='outboxstate'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['chat_sessions.id'], ),
+    sa.PrimaryKeyConstraint('chunk_id')
+    )
+    op.create_index('ix_chunk_outbox_session_state', 'chunk_outbox', ['session_id', 'state'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chunk_outbox_session_state', table_name='chunk_outbox')
+    op.drop_table('chunk_outbox')
+    sa.Enum(name='outboxstate').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""Added partial index on unvectorized chat_messages
+
+Revision ID: f2b7c4e90a15
+Revises: e5a8d3b61c47
+Create Date: 2026-10-18 16:41:27.904316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7c4e90a15'
+down_revision: Union[str, Sequence[str], None] = 'e5a8d3b61c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Messages inserted before is_vectorized had a default may be NULL, the sweep treats them as pending
+    op.execute("UPDATE chat_messages SET is_vectorized = false WHERE is_vectorized IS NULL")
+    op.create_index(
+        'ix_chat_messages_unvectorized', 'chat_messages', ['session_id', 'position'],
+        unique=False, postgresql_where=sa.text('is_vectorized IS false')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_messages_unvectorized', table_name='chat_messages', postgresql_where=sa.text('is_vectorized IS false'))
@@ -1,7 +1,16 @@
+import asyncio
 from app.conn.weaviate_client import WeaviateClient
 
-print("Trying to connect to weaviate...")
-weaviate_wrapper = WeaviateClient()
-weaviate_wrapper.init_client()
-print("Closing the connection")
-weaviate_wrapper.close()
\ No newline at end of file
+
+async def main():
+    print("Trying to connect to weaviate...")
+    weaviate_wrapper = WeaviateClient(size=1)
+    await weaviate_wrapper.init_client()
+    async with weaviate_wrapper.borrow() as client:
+        print(f"Ready: {await client.is_ready()}")
+    print("Closing the connection")
+    await weaviate_wrapper.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
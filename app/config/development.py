@@ -3,10 +3,16 @@ from .services.base import BaseAppSettings
 from .services.database import DatabaseSettings
 from .services.weaviate import WeaviateSettings
 from .services.cognitive import CognitiveSettings
+from .services.serving import ServingSettings
+from .services.cache import CacheSettings
+from .services.ingestion import IngestionSettings
 from pydantic import Field
 
 class DevelopmentSettings(BaseAppSettings):
     app: BaseAppSettings = Field(default_factory=BaseAppSettings)
     database: DatabaseSettings = Field(default_factory=DatabaseSettings)
     weaviate: WeaviateSettings = Field(default_factory=WeaviateSettings)
-    cognitive: CognitiveSettings = Field(default_factory=CognitiveSettings)
\ No newline at end of file
+    cognitive: CognitiveSettings = Field(default_factory=CognitiveSettings)
+    serving: ServingSettings = Field(default_factory=ServingSettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    ingestion: IngestionSettings = Field(default_factory=IngestionSettings)
\ No newline at end of file
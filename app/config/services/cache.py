@@ -0,0 +1,19 @@
+from pydantic_settings import BaseSettings
+from pathlib import Path
+from typing import Optional
+
+class CacheSettings(BaseSettings):
+    embed_cache_size: int = 50_000
+    embed_cache_path: Optional[str] = None
+    embed_cache_disk_max_entries: Optional[int] = None
+    emotion_cache_size: int = 20_000
+    # Shared between uvicorn workers when set, in-process otherwise
+    emotion_cache_path: Optional[str] = None
+    emotion_cache_ttl_seconds: Optional[float] = 7 * 24 * 3600
+
+    model_config = {
+        "env_file": str(Path(__file__).resolve().parents[3] / ".env"),
+        "env_file_encoding": "utf-8",
+        "env_prefix": "DEV_CACHE_",
+        "extra": "ignore"
+    }
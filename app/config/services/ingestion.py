@@ -0,0 +1,34 @@
+from pydantic_settings import BaseSettings
+from pathlib import Path
+from typing import Optional
+
+class IngestionSettings(BaseSettings):
+    weaviate_batch_size: int = 200
+    weaviate_concurrency: int = 4
+    weaviate_lookup_batch_size: int = 1000
+    worker_concurrency: int = 4
+    worker_coalesce_ms: float = 200.0
+    # Pending-session sweep, 0 disables it
+    worker_sweep_interval_s: float = 30.0
+    worker_sweep_limit: int = 500
+    pipeline_batch_size: int = 64
+    # Messages per keyset page read by ingestion, memory stays flat however long the session
+    message_page_size: int = 1000
+    pipeline_queue_size: int = 4
+    # Near-duplicate windows within a session, SimHash Hamming distance (out of 64 bits), -1 disables
+    dedup_max_distance: int = 3
+    dedup_history: int = 512
+    # Chunks that failed to reach Weaviate are replayed from the outbox, rows per replay and attempts before giving up
+    outbox_replay_limit: int = 1000
+    outbox_max_attempts: int = 5
+    backfill_page_size: int = 1000
+    backfill_queue_size: int = 4
+    backfill_checkpoint_path: Optional[str] = str(Path(__file__).resolve().parents[3] / "checkpoints" / "backfill.json")
+    backfill_progress_interval_s: float = 5.0
+
+    model_config = {
+        "env_file": str(Path(__file__).resolve().parents[3] / ".env"),
+        "env_file_encoding": "utf-8",
+        "env_prefix": "DEV_INGEST_",
+        "extra": "ignore"
+    }
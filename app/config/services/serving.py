@@ -0,0 +1,28 @@
+from pydantic_settings import BaseSettings
+from pathlib import Path
+from typing import Literal
+
+class ServingSettings(BaseSettings):
+    model_provider: Literal["http", "local"] = "http"
+    local_workers: int = 2
+    rerank_batch_window_ms: float = 5.0
+    rerank_max_batch: int = 64
+    embed_batch_window_ms: float = 2.0
+    embed_max_batch: int = 64
+    embed_workers: int = 2
+    embed_query_max_texts: int = 4
+    emotion_max_batch: int = 32
+    emotion_max_tokens: int = 256
+    emotion_bucket_width: int = 16
+    emotion_infer_batch: int = 32
+    embed_backend: Literal["torch", "onnx", "onnx-int8"] = "torch"
+    rerank_backend: Literal["torch", "onnx", "onnx-int8"] = "torch"
+    onnx_quantization: Literal["arm64", "avx2", "avx512", "avx512_vnni"] = "avx512_vnni"
+    onnx_export_dir: str = str(Path(__file__).resolve().parents[3] / "models" / "onnx")
+
+    model_config = {
+        "env_file": str(Path(__file__).resolve().parents[3] / ".env"),
+        "env_file_encoding": "utf-8",
+        "env_prefix": "DEV_SERVE_",
+        "extra": "ignore"
+    }
@@ -8,6 +8,9 @@ class WeaviateSettings(BaseSettings):
     weav_grpc: int
     weav_class: str
     weav_collection: str
+    # Long-lived clients lent to concurrent callers, health-checked on borrow at most this often
+    weav_pool_size: int = 2
+    weav_health_interval_s: float = 10.0
 
     model_config = {
         "env_file": str(Path(__file__).resolve().parents[3] / ".env"),
@@ -1,5 +1,7 @@
 import httpx
+import numpy as np
 from tenacity import retry, stop_after_attempt, wait_exponential
+from app.schemas.vectorize_schema import EMBEDDING_MEDIA_TYPES, EMBEDDING_SHAPE_HEADER
 
 DEFAULT_TIMEOUT = httpx.Timeout(connect=2.0, read=20.0, write=5.0, pool=10.0)
 _client: httpx.AsyncClient | None = None
@@ -16,7 +18,19 @@ async def post_json(client: httpx.AsyncClient, url: str, payload: dict) -> dict:
     resp.raise_for_status()
     return resp.json()
 
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.5, max=4))
+async def post_embeddings(client: httpx.AsyncClient, url: str, payload: dict, media_type: str = "application/x-embedding-f32") -> np.ndarray:
+    """Requests embeddings as raw little-endian bytes, falls back to the JSON body"""
+    resp = await client.post(url, json=payload, headers={"Accept": f"{media_type}, application/json;q=0.5"})
+    resp.raise_for_status()
+    content_type = resp.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in EMBEDDING_MEDIA_TYPES:
+        shape = tuple(int(dim) for dim in resp.headers[EMBEDDING_SHAPE_HEADER].split(","))
+        # Zero-copy view over the response body
+        return np.frombuffer(resp.content, dtype=EMBEDDING_MEDIA_TYPES[content_type]).reshape(shape)
+    return np.asarray(resp.json()["vector"], dtype=np.float32)
+
 async def get_json(client: httpx.AsyncClient, url: str) -> dict:
     resp = await client.get(url)
     resp.raise_for_status()
-    return resp.json()
\ No newline at end of file
+    return resp.json()
@@ -1,30 +1,72 @@
+import asyncio
+import itertools
+import time
 import weaviate
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List
 from weaviate.classes.init import Auth
 from app.config.settings import settings
 from app.shared.logger import get_logger
 
 logger = get_logger(__name__)
 
+
+@dataclass
+class _Slot:
+    client: weaviate.WeaviateAsyncClient
+    checked_at: float = field(default_factory=time.monotonic)
+    active: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Borrowers per client (by id), a replaced client still held is retired and closed by its last borrower
+    holders: Dict[int, int] = field(default_factory=dict)
+    retired: List[weaviate.WeaviateAsyncClient] = field(default_factory=list)
+
+
 class WeaviateClient:
-    def __init__(self):
+    """
+    Long-lived Weaviate connections shared by the whole process.
+    Holds size connected async clients; borrow() lends the least busy one without
+    handing over its lifecycle (calls multiplex on its gRPC channel, borrowing is not
+    exclusive). A client is health-checked on borrow once health_interval seconds have
+    passed, or right away after an error inside a borrow, and reconnected if not ready;
+    the replaced client is closed once the borrowers still holding it are done.
+    """
+    def __init__(self, size: int = settings.weaviate.weav_pool_size, health_interval: float = settings.weaviate.weav_health_interval_s):
+        self.size = max(1, size)
+        self.health_interval = health_interval
         self.client: weaviate.WeaviateAsyncClient | None = None
+        self._slots: List[_Slot] = []
+        self._order = itertools.count()
+        self.borrows = 0
+        self.reconnects = 0
+        self.failed_checks = 0
+
+    def _new_client(self) -> weaviate.WeaviateAsyncClient:
+        return weaviate.WeaviateAsyncClient(
+            connection_params=weaviate.connect.ConnectionParams.from_params(
+                http_host=settings.weaviate.weav_host,
+                http_secure=False,
+                http_port=settings.weaviate.weav_port,
+                grpc_host=settings.weaviate.weav_host,
+                grpc_port=settings.weaviate.weav_grpc,
+                grpc_secure=False,
+            ),
+            auth_client_secret=Auth.api_key(settings.weaviate.weav_api_key),
+        )
+
+    async def _connect(self) -> weaviate.WeaviateAsyncClient:
+        client = self._new_client()
+        await client.connect()
+        return client
 
     async def init_client(self):
         try:
-            self.client = weaviate.WeaviateAsyncClient(
-                connection_params=weaviate.connect.ConnectionParams.from_params(
-                    http_host=settings.weaviate.weav_host,
-                    http_secure=False,
-                    http_port=settings.weaviate.weav_port,
-                    grpc_host=settings.weaviate.weav_host,
-                    grpc_port=settings.weaviate.weav_grpc,
-                    grpc_secure=False,
-                ),
-                auth_client_secret=Auth.api_key(settings.weaviate.weav_api_key),
-            )
-            await self.client.connect()
+            clients = await asyncio.gather(*(self._connect() for _ in range(self.size)))
+            self._slots = [_Slot(client) for client in clients]
+            self.client = self._slots[0].client
             ready = await self.client.is_ready()
-            logger.info(f"Weaviate client initialized: {ready}")
+            logger.info(f"Weaviate client pool initialized ({self.size} clients): {ready}")
         except Exception as e:
             logger.error(f"Weaviate client initialization failed: {str(e)}")
             raise
@@ -34,8 +76,84 @@ class WeaviateClient:
             raise RuntimeError("Weaviate client not initialized")
         return self.client
 
+    async def _ready(self, client: weaviate.WeaviateAsyncClient) -> bool:
+        try:
+            return client.is_connected() and await client.is_ready()
+        except Exception as e:
+            logger.warning(f"Weaviate health check failed: {str(e)}")
+            return False
+
+    async def _check(self, slot: _Slot) -> None:
+        async with slot.lock:
+            # Another borrower may have checked or replaced it while this one waited
+            if time.monotonic() - slot.checked_at < self.health_interval:
+                return
+            if not await self._ready(slot.client):
+                self.failed_checks += 1
+                logger.warning("Weaviate client not ready, reconnecting")
+                stale, slot.client = slot.client, await self._connect()
+                if slot is self._slots[0]:
+                    self.client = slot.client
+                self.reconnects += 1
+                if slot.holders.get(id(stale)):
+                    slot.retired.append(stale)
+                else:
+                    await self._close_stale(stale)
+            slot.checked_at = time.monotonic()
+
+    @staticmethod
+    async def _close_stale(client: weaviate.WeaviateAsyncClient) -> None:
+        try:
+            await client.close()
+        except Exception as e:
+            logger.debug(f"Closing stale Weaviate client failed: {str(e)}")
+
+    @asynccontextmanager
+    async def borrow(self) -> AsyncIterator[weaviate.WeaviateAsyncClient]:
+        """Least busy pooled client for the duration of the block, never close it"""
+        if not self._slots:
+            raise RuntimeError("Weaviate client not initialized")
+        # Ties go round-robin so idle clients take turns
+        start = next(self._order) % len(self._slots)
+        slot = min(self._slots[start:] + self._slots[:start], key=lambda s: s.active)
+        if time.monotonic() - slot.checked_at >= self.health_interval:
+            await self._check(slot)
+        client = slot.client
+        slot.active += 1
+        slot.holders[id(client)] = slot.holders.get(id(client), 0) + 1
+        self.borrows += 1
+        try:
+            yield client
+        except Exception:
+            # Check it on the next borrow, the error may have been the connection
+            if client is slot.client:
+                slot.checked_at = float("-inf")
+            raise
+        finally:
+            slot.active -= 1
+            slot.holders[id(client)] -= 1
+            if not slot.holders[id(client)]:
+                del slot.holders[id(client)]
+                if any(stale is client for stale in slot.retired):
+                    slot.retired = [stale for stale in slot.retired if stale is not client]
+                    await self._close_stale(client)
+
+    def metrics(self) -> dict:
+        return {
+            "size": len(self._slots),
+            "active": [slot.active for slot in self._slots],
+            "borrows": self.borrows,
+            "reconnects": self.reconnects,
+            "failed_checks": self.failed_checks,
+            "retired": sum(len(slot.retired) for slot in self._slots),
+        }
+
     async def close(self):
-        if self.client:
-            await self.client.close()
+        slots, self._slots = self._slots, []
+        for slot in slots:
+            for stale in slot.retired:
+                await self._close_stale(stale)
+            await slot.client.close()
+        if slots:
             logger.info("Weaviate Client closed")
-            self.client = None
\ No newline at end of file
+        self.client = None
@@ -1,11 +1,10 @@
+import asyncio
 from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.responses import JSONResponse
 from app.schemas.emotion_schema import EmotionInput, EmotionResponse
 from contextlib import asynccontextmanager
 from tenacity import retry, stop_after_attempt, wait_exponential
-from optimum.onnxruntime import ORTModelForSequenceClassification
-from app.data_pipeline.helper.helperOnnx import OnnxPipeline
-from functools import lru_cache
+from app.data_pipeline.helper.helperOnnx import OnnxEmotionEngine, EMOTION_MODEL, EMOTION_MODEL_FILE, get_emotion_cache
 from typing import List
 # import logging
 from app.shared.logger import get_logger
@@ -16,20 +15,21 @@ logger = get_logger("emotion_app")
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
     logger.info("Loading emotion model...")
     app.state.model = ORTModelForSequenceClassification.from_pretrained(
-            "SamLowe/roberta-base-go_emotions-onnx",
+            EMOTION_MODEL,
             subfolder="onnx",
-            file_name="model_quantized.onnx"
+            file_name=EMOTION_MODEL_FILE
         )
-    pipe = OnnxPipeline()
-    pipe.init_pipeline(model=app.state.model)
-    app.state.pipeline = pipe.get()
+    app.state.engine = OnnxEmotionEngine(model=app.state.model, cache=get_emotion_cache())
     
     logger.info("Model loaded successfully.")
     yield
 
     #cleanup model
+    app.state.engine = None
     app.state.model = None
     logger.info("Model cleaned up.")
 
@@ -40,24 +40,31 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-@lru_cache(maxsize=1024)
 def get_emotions(text: str, k: int = 2) -> List[str]:
     """
     Predicts the top-k emotions from a given string using ONNX-optimized RoBERTa.
-    Caches results for repeated text inputs.
+    Results are cached by text hash and model version, shared between workers.
+    """
+    return app.state.engine.top_k([text], k=k)[0]
+
+def get_emotions_batch(texts: List[str], k: int = 2) -> List[List[str]]:
+    """
+    Predicts the top-k emotions for many texts in length-bucketed batches.
+    Duplicate and cached texts are scored once.
     """
-    onnx_classifier = app.state.pipeline
-    result = onnx_classifier(text)
-    top_k = sorted(result[0], key=lambda x: x["score"], reverse=True)[:k]
-    return [label["label"] for label in top_k]
+    return app.state.engine.top_k(texts, k=k)
 
 @app.post("/emotion-score", response_model=EmotionResponse)
 async def emotion_score(input: EmotionInput):
     if not input.text:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Input text is empty")
     try:
+        # Inference and the cache lookups block, a worker thread keeps the loop free for /health
+        if isinstance(input.text, list):
+            logger.info(f"Received batch request with {len(input.text)} texts")
+            return EmotionResponse(emotions=await asyncio.to_thread(get_emotions_batch, texts=input.text))
         logger.info(f"Received request with {len(input.text)} chars")
-        emotions = get_emotions(text=input.text)
+        emotions = await asyncio.to_thread(get_emotions, text=input.text)
         return EmotionResponse(emotions=emotions)
 
     except Exception as e:
@@ -70,11 +77,12 @@ async def emotion_score(input: EmotionInput):
 async def health(request: Request):
     model = request.app.state.model
     try:
-        onnx_classifier = app.state.pipeline
-        _ = onnx_classifier("ping")
+        # Straight through the model, the label cache would answer a repeated ping
+        _ = await asyncio.to_thread(app.state.engine.predict_proba, ["ping"])
         return {
             "status_ok": True,
-            "model_name": "SamLowe/roberta-base-go_emotions-onnx"
+            "model_name": EMOTION_MODEL,
+            "cache": app.state.engine.cache.metrics()
         }
     except Exception as e:
         logger.error(f"Emotion health check failed: {e}")
@@ -3,22 +3,39 @@ from fastapi.responses import JSONResponse
 from app.schemas.rerank_schema import RerankInput, RerankResponse
 from contextlib import asynccontextmanager
 from tenacity import retry, stop_after_attempt, wait_exponential
-from sentence_transformers import CrossEncoder
+from app.core.factory.backends import load_reranker_model, RERANKER_MODEL
+from app.config.settings import settings
+from app.shared.batching import MicroBatcher
 # import logging
 from app.shared.logger import get_logger
 
 # logging.basicConfig(level=logging.INFO)
 logger = get_logger("reranker_app")
 
+def predict_batch(pairs):
+    """Runs one batched cross-encoder pass, called from the batcher's worker thread"""
+    if not app.state.model:
+        return [0.0] * len(pairs)
+    scores = app.state.model.predict(pairs, batch_size=settings.serving.rerank_max_batch, convert_to_numpy=True)
+    return scores.astype(float).tolist()
+
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Loading reranker model...")
-    app.state.model = CrossEncoder('cross-encoder/ms-marco-MiniLM-L-6-v2')
+    app.state.model = load_reranker_model()
+    app.state.batcher = MicroBatcher(
+        predict_batch,
+        max_batch_size=settings.serving.rerank_max_batch,
+        window_ms=settings.serving.rerank_batch_window_ms,
+        name="rerank-batcher"
+    )
+    app.state.batcher.start()
     logger.info("Model loaded successfully.")
     yield
 
     #cleanup model
+    await app.state.batcher.stop()
     app.state.model = None
     logger.info("Model cleaned up.")
 
@@ -34,9 +51,10 @@ async def rerank(input: RerankInput):
     if not input.text_list:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Input text list is empty")
     try:
-        logger.info(f"Received request with {len(input.text_list)} texts")
-        score = float(app.state.model.predict(input.text_list)[0]) if app.state.model else 0.0
-        return RerankResponse(score=score)
+        logger.info(f"Received request with {len(input.text_list)} pairs")
+        # Pairs from concurrent requests share one batched forward pass
+        scores = await app.state.batcher.submit(input.text_list)
+        return RerankResponse(scores=scores)
 
     except Exception as e:
         logger.exception("Reranikng failed")
@@ -48,11 +66,18 @@ async def rerank(input: RerankInput):
 async def health():
     """Check if the reranker model is live or not"""
     try:
-        _ = app.state.model.predict(["ping","ping"])
+        _ = await app.state.batcher.submit([["ping","ping"]])
         return {
             "status_ok": True,
-            "model_name": "cross-encoder/ms-marco-MiniLM-L-6-v2"
+            "model_name": RERANKER_MODEL,
+            "backend": settings.serving.rerank_backend,
+            "batching": app.state.batcher.metrics()
         }
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Model down")
+
+@app.get("/metrics")
+async def metrics():
+    """Batch queue depth and batch-size histogram"""
+    return app.state.batcher.metrics()
@@ -1,24 +1,49 @@
-from fastapi import FastAPI, Request, HTTPException, status
-from fastapi.responses import JSONResponse
-from app.schemas.vectorize_schema import VectorResponse, VectorInput
+from fastapi import FastAPI, Request, HTTPException, Header, status
+from fastapi.responses import JSONResponse, Response
+from app.schemas.vectorize_schema import VectorResponse, VectorInput, EMBEDDING_MEDIA_TYPES, EMBEDDING_SHAPE_HEADER
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from tenacity import retry, stop_after_attempt, wait_exponential
-from sentence_transformers import SentenceTransformer
+from app.core.factory.backends import load_embedding_model, EMBEDDING_MODEL
+from app.config.settings import settings
+from app.shared.batching import MicroBatcher
+import numpy as np
 # import logging
 from app.shared.logger import get_logger
 
 # logging.basicConfig(level=logging.INFO)
 logger = get_logger("vectorizer_app")
 
+def encode_batch(texts):
+    """Encodes one coalesced batch, called from the scheduler's thread pool"""
+    return app.state.model.encode(texts, batch_size=settings.serving.embed_max_batch, convert_to_numpy=True)
+
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Loading embedding model...")
-    app.state.model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+    app.state.model = load_embedding_model()
+    app.state.executor = ThreadPoolExecutor(
+        max_workers=settings.serving.embed_workers,
+        thread_name_prefix="embed"
+    )
+    # Query embeddings are always served ahead of bulk ingestion batches
+    app.state.scheduler = MicroBatcher(
+        encode_batch,
+        max_batch_size=settings.serving.embed_max_batch,
+        window_ms=settings.serving.embed_batch_window_ms,
+        executor=app.state.executor,
+        name="embed-scheduler",
+        lanes=("query", "bulk"),
+        workers=settings.serving.embed_workers
+    )
+    app.state.scheduler.start()
     logger.info("Model loaded successfully.")
     yield
 
     #cleanup model
+    await app.state.scheduler.stop()
+    app.state.executor.shutdown(wait=False, cancel_futures=True)
     app.state.model = None
     logger.info("Model cleaned up.")
 
@@ -29,14 +54,37 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+def resolve_lane(input: VectorInput) -> str:
+    if input.priority:
+        return input.priority
+    return "query" if len(input.text) <= settings.serving.embed_query_max_texts else "bulk"
+
+def negotiate(accept: str | None) -> str | None:
+    """Picks the first binary embedding media type the client accepts, JSON otherwise"""
+    for part in (accept or "").split(","):
+        media_type = part.split(";")[0].strip()
+        if media_type in EMBEDDING_MEDIA_TYPES:
+            return media_type
+    return None
+
 @app.post("/vectorize", response_model=VectorResponse)
-async def vectorize(input: VectorInput):
+async def vectorize(input: VectorInput, accept: str | None = Header(None)):
     if not input.text:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Input text list is empty")
     try:
-        logger.info(f"Received request with {len(input.text)} texts")
-        vectors = app.state.model.encode(input.text, convert_to_numpy=True).tolist()
-        return VectorResponse(vector=vectors)
+        lane = resolve_lane(input)
+        logger.info(f"Received request with {len(input.text)} texts on {lane} lane")
+        vectors = np.asarray(await app.state.scheduler.submit(input.text, lane=lane))
+
+        media_type = negotiate(accept)
+        if media_type:
+            body = vectors.astype(EMBEDDING_MEDIA_TYPES[media_type], copy=False).tobytes()
+            return Response(
+                content=body,
+                media_type=media_type,
+                headers={EMBEDDING_SHAPE_HEADER: ",".join(str(dim) for dim in vectors.shape)}
+            )
+        return VectorResponse(vector=vectors.tolist())
 
     except Exception as e:
         logger.exception("Vectorization failed")
@@ -48,11 +96,18 @@ async def vectorize(input: VectorInput):
 async def health():
     """Check if the vectorizer model is live or not"""
     try:
-        _ = app.state.model.encode(["ping"], convert_to_numpy=True)
+        _ = await app.state.scheduler.submit(["ping"], lane="query")
         return {
             "status_ok": True,
-            "model_name": "sentence-transformers/all-MiniLM-L6-v2"
+            "model_name": EMBEDDING_MODEL,
+            "backend": settings.serving.embed_backend,
+            "batching": app.state.scheduler.metrics()
         }
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Model down")
+
+@app.get("/metrics")
+async def metrics():
+    """Per-lane queue depth and batch-size histogram"""
+    return app.state.scheduler.metrics()
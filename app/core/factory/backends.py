@@ -0,0 +1,62 @@
+import os
+from typing import TYPE_CHECKING, Literal
+from app.config.settings import settings
+from app.shared.logger import get_logger
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer, CrossEncoder
+
+logger = get_logger(__name__)
+
+Backend = Literal["torch", "onnx", "onnx-int8"]
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+RERANKER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+
+def _quantized_file(quantization: str) -> str:
+    """File export_dynamic_quantized_onnx_model writes, named after the config's weight dtype (quint8 for avx2)"""
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    config = getattr(AutoQuantizationConfig, quantization)(is_static=False)
+    return f"onnx/model_{config.weights_dtype.name.lower()}_{quantization}.onnx"
+
+
+def _export_dir(model_name: str) -> str:
+    return os.path.join(settings.serving.onnx_export_dir, model_name.replace("/", "__"))
+
+
+def _load(model_cls, model_name: str, backend: Backend, **kwargs):
+    if backend == "torch":
+        return model_cls(model_name, **kwargs)
+    if backend == "onnx":
+        return model_cls(model_name, backend="onnx", **kwargs)
+    if backend != "onnx-int8":
+        raise ValueError(f"Unsupported backend '{backend}'. Supported: torch, onnx, onnx-int8")
+
+    quantization = settings.serving.onnx_quantization
+    file_name = _quantized_file(quantization)
+    export_dir = _export_dir(model_name)
+
+    if not os.path.exists(os.path.join(export_dir, file_name)):
+        # Export once: ONNX graph from the hub model, then dynamic int8 quantization next to it
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        logger.info(f"Exporting {model_name} to int8 ONNX ({quantization}) at {export_dir}")
+        onnx_model = model_cls(model_name, backend="onnx", **kwargs)
+        onnx_model.save_pretrained(export_dir)
+        export_dynamic_quantized_onnx_model(onnx_model, quantization, export_dir)
+
+    return model_cls(export_dir, backend="onnx", model_kwargs={"file_name": file_name}, **kwargs)
+
+
+def load_embedding_model(backend: Backend | None = None, device: str | None = None) -> "SentenceTransformer":
+    from sentence_transformers import SentenceTransformer
+    backend = backend or settings.serving.embed_backend
+    logger.info(f"Loading embedding model {EMBEDDING_MODEL} with {backend} backend")
+    return _load(SentenceTransformer, EMBEDDING_MODEL, backend, device=device)
+
+
+def load_reranker_model(backend: Backend | None = None, device: str | None = None) -> "CrossEncoder":
+    from sentence_transformers import CrossEncoder
+    backend = backend or settings.serving.rerank_backend
+    logger.info(f"Loading reranker model {RERANKER_MODEL} with {backend} backend")
+    return _load(CrossEncoder, RERANKER_MODEL, backend, device=device)
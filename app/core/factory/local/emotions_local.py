@@ -1,4 +1,5 @@
 from optimum.onnxruntime import ORTModelForSequenceClassification
+from app.data_pipeline.helper.helperOnnx import EMOTION_MODEL, EMOTION_MODEL_FILE
 from app.shared.logger import get_logger
 
 logger = get_logger(__name__)
@@ -11,9 +12,9 @@ class EmotionFactory:
         if cls._model_instance is None:
             logger.info("Initializing emotion classification model")
             cls._model_instance = ORTModelForSequenceClassification.from_pretrained(
-            "SamLowe/roberta-base-go_emotions-onnx",
+            EMOTION_MODEL,
             subfolder="onnx",
-            file_name="model_quantized.onnx"
+            file_name=EMOTION_MODEL_FILE
         )
         return cls._model_instance
 
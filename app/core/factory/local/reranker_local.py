@@ -1,4 +1,4 @@
-from sentence_transformers import CrossEncoder
+from app.core.factory.backends import load_reranker_model
 from app.shared.logger import get_logger
 
 logger = get_logger(__name__)
@@ -10,7 +10,7 @@ class RerankerFactory:
     def get_reranker_model(cls):
         if cls._reranker_instance is None:
             logger.info("Initializing reranker model")
-            cls._reranker_instance = CrossEncoder('cross-encoder/ms-marco-MiniLM-L-6-v2')
+            cls._reranker_instance = load_reranker_model()
 
         return cls._reranker_instance
 
@@ -1,4 +1,4 @@
-from sentence_transformers import SentenceTransformer
+from app.core.factory.backends import load_embedding_model
 from app.shared.logger import get_logger
 
 logger = get_logger(__name__)
@@ -10,9 +10,7 @@ class EmbeddingFactory:
     def get_embedding_model(cls):
         if cls._embedding_instance is None:
             logger.info("Initializing sentence transformer model")
-            cls._embedding_instance = SentenceTransformer(
-                "sentence-transformers/all-MiniLM-L6-v2", device='cpu'
-            )
+            cls._embedding_instance = load_embedding_model(device='cpu')
         return cls._embedding_instance
 
     @classmethod
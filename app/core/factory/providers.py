@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import numpy as np
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Literal
+from httpx import AsyncClient
+from app.config.settings import settings
+from app.conn.clients import post_json, post_embeddings, get_json
+from app.shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+vectorizer_url = "http://127.0.0.1:8083"
+reranker_url = "http://127.0.0.1:8081"
+emotion_url = "http://127.0.0.1:8082"
+
+Priority = Literal["query", "bulk"]
+
+
+class ModelProvider(ABC):
+    """Embedding, rerank and emotion inference, wherever the models run"""
+
+    @abstractmethod
+    async def embed(self, texts: List[str], priority: Priority = "bulk") -> np.ndarray:
+        ...
+
+    @abstractmethod
+    async def rerank(self, pairs: List[List[str]]) -> List[float]:
+        ...
+
+    @abstractmethod
+    async def emotions(self, text: str) -> List[str]:
+        ...
+
+    @abstractmethod
+    async def emotions_batch(self, texts: List[str]) -> List[List[str]]:
+        ...
+
+    @abstractmethod
+    async def health(self) -> dict:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class HttpModelProvider(ModelProvider):
+    """Calls the vectorizer, reranker and emotion API services"""
+    def __init__(self, client: AsyncClient):
+        self.client = client
+
+    async def embed(self, texts: List[str], priority: Priority = "bulk") -> np.ndarray:
+        return await post_embeddings(self.client, f"{vectorizer_url}/vectorize", {"text": texts, "priority": priority})
+
+    async def rerank(self, pairs: List[List[str]]) -> List[float]:
+        resp = await post_json(self.client, f"{reranker_url}/rerank", {"text_list": pairs})
+        return resp.get("scores", [])
+
+    async def emotions(self, text: str) -> List[str]:
+        resp = await post_json(self.client, f"{emotion_url}/emotion-score", {"text": text})
+        return resp.get("emotions", [])
+
+    async def emotions_batch(self, texts: List[str]) -> List[List[str]]:
+        resp = await post_json(self.client, f"{emotion_url}/emotion-score", {"text": texts})
+        return resp.get("emotions", [])
+
+    async def health(self) -> dict:
+        v, r, e = await asyncio.gather(
+            get_json(self.client, f"{vectorizer_url}/health"),
+            get_json(self.client, f"{reranker_url}/health"),
+            get_json(self.client, f"{emotion_url}/health"),
+        )
+        return {"vectorizer": v, "reranker": r, "emotion": e}
+
+
+class LocalModelProvider(ModelProvider):
+    """
+    Runs the models in process on a dedicated thread pool,
+    no serialization or network hop for single-node deployments.
+    """
+    def __init__(self, workers: int = settings.serving.local_workers):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="model")
+        self._emotion_model = None
+        # Models load lazily on first use, possibly from several pool threads at once
+        self._load_lock = threading.Lock()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        from app.core.factory.local.vectorizer_local import EmbeddingFactory
+        with self._load_lock:
+            model = EmbeddingFactory.get_embedding_model()
+        return model.encode(texts, batch_size=settings.serving.embed_max_batch, convert_to_numpy=True)
+
+    def _predict(self, pairs: List[List[str]]) -> List[float]:
+        from app.core.factory.local.reranker_local import RerankerFactory
+        with self._load_lock:
+            model = RerankerFactory.get_reranker_model()
+        return model.predict(pairs, batch_size=settings.serving.rerank_max_batch, convert_to_numpy=True).astype(float).tolist()
+
+    def _emotion(self):
+        with self._load_lock:
+            if self._emotion_model is None:
+                from app.core.strategy.get_emotions import RoBertEmotionGo
+                self._emotion_model = RoBertEmotionGo()
+        return self._emotion_model
+
+    def _classify(self, text: str) -> List[str]:
+        return self._emotion().get_emotions(text)
+
+    def _classify_batch(self, texts: List[str]) -> List[List[str]]:
+        return self._emotion().get_emotions_batch(texts)
+
+    async def embed(self, texts: List[str], priority: Priority = "bulk") -> np.ndarray:
+        return await self._run(self._encode, texts)
+
+    async def rerank(self, pairs: List[List[str]]) -> List[float]:
+        return await self._run(self._predict, pairs)
+
+    async def emotions(self, text: str) -> List[str]:
+        return await self._run(self._classify, text)
+
+    async def emotions_batch(self, texts: List[str]) -> List[List[str]]:
+        return await self._run(self._classify_batch, texts)
+
+    async def health(self) -> dict:
+        await asyncio.gather(self.embed(["ping"]), self.rerank([["ping", "ping"]]), self.emotions("ping"))
+        return {"mode": "local", "status_ok": True}
+
+    async def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_provider(client: AsyncClient) -> ModelProvider:
+    mode = settings.serving.model_provider
+    logger.info(f"Using {mode} model provider")
+    if mode == "local":
+        return LocalModelProvider()
+    return HttpModelProvider(client)
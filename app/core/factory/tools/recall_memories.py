@@ -1,7 +1,7 @@
 from app.core.strategy.memory_retriever import retrieve
 from app.core.strategy.memory_formatter import MemoryFormatter
-from weaviate import WeaviateAsyncClient
-from httpx import AsyncClient
+from app.conn.weaviate_client import WeaviateClient
+from app.core.factory.providers import ModelProvider
 from ollama import AsyncClient as OllamaAsyncClient
 from app.prompts.prompt_loader import load_prompt
 from app.shared.logger import get_logger
@@ -31,7 +31,7 @@ class recallMemory:
             }
         ]
 
-    async def recall_memories(self, query: str, weaviate_client: WeaviateAsyncClient, http_client:AsyncClient, session_id: str) -> str:
+    async def recall_memories(self, query: str, weaviate_client: WeaviateClient, provider: ModelProvider, session_id: str) -> str:
         """
         Get the memories
         
@@ -44,7 +44,7 @@ class recallMemory:
         try:
             logger.info("Tool: RecallMemory called, retrieving the results...")
             context = {"session_id":session_id, "emotion":"neutral"}
-            top_results = await retrieve (query=query, context=context, weaviate_client=weaviate_client, http_client=http_client, top_k=30)
+            top_results = await retrieve (query=query, context=context, weaviate_client=weaviate_client, provider=provider, top_k=30)
             retrieved = top_results.get("raw_reranked")
             if retrieved:
                 formatter = MemoryFormatter(readable_time=True)
@@ -1,110 +1,201 @@
-from typing import List, Dict
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Iterator, List, Dict, Optional, Tuple
 from weaviate.util import generate_uuid5
 from datetime import datetime, timezone
-from httpx import AsyncClient, HTTPError
+from httpx import HTTPError
 
-from app.conn.clients import post_json
+from app.config.settings import settings
+from app.core.factory.providers import ModelProvider
+from app.core.strategy.splitter import DialogSplitter
+from app.schemas.db_models import ChunkerStateModel
 from app.shared.logger import get_logger
 
 logger = get_logger(__name__)
-emotion_url = "http://127.0.0.1:8082/emotion-score"
+
+@dataclass
+class Window:
+    """One closed window, the last one of a run also carries the chunker state to resume from"""
+    chunk: Dict
+    emotion_text: str
+    state: Optional[ChunkerStateModel] = None
+
 
 class DialogChunker:
     def __init__(self, window_size: int = 5, overlap: int = 1, chunk_size: int = 500):
         self.window_size = window_size
         self.overlap = overlap
-        self.splitter = RecursiveCharacterTextSplitter(
+        self.splitter = DialogSplitter(
             chunk_size=chunk_size,
             chunk_overlap=50
         )
 
-    async def chunk(self, messages: List[Dict], http_client: AsyncClient) -> List[Dict]:
+    def iter_split(self, messages: Iterable[Dict]) -> Iterator[Dict]:
+        """Long assistant messages are split into several, each counting as a message"""
+        for msg in messages:
+            try:
+                if len(msg["content"]) > 500 and msg["role"] == "assistant":
+                    logger.debug("long message, splitting...")
+                    splits = self.splitter.split_text(msg["content"])
+                    for split_text in splits:
+                        new_msg = msg.copy()
+                        new_msg["content"] = split_text
+                        yield new_msg
+                else:
+                    yield msg
+            except Exception as e:
+                logger.warning(f"Splitting message failed due to {str(e)}")
+                continue
+
+    def split(self, messages: List[Dict]) -> List[Dict]:
+        return list(self.iter_split(messages))
+
+    def iter_windows(self, processed: Iterable[Dict], state: Optional[ChunkerStateModel] = None) -> Iterator[Window]:
+        """
+        Slides the window over processed messages, resuming from state when given,
+        yielding each window as soon as it closes. The last window carries the state
+        to resume from, which keeps the open window instead of the slid buffer so the
+        next run continues it exactly as a full re-chunk would.
+        """
+        state = state or ChunkerStateModel()
+
+        buffer: List = [(m.index, m.model_dump(exclude={"index"})) for m in state.buffer]
+        counter = state.counter
+        prev_chunk_id = state.last_chunk_id
+
+        messages = iter(processed)
+        msg = next(messages, None)
+        session_id = msg['session_id'] if msg is not None else None
+        while msg is not None:
+            # One message of lookahead tells whether this is the last one
+            following = next(messages, None)
+            buffer.append((counter, msg))
+            time_span: List[float] = []
+            counter += 1
+
+            complete = len(buffer) >= self.window_size
+            if complete or following is None:
+                content = "\n".join([f"{b[1]['role'].capitalize()}: {b[1]['content']}" for b in buffer])
+                text = "\n".join([f"{b[1]['content']}" for b in buffer if b[1]['role'] == 'user'])
+
+                for k in range(1, len(buffer)):
+                    prev_time = buffer[k-1][1]['message_created_at']
+                    curr_time = buffer[k][1]['message_created_at']
+                    diff = (curr_time-prev_time).total_seconds()
+                    time_span.append(diff)
+
+                timestamps = [
+                    ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+                    for ts in [b[1]["message_created_at"] for b in buffer]
+                ]
+
+                metadata = {
+                    "session_id": session_id,
+                    "username": list(set(b[1]['name'] for b in buffer)),
+                    "speakers": list(set(b[1]['role'] for b in buffer)),
+                    "emotions": [],
+                    "temporal_context": {
+                        "start_index": buffer[0][0] if buffer else -1,
+                        "end_index": buffer[-1][0] if buffer else -1,
+                        "session_position": [b[1]['session_position'] for b in buffer],
+                        "message_indices": [b[0] for b in buffer],
+                        "prev_chunk_id": prev_chunk_id,
+                        "time_span_seconds": time_span,
+                    },
+                    "timestamp": timestamps,
+                }
+
+                chunk_id = generate_uuid5(f"{session_id}_{buffer[0][0]}-{buffer[-1][0]}")
+                window = Window(chunk={"id": chunk_id, "content": content, "metadata": metadata}, emotion_text=text)
+
+                if complete:
+                    # Slide window
+                    buffer = buffer[-self.overlap:] if self.overlap > 0 else []
+                    prev_chunk_id = chunk_id
+
+                if following is None:
+                    window.state = ChunkerStateModel(
+                        buffer=[{"index": index, **m} for index, m in buffer],
+                        counter=counter,
+                        last_chunk_id=prev_chunk_id,
+                        # Tail window, replaced once later messages complete it
+                        provisional_chunk_id=None if complete else chunk_id,
+                    )
+                yield window
+
+            msg = following
+
+    def windows(self, processed: List[Dict], state: Optional[ChunkerStateModel] = None) -> Tuple[List[Dict], List[str], ChunkerStateModel]:
+        """All windows of processed messages at once, with the state to resume from"""
+        chunks: List[Dict] = []
+        emotion_texts: List[str] = []
+        next_state = state or ChunkerStateModel()
+        for window in self.iter_windows(processed, state):
+            chunks.append(window.chunk)
+            emotion_texts.append(window.emotion_text)
+            next_state = window.state or next_state
+        return chunks, emotion_texts, next_state
+
+    async def stream(self, messages: Iterable[Dict], state: Optional[ChunkerStateModel] = None, yield_every: int = 64) -> AsyncIterator[Window]:
+        """Async generator of windows, handing control back to the loop every yield_every windows"""
+        for i, window in enumerate(self.iter_windows(self.iter_split(messages), state), start=1):
+            yield window
+            if i % yield_every == 0:
+                await asyncio.sleep(0)
+
+    async def stream_pages(self, pages: AsyncIterator[List[Dict]], state: Optional[ChunkerStateModel] = None) -> AsyncIterator[Window]:
+        """
+        Windows of pages of messages read one at a time, as stream gives for all of them at once.
+        A page is held back until the next one arrives, the open tail window of every page
+        but the last stays in the state to be continued.
+        """
+        held: Optional[List[Dict]] = None
+        async for page in pages:
+            if held is not None:
+                async for window in self.stream(held, state):
+                    if window.state is None:
+                        yield window
+                        continue
+                    state = window.state
+                    if state.provisional_chunk_id != window.chunk["id"]:
+                        yield Window(chunk=window.chunk, emotion_text=window.emotion_text)
+            held = page
+        if held is not None:
+            async for window in self.stream(held, state):
+                yield window
+
+    async def chunk(self, messages: List[Dict], provider: ModelProvider) -> List[Dict]:
         if not messages:
             return []
         
         try:
             logger.info(f"Starting chunking for session {messages[0]['session_id']}")
-            session_id = messages[0]['session_id']
-            
-            chunks: List[Dict] = []
-            buffer: List = []
-            counter = 0
-            processed: List[Dict] = []
-            
-            for msg in messages:
-                try:
-                    if len(msg["content"]) > 500 and msg["role"] == "assistant":
-                        logger.debug("long message, splitting...")
-                        splits = self.splitter.split_text(msg["content"])
-                        for split_text in splits:
-                            new_msg = msg.copy()
-                            new_msg["content"] = split_text
-                            processed.append(new_msg)
-                    else:
-                        processed.append(msg)
-                except Exception as e:
-                    logger.warning(f"Splitting message failed due to {str(e)}")
-                    continue
-
-            for i, msg in enumerate(processed):
-                buffer.append((counter, msg))
-                time_span: List[float] = []
-
-                if len(buffer) >= self.window_size or i == len(processed) - 1:
-                    content = "\n".join([f"{b[1]['role'].capitalize()}: {b[1]['content']}" for b in buffer])
-                    text = "\n".join([f"{b[1]['content']}" for b in buffer if b[1]['role'] == 'user'])
-                    emotions = None
-                    if text.strip():
-                        try:
-                            emotions = await post_json(http_client, emotion_url, {"text": text})
-                        except HTTPError as he:
-                            logger.error(f"Emotion API error: {str(he)}")
-                        except Exception as e:
-                            logger.error(f"Unexpected emotion fetch error: {str(e)}")
-
-                    for k in range(1, len(buffer)):
-                        prev_time = buffer[k-1][1]['message_created_at']
-                        curr_time = buffer[k][1]['message_created_at']
-                        diff = (curr_time-prev_time).total_seconds()
-                        time_span.append(diff)
-
-                    timestamps = [
-                        ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
-                        for ts in [b[1]["message_created_at"] for b in buffer]
-                    ]
-                    
-                    metadata = {
-                        "session_id": session_id,
-                        "username": list(set(b[1]['name'] for b in buffer)),
-                        "speakers": list(set(b[1]['role'] for b in buffer)),
-                        "emotions": emotions['emotions'],
-                        "temporal_context": {
-                            "start_index": buffer[0][0] if buffer else -1,
-                            "end_index": buffer[-1][0] if buffer else -1,
-                            "session_position": [b[1]['session_position'] for b in buffer],
-                            "message_indices": [b[0] for b in buffer],
-                            "prev_chunk_id": chunks[-1]["id"] if chunks else None,
-                            "time_span_seconds": time_span,
-                        },
-                        "timestamp": timestamps,
-                    }
-
-                    chunks.append({
-                        "id": generate_uuid5(f"{session_id}_{buffer[0][0]}-{buffer[-1][0]}"),
-                        "content": content,
-                        "metadata": metadata
-                    })
-
-                    # Slide window
-                    buffer = buffer[-self.overlap:] if self.overlap > 0 else []
+            chunks, emotion_texts, _ = self.windows(self.split(messages))
 
-                counter += 1
+            # Tag all windows with a few batched emotion calls instead of one call per window
+            await self.tag_emotions(chunks, emotion_texts, provider)
 
-            logger.info(f"Generated {len(chunks)} chunks for session {session_id}")
+            logger.info(f"Generated {len(chunks)} chunks for session {messages[0]['session_id']}")
             return chunks
         
         except Exception as e:
             sid = messages[0].get("session_id", "unknown") if messages else "unknown"
             logger.warning(f"Error generating chunks for session {sid}: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+    async def tag_emotions(self, chunks: List[Dict], texts: List[str], provider: ModelProvider) -> None:
+        """Fills chunk emotions from the user text of each window, windows without user text stay untagged"""
+        pending = [(chunk, text) for chunk, text in zip(chunks, texts) if text.strip()]
+        batch_size = settings.serving.emotion_max_batch
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            try:
+                labels = await provider.emotions_batch([text for _, text in batch])
+            except HTTPError as he:
+                logger.error(f"Emotion API error: {str(he)}")
+                continue
+            except Exception as e:
+                logger.error(f"Unexpected emotion fetch error: {str(e)}")
+                continue
+            for (chunk, _), emotions in zip(batch, labels):
+                chunk["metadata"]["emotions"] = emotions or []
\ No newline at end of file
@@ -0,0 +1,119 @@
+import numpy as np
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from app.config.settings import settings
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+COGNITIVE_WEIGHTS = {
+    "semantic": settings.cognitive.semantic,
+    "emotional": settings.cognitive.emotional,
+    "temporal": settings.cognitive.temporal,
+    "associative": settings.cognitive.associative
+}
+
+def _epoch_micros(ts: datetime) -> int:
+    """Exact integer microseconds since epoch, naive timestamps are treated as UTC"""
+    if not ts.tzinfo:
+        ts = ts.replace(tzinfo=timezone.utc)
+    delta = ts - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 10**6 + delta.microseconds
+
+
+class CognitiveScorer:
+    """
+    Vectorized cognitive relevance scoring.
+    Turns the candidate set into column arrays and applies the COGNITIVE_WEIGHTS
+    formula to all candidates at once.
+    """
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        em_score: float = settings.cognitive.em_score,
+        cont_score: float = settings.cognitive.cont_score,
+        weight_thres: float = settings.cognitive.weight_thres,
+    ):
+        self.weights = weights or COGNITIVE_WEIGHTS
+        self.em_score = em_score
+        self.cont_score = cont_score
+        self.weight_thres = weight_thres
+
+    def columns(self, chunks: list, semantic_scores, current_context: dict, now: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """Extracts the per-candidate signals as column arrays"""
+        now_us = _epoch_micros(now or datetime.now(timezone.utc))
+        emotion = current_context['emotion']
+        last_chunk_id = current_context.get('last_chunk_id')
+
+        emotion_match: List[bool] = []
+        continuity: List[bool] = []
+        weights: List[float] = []
+        latest: List[int] = []
+
+        for chunk in chunks:
+            props = getattr(chunk, 'properties', {}) or {}
+            emotion_match.append(emotion in (props.get('emotions') or []))
+
+            timestamp_list = props.get('timestamp', [])
+            if not isinstance(timestamp_list, list):
+                timestamp_list = [timestamp_list] if timestamp_list else []
+            latest.append(_epoch_micros(max(timestamp_list)) if timestamp_list else now_us)
+
+            temporal_ctx = props.get('temporal_context') or {}
+            continuity.append(temporal_ctx.get('prev_chunk_id') == last_chunk_id)
+            weights.append(props.get('cognitive_weight', 1.0))
+
+        return {
+            "semantic": np.asarray(semantic_scores, dtype=np.float64),
+            "age_us": now_us - np.array(latest, dtype=np.int64),
+            "emotion_match": np.array(emotion_match, dtype=bool),
+            "continuity": np.array(continuity, dtype=bool),
+            "cognitive_weight": np.array(weights, dtype=np.float64),
+        }
+
+    def score(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Computes cognitive scores for every candidate"""
+        emotion_score = np.where(columns["emotion_match"], self.em_score, 1.0)
+        recency = columns["age_us"] / 10**6 / 3600  # hours ago
+        recency_score = np.exp(-recency / 24)
+        continuity_score = np.where(columns["continuity"], self.cont_score, 1.0)
+
+        weight = columns["cognitive_weight"]
+        cognitive_boost = np.where(
+            weight > self.weight_thres,
+            np.minimum(1.2, 1.0 + (weight - 0.8) * 2),
+            1.0
+        )
+
+        return (
+            self.weights["semantic"] * columns["semantic"] +
+            self.weights["emotional"] * emotion_score +
+            self.weights["temporal"] * recency_score +
+            self.weights["associative"] * continuity_score
+        ) * cognitive_boost
+
+    @staticmethod
+    def rank(scores: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+        """
+        Indices of the scores in descending order, ties keep candidate order.
+        With top_k only the best k are partitioned out and sorted.
+        """
+        n = len(scores)
+        if top_k is not None and 0 < top_k < n:
+            part = np.argpartition(-scores, top_k - 1)[:top_k]
+            # Keep every candidate tied with the k-th score so the cut matches a stable sort
+            candidates = np.flatnonzero(scores >= scores[part].min())
+            return candidates[np.argsort(-scores[candidates], kind="stable")][:top_k]
+        return np.argsort(-scores, kind="stable")
+
+    def rerank(self, chunks: list, semantic_scores, current_context: dict, top_k: Optional[int] = None) -> List[tuple]:
+        if not chunks:
+            return []
+        scores = self.score(self.columns(chunks, semantic_scores, current_context))
+        return [
+            (
+                float(scores[i]),
+                getattr(chunks[i], 'properties', {}) or {},
+                getattr(chunks[i], 'metadata', {}) or {},
+            )
+            for i in self.rank(scores, top_k)
+        ]
@@ -1,63 +1,31 @@
-import numpy as np
-from typing import Any
-from datetime import datetime, timezone
-from app.config.settings import settings
+from typing import Optional
+from app.core.strategy.cognitive_scoring import CognitiveScorer
+from app.core.factory.providers import ModelProvider
 from app.shared.logger import get_logger
-from app.conn.clients import post_json
-from httpx import AsyncClient
-import asyncio
 
 logger = get_logger(__name__)
-reranker_url = "http://127.0.0.1:8081/rerank"
 
-COGNITIVE_WEIGHTS = {
-    "semantic": settings.cognitive.semantic,
-    "emotional": settings.cognitive.emotional,
-    "temporal": settings.cognitive.temporal,
-    "associative": settings.cognitive.associative
-}
-
-async def score_chunk(client, chunk, query, current_context):
-    content = chunk.properties.get('content', '')
-    props = getattr(chunk, 'properties', {}) or {}
-    meta = getattr(chunk, 'metadata', {}) or {}
-
-    semantic_resp = await post_json(client, reranker_url, {"text_list": [[query, content]]})
-    semantic_score = semantic_resp.get("score", 0.0)
-
-    emotions = chunk.properties.get('emotions', [])
-    emotion_score = settings.cognitive.em_score if current_context['emotion'] in emotions else 1.0
-
-    now = datetime.now(timezone.utc)
-    timestamp_list = chunk.properties.get('timestamp', [])
-    if not isinstance(timestamp_list, list):
-        timestamp_list = [timestamp_list] if timestamp_list else []
-    latest_timestamp = max(timestamp_list) if timestamp_list else now
-    recency = (now - latest_timestamp).total_seconds() / 3600  # hours ago
-    recency_score = np.exp(-recency / 24)
-
-    temporal_ctx = chunk.properties.get('temporal_context', {})
-    continuity_score = settings.cognitive.cont_score if temporal_ctx.get('prev_chunk_id') == current_context.get('last_chunk_id') else 1.0
-
-    cognitive_weight = chunk.properties.get('cognitive_weight', 1.0)
-    if cognitive_weight > settings.cognitive.weight_thres:
-        cognitive_boost = min(1.2, 1.0 + (cognitive_weight - 0.8) * 2)
-    else:
-        cognitive_boost = 1.0
-
-    cognitive_score = (
-        COGNITIVE_WEIGHTS["semantic"] * semantic_score +
-        COGNITIVE_WEIGHTS["emotional"] * emotion_score +
-        COGNITIVE_WEIGHTS["temporal"] * recency_score +
-        COGNITIVE_WEIGHTS["associative"] * continuity_score
-    ) * cognitive_boost
-
-    return (cognitive_score, props, meta)
-
-async def cognitive_relevance_rerank(query: str, chunks: list, current_context: dict, client: AsyncClient) -> list:
-    # Schedule all chunks concurrently
-    tasks = [score_chunk(client, chunk, query, current_context) for chunk in chunks]
-    reranked = await asyncio.gather(*tasks)
-
-    # Sort by cognitive score descending
-    return sorted(reranked, key=lambda x: x[0], reverse=True)
\ No newline at end of file
+scorer = CognitiveScorer()
+
+async def semantic_scores(provider: ModelProvider, query: str, chunks: list) -> list:
+    """Scores every (query, content) pair with a single batched rerank call"""
+    pairs = [[query, chunk.properties['content']] for chunk in chunks]
+    scores = await provider.rerank(pairs)
+    if len(scores) != len(chunks):
+        raise ValueError(f"Reranker returned {len(scores)} scores for {len(chunks)} candidates")
+    return scores
+
+async def cognitive_relevance_rerank(query: str, chunks: list, current_context: dict, provider: ModelProvider, top_k: Optional[int] = None) -> list:
+    # The reranker rejects empty passages, a chunk without content has nothing to rank on anyway
+    ranked = [chunk for chunk in chunks if (chunk.properties.get('content') or '').strip()]
+    if len(ranked) < len(chunks):
+        logger.warning(f"Dropped {len(chunks) - len(ranked)} candidates without content before reranking")
+    chunks = ranked
+    if not chunks:
+        return []
+
+    # Send the whole candidate set in one request
+    scores = await semantic_scores(provider, query, chunks)
+
+    # Score all candidates at once, sorted by cognitive score descending
+    return scorer.rerank(chunks, scores, current_context, top_k=top_k)
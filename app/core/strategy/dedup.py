@@ -0,0 +1,116 @@
+import hashlib
+import re
+import numpy as np
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from app.config.settings import settings
+from app.shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+SIGNATURE_BITS = 64
+_TOKEN = re.compile(r"\w+")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word bigrams (single words for one-word texts), weighted by count"""
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return 0
+    features: Dict[str, int] = {}
+    grams = [" ".join(pair) for pair in zip(tokens, tokens[1:])] or tokens
+    for gram in grams:
+        features[gram] = features.get(gram, 0) + 1
+
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big") for f in features],
+        dtype=np.uint64,
+    )
+    bits = np.unpackbits(hashes.byteswap().view(np.uint8).reshape(-1, 8), axis=1)
+    weights = np.fromiter(features.values(), dtype=np.int64, count=len(features))
+    votes = (bits.astype(np.int64) * 2 - 1).T @ weights
+    return int("".join("1" if v > 0 else "0" for v in votes), 2)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class NearDuplicateFilter:
+    """
+    Suppresses chunks whose SimHash is within max_distance bits of a chunk kept earlier
+    in the same session. Candidates are found through band lookups (max_distance + 1 bands,
+    a near duplicate shares at least one), only the last history signatures are remembered.
+    prev_chunk_id of later chunks is pointed at the kept duplicate of a suppressed one.
+    """
+    def __init__(
+        self,
+        max_distance: int = settings.ingestion.dedup_max_distance,
+        history: int = settings.ingestion.dedup_history,
+        seen: Iterable[Tuple[int, str]] = (),
+    ):
+        self.max_distance = max_distance
+        self.history = history
+        self.suppressed = 0
+        self._remap: Dict[str, str] = {}
+        self._kept: Deque[Tuple[int, str]] = deque()
+        self._bands: Dict[Tuple[int, int], List[Tuple[int, str]]] = {}
+        widths = [SIGNATURE_BITS // (max_distance + 1)] * (max_distance + 1)
+        widths[-1] += SIGNATURE_BITS - sum(widths)
+        self._masks, shift = [], 0
+        for width in widths:
+            self._masks.append((shift, (1 << width) - 1))
+            shift += width
+        for signature, chunk_id in seen:
+            self.remember(signature, chunk_id)
+
+    def _keys(self, signature: int):
+        return [(band, (signature >> shift) & mask) for band, (shift, mask) in enumerate(self._masks)]
+
+    def match(self, signature: int) -> Optional[str]:
+        for key in self._keys(signature):
+            for other, chunk_id in self._bands.get(key, ()):
+                if hamming(signature, other) <= self.max_distance:
+                    return chunk_id
+        return None
+
+    def remember(self, signature: int, chunk_id: str) -> None:
+        entry = (signature, chunk_id)
+        self._kept.append(entry)
+        for key in self._keys(signature):
+            self._bands.setdefault(key, []).append(entry)
+        while len(self._kept) > self.history:
+            old = self._kept.popleft()
+            for key in self._keys(old[0]):
+                self._bands[key].remove(old)
+                if not self._bands[key]:
+                    del self._bands[key]
+
+    def resolve(self, chunk_id: Optional[str]) -> Optional[str]:
+        return self._remap.get(chunk_id, chunk_id)
+
+    def keep(self, chunk: dict, remember: bool = True) -> bool:
+        """False when chunk is a near duplicate, remember=False for chunks that will be replaced"""
+        temporal = chunk["metadata"]["temporal_context"]
+        temporal["prev_chunk_id"] = self.resolve(temporal.get("prev_chunk_id"))
+
+        signature = simhash(chunk["content"])
+        duplicate_of = self.match(signature)
+        if duplicate_of is not None:
+            self._remap[chunk["id"]] = duplicate_of
+            self.suppressed += 1
+            logger.debug(f"Chunk {chunk['id']} suppressed as near duplicate of {duplicate_of}")
+            return False
+        if remember:
+            self.remember(signature, chunk["id"])
+        return True
+
+    def dump(self) -> List[Tuple[int, str]]:
+        return list(self._kept)
+
+
+def near_duplicate_filter(seen: Iterable[Tuple[int, str]] = ()) -> Optional[NearDuplicateFilter]:
+    """Session filter from the configured threshold, None when suppression is disabled"""
+    if settings.ingestion.dedup_max_distance < 0:
+        return None
+    return NearDuplicateFilter(seen=seen)
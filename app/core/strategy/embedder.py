@@ -0,0 +1,41 @@
+from typing import List, Literal
+from app.config.settings import settings
+from app.core.factory.providers import ModelProvider
+from app.shared.embedding_cache import EmbeddingCache
+from app.shared.logger import get_logger
+
+logger = get_logger(__name__)
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+_cache: EmbeddingCache | None = None
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache(
+            # int8 / ONNX graphs drift from torch, so cached vectors are scoped per backend
+            model_name=f"{EMBEDDING_MODEL}@{settings.serving.embed_backend}",
+            max_entries=settings.cache.embed_cache_size,
+            path=settings.cache.embed_cache_path,
+            disk_max_entries=settings.cache.embed_cache_disk_max_entries,
+        )
+    return _cache
+
+async def embed_texts(provider: ModelProvider, texts: List[str], priority: Literal["query", "bulk"] = "bulk") -> List[List[float]]:
+    """Embeds texts through the cache, only texts never seen before reach /vectorize"""
+    if not texts:
+        return []
+    cache = get_embedding_cache()
+    found = await cache.aget_many(texts)
+
+    missing = list(dict.fromkeys(text for i, text in enumerate(texts) if i not in found))
+    if missing:
+        logger.info(f"Embedding {len(missing)} new texts ({len(found)}/{len(texts)} cached)")
+        vectors = await provider.embed(missing, priority=priority)
+        await cache.aput_many(missing, vectors)
+        computed = dict(zip(missing, vectors))
+        for i, text in enumerate(texts):
+            if i not in found:
+                found[i] = computed[text]
+
+    return [found[i].tolist() for i in range(len(texts))]
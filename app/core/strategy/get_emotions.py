@@ -1,8 +1,7 @@
-from transformers import AutoTokenizer, pipeline
-from optimum.onnxruntime import ORTModelForSequenceClassification
+from transformers import AutoTokenizer
 from app.core.factory.local.emotions_local import EmotionFactory
+from app.data_pipeline.helper.helperOnnx import OnnxEmotionEngine, EMOTION_MODEL, get_emotion_cache
 from typing import List
-from functools import lru_cache
 from app.shared.logger import get_logger
 
 logger = get_logger(__name__)
@@ -13,26 +12,23 @@ class RoBertEmotionGo:
         self.k = k
 
         # Load tokenizer and ONNX model only once (during instantiation)
-        self.tokenizer = AutoTokenizer.from_pretrained("SamLowe/roberta-base-go_emotions-onnx")
+        self.tokenizer = AutoTokenizer.from_pretrained(EMOTION_MODEL)
         self.model = EmotionFactory.get_model()
 
-        # Create ONNX pipeline once and reuse
-        self.onnx_classifier = pipeline(
-            task="text-classification",
-            model=self.model,
-            tokenizer=self.tokenizer,
-            top_k=None,
-            function_to_apply="sigmoid"
-        )
+        # Length-bucketed engine straight on the ONNX model, no HF pipeline in between
+        self.engine = OnnxEmotionEngine(model=self.model, tokenizer=self.tokenizer, cache=get_emotion_cache())
 
-        logger.info("Loading SamLowe/roberta-base-go_emotions-onnx model and tokenizer successfull!")
+        logger.info(f"Loading {EMOTION_MODEL} model and tokenizer successfull!")
 
-    @lru_cache(maxsize=1024)
     def get_emotions(self, text: str) -> List[str]:
         """
         Predicts the top-k emotions from a given string using ONNX-optimized RoBERTa.
-        Caches results for repeated text inputs.
+        Results are cached by text hash and model version.
         """
-        result = self.onnx_classifier(text)
-        top_k = sorted(result[0], key=lambda x: x["score"], reverse=True)[:self.k]
-        return [label["label"] for label in top_k]
\ No newline at end of file
+        return self.engine.top_k([text], k=self.k)[0]
+
+    def get_emotions_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Predicts the top-k emotions for many texts in length-bucketed batches.
+        """
+        return self.engine.top_k(texts, k=self.k)
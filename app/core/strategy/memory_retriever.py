@@ -1,32 +1,33 @@
 import numpy as np
+from typing import Optional
 from weaviate.classes.query import Filter
-from weaviate import WeaviateAsyncClient
-from httpx import AsyncClient
+from app.conn.weaviate_client import WeaviateClient
+from app.core.weaviate.profiles import RetrievalProfile, retrieval_profile
+from app.core.factory.providers import ModelProvider
 from weaviate.classes.query import HybridFusion
 from app.core.strategy.congnitive_reranker import cognitive_relevance_rerank
 from app.core.strategy.memory_formatter import MemoryFormatter
 from app.core.strategy.memory_sim import apply_memory_effects
-from app.conn.clients import post_json
+from app.core.strategy.embedder import embed_texts
 from app.shared.logger import get_logger
 
-vectorizer_url = "http://127.0.0.1:8083/vectorize"
-
 logger = get_logger(__name__)
 
 MEMORY_RETENTION_DAYS = 10
 
-async def retrieve(weaviate_client: WeaviateAsyncClient, http_client: AsyncClient, query: str, context: dict, top_k: int = 10) -> dict:
+async def retrieve(weaviate_client: WeaviateClient, provider: ModelProvider, query: str, context: dict, top_k: int = 10, profile: Optional[RetrievalProfile] = None) -> dict:
     required_context = ['session_id', 'emotion']
     if any(key not in context for key in required_context):
         logger.error(f"Missing context: {required_context}")
         return {"error": "Insufficient context"}
+    # Lean projection unless debugging, the full nested payload is only decoded when asked for
+    profile = profile or retrieval_profile(debug=bool(context.get("debug")))
         
     try:
-        async with weaviate_client as client:
+        async with weaviate_client.borrow() as client:
             collection = client.collections.get("DialogMemory")
             
-            vector_resp = await post_json(http_client, vectorizer_url, {"text": [query]})
-            vector = vector_resp["vector"][0]
+            vector = (await embed_texts(provider, [query], priority="query"))[0]
             filters = (
                 Filter.by_property("session_id").equal(context['session_id']) 
                 # Filter.by_property("emotions").contains_any([context['emotion']])
@@ -42,13 +43,15 @@ async def retrieve(weaviate_client: WeaviateAsyncClient, http_client: AsyncClien
                 query_properties=["content", "emotions"],
                 fusion_type=HybridFusion.RELATIVE_SCORE,
                 filters=filters,
+                return_properties=profile.return_properties,
+                return_metadata=profile.return_metadata,
             )
             
             chunks = response.objects
             if not chunks:
                 return {"top_chunks": [], "emotion_groups": {}, "retrieval_metrics": {},"description": "Memory not found"}
             
-            reranked = await cognitive_relevance_rerank(query, chunks, context, http_client)
+            reranked = await cognitive_relevance_rerank(query, chunks, context, provider)
             if not reranked:
                 return {"top_chunks": [], "emotion_groups": {}, "retrieval_metrics": {}, "description": "No cognitively relevant memory found"}
             
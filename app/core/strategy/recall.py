@@ -30,7 +30,7 @@ async def chat(conversation, tools):
             )
     return response
 
-async def process_tool_call(tool_call, tools, weaviate_client, http_client, session_id):
+async def process_tool_call(tool_call, tools, weaviate_client, provider, session_id):
     """Handle a single tool call request (e.g., recall_memories)."""
     fn_name = tool_call["function"]["name"]
     args = tool_call["function"].get("arguments", {})
@@ -40,7 +40,7 @@ async def process_tool_call(tool_call, tools, weaviate_client, http_client, sess
         logger.info(f"Tool called: recall_memories('{query}')")
         try:
             # Run with timeout safeguard
-            memories = await tools.recall_memories(query, weaviate_client, http_client, session_id)
+            memories = await tools.recall_memories(query, weaviate_client, provider, session_id)
         except TimeoutException:
             logger.error("Timeout while recalling memories")
             return None
@@ -57,7 +57,7 @@ async def process_tool_call(tool_call, tools, weaviate_client, http_client, sess
     return None
 
 
-async def infer(user_query: str, weaviate_client, http_client, tools, session_id):
+async def infer(user_query: str, weaviate_client, provider, tools, session_id):
     """
     Orchestrates inference:
     1. Starts conversation
@@ -98,7 +98,7 @@ async def infer(user_query: str, weaviate_client, http_client, tools, session_id
 
         # Process tool calls sequentially
         for tool_call in tool_calls:
-            tool_response = await process_tool_call(tool_call, tools, weaviate_client, http_client, session_id)
+            tool_response = await process_tool_call(tool_call, tools, weaviate_client, provider, session_id)
             if tool_response:
                 # Inject tool response back into conversation
                 conversation.extend([
@@ -0,0 +1,103 @@
+from typing import Callable, List, Optional, Sequence
+
+# Paragraphs first, then lines, sentences, words and finally characters
+DEFAULT_SEPARATORS = ("\n\n", "\n", ". ", "! ", "? ", "; ", ", ", " ", "")
+
+
+class DialogSplitter:
+    """
+    Recursive splitter for long messages on paragraph and sentence boundaries.
+    Chunks are at most chunk_size long as measured by length_function (characters by
+    default, tokens with from_tokenizer) and consecutive chunks share up to
+    chunk_overlap of trailing text, the same semantics as LangChain's
+    RecursiveCharacterTextSplitter without importing it.
+    """
+    def __init__(
+        self,
+        chunk_size: int = 500,
+        chunk_overlap: int = 50,
+        separators: Sequence[str] = DEFAULT_SEPARATORS,
+        length_function: Callable[[str], int] = len,
+    ):
+        if chunk_overlap > chunk_size:
+            raise ValueError(f"chunk_overlap ({chunk_overlap}) larger than chunk_size ({chunk_size})")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = list(separators)
+        self.length_function = length_function
+
+    @classmethod
+    def from_tokenizer(cls, tokenizer, chunk_size: int = 128, chunk_overlap: int = 16, **kwargs) -> "DialogSplitter":
+        """Token-aware splitter, sizes are counted with the given HF tokenizer"""
+        def token_length(text: str) -> int:
+            return len(tokenizer.encode(text, add_special_tokens=False))
+        return cls(chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=token_length, **kwargs)
+
+    @classmethod
+    def from_model(cls, model_name: Optional[str] = None, **kwargs) -> "DialogSplitter":
+        """Token-aware splitter using the embedding model's tokenizer"""
+        from transformers import AutoTokenizer
+        from app.core.factory.backends import EMBEDDING_MODEL
+        return cls.from_tokenizer(AutoTokenizer.from_pretrained(model_name or EMBEDDING_MODEL), **kwargs)
+
+    def split_text(self, text: str) -> List[str]:
+        return self._split(text, self.separators)
+
+    def _split(self, text: str, separators: List[str]) -> List[str]:
+        separator, remaining = separators[-1], []
+        for i, candidate in enumerate(separators):
+            if candidate == "":
+                separator = candidate
+                break
+            if candidate in text:
+                separator, remaining = candidate, separators[i + 1:]
+                break
+
+        chunks: List[str] = []
+        fitting: List[str] = []
+        for piece in self._pieces(text, separator):
+            if self.length_function(piece) <= self.chunk_size:
+                fitting.append(piece)
+                continue
+            if fitting:
+                chunks.extend(self._merge(fitting))
+                fitting = []
+            if remaining:
+                chunks.extend(self._split(piece, remaining))
+            else:
+                chunks.append(piece)
+        if fitting:
+            chunks.extend(self._merge(fitting))
+        return chunks
+
+    @staticmethod
+    def _pieces(text: str, separator: str) -> List[str]:
+        """Splits after each separator so sentence punctuation stays with its sentence"""
+        if separator == "":
+            return list(text)
+        parts = text.split(separator)
+        pieces = [part + separator for part in parts[:-1]] + [parts[-1]]
+        return [piece for piece in pieces if piece]
+
+    def _merge(self, pieces: List[str]) -> List[str]:
+        """Packs pieces into chunks up to chunk_size, carrying up to chunk_overlap into the next one"""
+        chunks: List[str] = []
+        current: List[str] = []
+        lengths: List[int] = []
+        total = 0
+        for piece in pieces:
+            length = self.length_function(piece)
+            if current and total + length > self.chunk_size:
+                chunk = "".join(current).strip()
+                if chunk:
+                    chunks.append(chunk)
+                while total > self.chunk_overlap or (total and total + length > self.chunk_size):
+                    total -= lengths.pop(0)
+                    current.pop(0)
+            current.append(piece)
+            lengths.append(length)
+            total += length
+        chunk = "".join(current).strip()
+        if chunk:
+            chunks.append(chunk)
+        return chunks
@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from typing import List, Optional, Union
+from weaviate.classes.query import MetadataQuery, QueryNested
+
+
+@dataclass(frozen=True)
+class RetrievalProfile:
+    """What a DialogMemory query sends back, return_properties None means the full payload"""
+    name: str
+    return_properties: Optional[List[Union[str, QueryNested]]]
+    return_metadata: MetadataQuery
+
+
+# Only what the cognitive reranker and the formatter read. cognitive_weight is not in the
+# schema (the scorer falls back to 1.0), asking for it would fail the query.
+LEAN = RetrievalProfile(
+    name="lean",
+    return_properties=[
+        "content",
+        "emotions",
+        "timestamp",
+        QueryNested(name="temporal_context", properties=["prev_chunk_id"]),
+    ],
+    return_metadata=MetadataQuery(),
+)
+
+# Full payload with fusion score and its explanation, opt in with context["debug"]
+DEBUG = RetrievalProfile(
+    name="debug",
+    return_properties=None,
+    return_metadata=MetadataQuery(score=True, explain_score=True),
+)
+
+PROFILES = {profile.name: profile for profile in (LEAN, DEBUG)}
+
+
+def retrieval_profile(debug: bool = False) -> RetrievalProfile:
+    return DEBUG if debug else LEAN
@@ -0,0 +1,307 @@
+"""
+Full-history backfill / re-index of DialogMemory.
+
+    python -m app.data_pipeline.backfill [--reset] [--from-start] [--page-size N] [--queue-size N]
+    python -m app.data_pipeline.backfill --requeue-outbox
+
+Sessions and their messages are streamed from Postgres with keyset pagination and pushed
+through chunk -> emotion -> embed -> batch insert stages joined by bounded queues (run_stages), so
+memory stays flat however large the history is. Completed sessions advance their ingestion
+head and a checkpoint file; an interrupted run resumes after the last completed session.
+Chunks Weaviate rejects are staged in the chunk outbox and replayed by the ingestion worker,
+--requeue-outbox gives the ones that exhausted their attempts another round.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import httpx
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import select
+from weaviate import WeaviateAsyncClient
+from app.config.settings import settings
+from app.conn.postgre_conn import get_db
+from app.conn.weaviate_client import WeaviateClient
+from app.core.factory.providers import ModelProvider, get_provider
+from app.core.strategy.chunker import DialogChunker
+from app.core.strategy.dedup import NearDuplicateFilter, near_duplicate_filter
+from app.core.strategy.embedder import embed_texts
+from app.core.weaviate.schema import DialogMemorySchema
+from app.data_pipeline.helper.helperMessages import session_user_name, message_pages, chunker_messages
+from app.data_pipeline.helper.helperHead import gethead, updatehead, update_is_vectorized, try_lease_session
+from app.data_pipeline.helper.helperOutbox import stage_outbox, requeue_outbox, discard_outbox
+from app.data_pipeline.push_to_weaviate import ingest_chunks, delete_chunks, delete_session_chunks
+from app.db.models import ChatSession
+from app.schemas.db_models import ChunkerStateModel, HeadResponse
+from app.shared.logger import get_logger
+from app.shared.stages import run_stages
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SessionPage:
+    """One page of a session's messages on its way through the stages"""
+    session_id: UUID
+    messages: int
+    max_position: int
+    last: bool
+    state: ChunkerStateModel
+    chunks: List[Dict] = field(default_factory=list)
+    emotion_texts: List[str] = field(default_factory=list)
+    vectors: List[List[float]] = field(default_factory=list)
+
+
+@dataclass
+class BackfillProgress:
+    interval: float = settings.ingestion.backfill_progress_interval_s
+    started: float = field(default_factory=time.monotonic)
+    last_report: float = field(default_factory=time.monotonic)
+    sessions: int = 0
+    messages: int = 0
+    chunks: int = 0
+    suppressed: int = 0
+    unwritten: int = 0
+
+    def report(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        elapsed = max(now - self.started, 1e-9)
+        logger.info(
+            f"Backfill: {self.sessions} sessions, {self.messages} messages ({self.messages / elapsed:.1f} msgs/s), "
+            f"{self.chunks} chunks ({self.chunks / elapsed:.1f} chunks/s), {self.suppressed} near duplicates, {self.unwritten} staged in the outbox in {elapsed:.0f}s"
+        )
+
+
+def read_checkpoint(path: Optional[str]) -> Optional[UUID]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        last = json.load(f).get("last_session_id")
+    return UUID(last) if last else None
+
+
+def write_checkpoint(path: Optional[str], session_id: UUID) -> None:
+    if not path:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"last_session_id": str(session_id), "updated_at": time.time()}, f)
+    os.replace(tmp, path)
+
+
+async def stream_sessions(after: Optional[UUID], page_size: int) -> AsyncIterator[UUID]:
+    """Session ids in id order, one keyset page per query"""
+    while True:
+        async with get_db() as db:
+            stmt = select(ChatSession.id).order_by(ChatSession.id).limit(page_size)
+            if after is not None:
+                stmt = stmt.where(ChatSession.id > after)
+            ids = (await db.execute(stmt)).scalars().all()
+        for session_id in ids:
+            yield session_id
+        if len(ids) < page_size:
+            return
+        after = ids[-1]
+
+
+async def stream_messages(session_id: UUID, page_size: int) -> AsyncIterator[List[Dict]]:
+    """A session's messages in position order as chunker dicts, one keyset page per query"""
+    async with get_db() as db:
+        name = await session_user_name(db, session_id)
+        async for rows in message_pages(db, session_id, page_size):
+            # Ends the read transaction, no connection is held while the stages catch up
+            await db.commit()
+            yield chunker_messages(session_id, name, rows)
+
+
+class Backfill:
+    def __init__(
+        self,
+        client: WeaviateAsyncClient,
+        provider: ModelProvider,
+        page_size: int = settings.ingestion.backfill_page_size,
+        queue_size: int = settings.ingestion.backfill_queue_size,
+        checkpoint_path: Optional[str] = settings.ingestion.backfill_checkpoint_path,
+    ):
+        self.client = client
+        self.provider = provider
+        self.page_size = page_size
+        self.queue_size = queue_size
+        self.checkpoint_path = checkpoint_path
+        self.chunker = DialogChunker()
+        self.progress = BackfillProgress()
+
+    async def run(self, from_start: bool = False) -> BackfillProgress:
+        after = None if from_start else read_checkpoint(self.checkpoint_path)
+        if after is not None:
+            logger.info(f"Resuming backfill after session {after}")
+
+        await run_stages(self._pages(after), [self._tag, self._embed, self._write], self.queue_size)
+
+        self.progress.report(force=True)
+        return self.progress
+
+    async def _pages(self, after: Optional[UUID]) -> AsyncIterator[SessionPage]:
+        async for session_id in stream_sessions(after, self.page_size):
+            await self._prepare(session_id)
+            state = ChunkerStateModel()
+            near_duplicates = near_duplicate_filter()
+            pending: Optional[SessionPage] = None
+            async for messages in stream_messages(session_id, self.page_size):
+                # The page after tells whether this one is the last, hold one page back
+                if pending is not None:
+                    yield self._settle(pending, near_duplicates)
+                chunks, emotion_texts, next_state = self.chunker.windows(self.chunker.iter_split(messages), state)
+                pending = SessionPage(
+                    session_id=session_id,
+                    messages=len(messages),
+                    max_position=messages[-1]["session_position"],
+                    last=False,
+                    state=next_state,
+                    chunks=chunks,
+                    emotion_texts=emotion_texts,
+                )
+                state = next_state
+            if pending is None:
+                pending = SessionPage(session_id=session_id, messages=0, max_position=0, last=True, state=state)
+            pending.last = True
+            yield self._settle(pending, near_duplicates)
+
+    def _settle(self, page: SessionPage, near_duplicates: Optional[NearDuplicateFilter]) -> SessionPage:
+        """Drops what must not be written yet: a tail window before the last page, near duplicates"""
+        if not page.last and page.state.provisional_chunk_id:
+            page.chunks.pop()
+            page.emotion_texts.pop()
+        if near_duplicates is None:
+            return page
+        kept = [
+            near_duplicates.keep(chunk, remember=chunk["id"] != page.state.provisional_chunk_id)
+            for chunk in page.chunks
+        ]
+        self.progress.suppressed += kept.count(False)
+        page.chunks = [chunk for chunk, keep in zip(page.chunks, kept) if keep]
+        page.emotion_texts = [text for text, keep in zip(page.emotion_texts, kept) if keep]
+        if page.last:
+            page.state = page.state.model_copy(update={
+                "last_chunk_id": near_duplicates.resolve(page.state.last_chunk_id),
+                "near_duplicates": near_duplicates.dump(),
+            })
+        return page
+
+    async def _tag(self, page: SessionPage) -> None:
+        await self.chunker.tag_emotions(page.chunks, page.emotion_texts, self.provider)
+
+    async def _embed(self, page: SessionPage) -> None:
+        page.vectors = await embed_texts(self.provider, [chunk["content"] for chunk in page.chunks], priority="bulk")
+
+    async def _write(self, page: SessionPage) -> None:
+        written = await ingest_chunks(self.client, page.chunks, page.vectors)
+        if not written.ok:
+            # Staged with their embeddings, the ingestion worker replays them for the session
+            unwritten = [(c, v) for c, v in zip(page.chunks, page.vectors) if c["id"] in written.failed]
+            async with get_db() as db:
+                await stage_outbox(db, page.session_id, [c for c, _ in unwritten], [v for _, v in unwritten], written.failed)
+                await db.commit()
+            self.progress.unwritten += len(unwritten)
+        self.progress.messages += page.messages
+        self.progress.chunks += len(page.chunks)
+        if page.last:
+            if page.max_position:
+                await self._complete(page)
+            write_checkpoint(self.checkpoint_path, page.session_id)
+            self.progress.sessions += 1
+        self.progress.report()
+
+    async def _prepare(self, session_id: UUID) -> None:
+        """Drops the chunks of a legacy head (no chunker state), their per-run ids are not overwritten by the backfill"""
+        async with get_db() as db:
+            if not await try_lease_session(db, session_id):
+                # The worker re-chunks a legacy head itself and clears its chunks first
+                return
+            head = await gethead(db, session_id)
+            if head.head and not head.head.chunker_state:
+                await delete_session_chunks(self.client, session_id)
+            await db.commit()
+
+    async def _complete(self, page: SessionPage) -> None:
+        """
+        Moves the session's head and chunker state to where the backfill ended, unless the ingestion
+        worker already got as far. Whichever state loses, its provisional tail is stale and deleted.
+        """
+        async with get_db() as db:
+            if not await try_lease_session(db, page.session_id):
+                logger.warning(f"Session {page.session_id} is being ingested, its head is left to the ingestion worker")
+                return
+            head = await gethead(db, page.session_id)
+            saved_state = head.head.chunker_state if head.head else None
+            stored = ChunkerStateModel.model_validate(saved_state) if saved_state else None
+            if stored and head.current_head >= page.max_position:
+                logger.info(f"Session {page.session_id} head is already at {head.current_head}, keeping the worker's state")
+                stale = page.state.provisional_chunk_id
+                if stale and stale != stored.provisional_chunk_id:
+                    await delete_chunks(self.client, [stale])
+                    await discard_outbox(db, [stale])
+                await db.commit()
+                return
+            stale = stored.provisional_chunk_id if stored else None
+            if stale and stale != page.state.provisional_chunk_id:
+                await delete_chunks(self.client, [stale])
+                await discard_outbox(db, [stale])
+            target = HeadResponse(head=None, current_head=None, max_position=page.max_position)
+            await updatehead(db, page.session_id, target, chunker_state=page.state.model_dump(mode="json"), forward_only=True)
+            await update_is_vectorized(db, page.session_id, 1, page.max_position)
+            await db.commit()
+
+
+async def backfill(reset: bool = False, from_start: bool = False, page_size: int = settings.ingestion.backfill_page_size, queue_size: int = settings.ingestion.backfill_queue_size) -> BackfillProgress:
+    # One long-lived client is enough, the stages share its channel
+    wc = WeaviateClient(size=1)
+    await wc.init_client()
+    try:
+        async with httpx.AsyncClient(timeout=120) as http_client:
+            provider = get_provider(http_client)
+            client = wc.get()
+            if reset:
+                collection = settings.weaviate.weav_collection
+                logger.warning(f"Dropping collection {collection} for a full re-index")
+                await client.collections.delete(collection)
+                await DialogMemorySchema().initialize_schema(client)
+                from_start = True
+            try:
+                return await Backfill(client, provider, page_size=page_size, queue_size=queue_size).run(from_start=from_start)
+            finally:
+                await provider.close()
+    finally:
+        await wc.close()
+
+
+async def requeue() -> int:
+    async with get_db() as db:
+        count = await requeue_outbox(db)
+        await db.commit()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream every session through chunking, emotions, embeddings and Weaviate")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate the collection, implies --from-start")
+    parser.add_argument("--from-start", action="store_true", help="ignore the checkpoint")
+    parser.add_argument("--page-size", type=int, default=settings.ingestion.backfill_page_size)
+    parser.add_argument("--queue-size", type=int, default=settings.ingestion.backfill_queue_size)
+    parser.add_argument("--requeue-outbox", action="store_true", help="retry outbox chunks that exhausted their attempts, then exit")
+    args = parser.parse_args()
+    if args.requeue_outbox:
+        asyncio.run(requeue())
+        return
+    asyncio.run(backfill(reset=args.reset, from_start=args.from_start, page_size=args.page_size, queue_size=args.queue_size))
+
+
+if __name__ == "__main__":
+    main()
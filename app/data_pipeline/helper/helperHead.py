@@ -1,14 +1,45 @@
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import func, text
+import hashlib
+from sqlalchemy.dialects.postgresql import UUID, insert
+from datetime import datetime
+from sqlalchemy import func, text, update
 from app.db.models.ingestion_head import IngestionHead
 from app.db.models.chatmessage import ChatMessage
 from app.schemas.db_models import HeadResponse, MessageModel, IngestionHeadModel
 from sqlalchemy.future import select
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from app.shared.logger import get_logger
 
 logger = get_logger(__name__)
 
+def session_lock_key(session_id: UUID | str) -> int:
+    """Advisory lock key for a session, the same in every process (unlike the salted str hash)"""
+    digest = hashlib.blake2b(str(session_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+async def try_lease_session(db, session_id: UUID | str) -> bool:
+    '''Leases the session for the current transaction, False when another worker holds it'''
+    result = await db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": session_lock_key(session_id)}
+    )
+    return bool(result.scalar())
+
+
+async def pending_sessions(db, limit: int = 500) -> List[UUID]:
+    '''Sessions with messages past their ingestion head, oldest activity first'''
+    # Only unvectorized messages are scanned, through the partial ix_chat_messages_unvectorized index
+    result = await db.execute(
+        select(ChatMessage.session_id)
+        .outerjoin(IngestionHead, IngestionHead.session_id == ChatMessage.session_id)
+        .where(ChatMessage.is_vectorized.is_(False))
+        .where(ChatMessage.position > func.coalesce(IngestionHead.current_position, 0))
+        .group_by(ChatMessage.session_id)
+        .order_by(func.min(ChatMessage.created_at))
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
 async def gethead(db, session_id: UUID | str) -> HeadResponse:
     '''Gets head pointing to last vectorized message'''
     logger.info(f"Getting head for session {session_id}")
@@ -28,36 +59,50 @@ async def gethead(db, session_id: UUID | str) -> HeadResponse:
         raise
 
 
-async def updatehead(db, session_id: UUID | str, head: HeadResponse) -> None:
-    '''Updates head to last vectorized message with advisory lock'''
+async def updatehead(db, session_id: UUID | str, head: HeadResponse, chunker_state: Optional[Dict[str, Any]] = None, forward_only: bool = False) -> None:
+    '''
+    Upserts head to last vectorized message, the session lease is held by the caller.
+    With forward_only a stored head is only overwritten when it is behind or has no chunker state.
+    '''
     logger.info(f"Updating head for session {session_id}")
 
-    lock_id = hash(str(session_id)) % 2**31
-    await db.execute(text(f"SELECT pg_advisory_lock({lock_id})"))
     try:
-        if not head.head:
-            ihead = IngestionHead(
-                session_id=session_id,
-                current_position=head.max_position
+        now = datetime.now()
+        stmt = insert(IngestionHead).values(
+            session_id=session_id,
+            current_position=head.max_position,
+            chunker_state=chunker_state,
+            updated_at=now
+        )
+        where = (IngestionHead.current_position < stmt.excluded.current_position) | IngestionHead.chunker_state.is_(None) if forward_only else None
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[IngestionHead.session_id],
+                set_={
+                    "current_position": stmt.excluded.current_position,
+                    "chunker_state": stmt.excluded.chunker_state,
+                    "updated_at": now
+                },
+                where=where
             )
-            db.add(ihead)
-        else:
-            head.head.current_position = head.max_position
+        )
         logger.info(f"Updated head to {head.max_position} for session {session_id}")
     except Exception as e:
         logger.error(f"Updating head failed for session {session_id}: {str(e)}")
         raise
-    finally:
-        await db.execute(text(f"SELECT pg_advisory_unlock({lock_id})"))
 
-    
 
-async def update_is_vectorized(db, messages: List[MessageModel]) -> None:
-    '''Mark messages as vectorized'''
+async def update_is_vectorized(db, session_id: UUID | str, first_position: int, last_position: int) -> None:
+    '''Mark messages in a position range as vectorized with one UPDATE'''
     try:
-        for message in messages:
-            message.is_vectorized = True
-        logger.info(f"Marked {len(messages)} messages as vectorized")
+        result = await db.execute(
+            update(ChatMessage)
+            .where(ChatMessage.session_id == session_id)
+            .where(ChatMessage.position.between(first_position, last_position))
+            .values(is_vectorized=True)
+            .execution_options(synchronize_session=False)
+        )
+        logger.info(f"Marked {result.rowcount} messages as vectorized")
     except Exception as e:
         logger.error(f"Failed to update messages is_vectorized flag: {str(e)}")
-        raise
\ No newline at end of file
+        raise
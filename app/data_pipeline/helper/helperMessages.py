@@ -0,0 +1,86 @@
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.future import select
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
+from app.db.models.chatmessage import ChatMessage, MessageRole
+from app.db.models.chatsession import ChatSession
+from app.db.models.user import User
+from app.shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MessageRow(NamedTuple):
+    """The columns ingestion needs from a chat message, no ORM identity or relationships"""
+    role: MessageRole
+    content: str
+    position: int
+    created_at: datetime
+
+
+def user_name_stmt(session_id: UUID | str) -> Select:
+    return select(User.name).join(ChatSession, ChatSession.user_id == User.id).where(ChatSession.id == session_id)
+
+
+def message_rows_stmt(session_id: UUID | str, after: int = 0, until: Optional[int] = None, limit: Optional[int] = None, after_role: Optional[MessageRole] = None) -> Select:
+    '''
+    Messages of a session past position after (up to until), in position order.
+    The user and assistant rows of a position are tie-broken on role (enum declaration order on Postgres),
+    so every run hands the chunker the same sequence, backed by uq_session_position_role.
+    With after_role the rows of position after that sort past it are included, a keyset on (position, role).
+    '''
+    stmt = select(ChatMessage.role, ChatMessage.content, ChatMessage.position, ChatMessage.created_at)\
+        .where(ChatMessage.session_id == session_id)\
+        .order_by(ChatMessage.position.asc(), ChatMessage.role.asc())
+    if after_role is None:
+        stmt = stmt.where(ChatMessage.position > after)
+    else:
+        stmt = stmt.where(tuple_(ChatMessage.position, ChatMessage.role) > tuple_(literal(after), literal(after_role, ChatMessage.role.type)))
+    if until is not None:
+        stmt = stmt.where(ChatMessage.position <= until)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+async def session_user_name(db, session_id: UUID | str) -> Optional[str]:
+    '''Name of the user a session belongs to, looked up once instead of per message'''
+    result = await db.execute(user_name_stmt(session_id))
+    return result.scalar_one_or_none()
+
+
+async def fetch_message_rows(db, session_id: UUID | str, after: int = 0, until: Optional[int] = None, limit: Optional[int] = None, after_role: Optional[MessageRole] = None) -> List[MessageRow]:
+    result = await db.execute(message_rows_stmt(session_id, after=after, until=until, limit=limit, after_role=after_role))
+    return [MessageRow._make(row) for row in result]
+
+
+async def message_pages(db, session_id: UUID | str, page_size: int, after: int = 0, until: Optional[int] = None) -> AsyncIterator[List[MessageRow]]:
+    '''
+    Messages of a session past position after (up to until) in pages of at most page_size rows.
+    Pages are keyed on (position, role), a page ending between the user and assistant row
+    of a position picks up with the other one.
+    '''
+    after_role: Optional[MessageRole] = None
+    while True:
+        rows = await fetch_message_rows(db, session_id, after=after, until=until, limit=page_size, after_role=after_role)
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        after, after_role = rows[-1].position, rows[-1].role
+
+
+def chunker_messages(session_id: UUID | str, name: Optional[str], rows: List[MessageRow]) -> List[Dict]:
+    '''Message dicts in the shape DialogChunker expects'''
+    return [
+        {
+            "session_id" : session_id,
+            "name" : name,
+            "role" : row.role.value,
+            "content" : row.content,
+            "session_position" : row.position,
+            "message_created_at" : row.created_at,
+        }
+        for row in rows
+    ]
@@ -1,35 +1,106 @@
-from transformers import AutoTokenizer, pipeline
-from optimum.onnxruntime import ORTModelForSequenceClassification
+import numpy as np
+from typing import TYPE_CHECKING, Dict, List, Optional
 from app.config.settings import settings
+from app.shared.emotion_cache import EmotionCache
 from app.shared.logger import get_logger
 
+if TYPE_CHECKING:
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
 logger = get_logger(__name__)
 
-class OnnxPipeline:
-    def __init__(self):
-        self.pipeline = None
-        self.tokenizer = AutoTokenizer.from_pretrained("SamLowe/roberta-base-go_emotions-onnx")
-
-    def init_pipeline(self, model):
-        try:
-            self.pipeline = pipeline(
-            task="text-classification",
-            model=model,
-            tokenizer=self.tokenizer,
-            top_k=None,
-            function_to_apply="sigmoid"
+EMOTION_MODEL = "SamLowe/roberta-base-go_emotions-onnx"
+EMOTION_MODEL_FILE = "model_quantized.onnx"
+
+_cache: EmotionCache | None = None
+
+def get_emotion_cache() -> EmotionCache:
+    global _cache
+    if _cache is None:
+        _cache = EmotionCache(
+            # Truncation length changes the labels of long texts, so it is part of the version
+            model_version=f"{EMOTION_MODEL}/{EMOTION_MODEL_FILE}@{settings.serving.emotion_max_tokens}",
+            max_entries=settings.cache.emotion_cache_size,
+            path=settings.cache.emotion_cache_path,
+            ttl_seconds=settings.cache.emotion_cache_ttl_seconds,
         )
-            logger.info(f"Onnx pipeline initialized")
-        except Exception as e:
-            logger.error(f"Onnx pipeline initialization failed: {str(e)}")
-            raise
-
-    def get(self) -> pipeline:
-        if not self.pipeline:
-            logger.info("Onnx pipeline not initialized")
-            raise RuntimeError("Onnx pipeline not initialized")
-        return self.pipeline
-
-    def delete(self):
-        logger.info("Onnx pipeline delete")
-        self.pipeline = None
+    return _cache
+
+class OnnxEmotionEngine:
+    """
+    Emotion inference straight on ORTModelForSequenceClassification.
+    Tokenizes once with truncation, groups inputs into sequence-length buckets so a
+    batch is only padded to its own bucket, and extracts top-k labels with NumPy.
+    """
+    def __init__(
+        self,
+        model: "ORTModelForSequenceClassification",
+        tokenizer=None,
+        max_tokens: int = settings.serving.emotion_max_tokens,
+        bucket_width: int = settings.serving.emotion_bucket_width,
+        batch_size: int = settings.serving.emotion_infer_batch,
+        cache: Optional[EmotionCache] = None,
+    ):
+        self.model = model
+        if tokenizer is None:
+            # Imported here so the engine itself only needs NumPy (and stays testable without the model stack)
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(EMOTION_MODEL)
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.bucket_width = bucket_width
+        self.batch_size = batch_size
+        self.cache = cache
+        id2label = model.config.id2label
+        self.labels = np.array([id2label[i] for i in range(len(id2label))], dtype=object)
+        logger.info(f"Onnx emotion engine initialized (max_tokens={max_tokens}, bucket_width={bucket_width})")
+
+    def buckets(self, lengths: np.ndarray) -> Dict[int, np.ndarray]:
+        """Input indices grouped by padded length, rounded up to the bucket width"""
+        padded = -(-lengths // self.bucket_width) * self.bucket_width
+        order = np.argsort(lengths, kind="stable")
+        return {int(size): order[padded[order] == size] for size in np.unique(padded)}
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """Sigmoid scores per label, one row per text"""
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_tokens, padding=False)
+        input_ids = encoded["input_ids"]
+        lengths = np.array([len(ids) for ids in input_ids])
+        pad_id = self.tokenizer.pad_token_id or 0
+
+        probs = np.empty((len(texts), len(self.labels)), dtype=np.float32)
+        for indices in self.buckets(lengths).values():
+            for start in range(0, len(indices), self.batch_size):
+                batch = indices[start:start + self.batch_size]
+                width = int(lengths[batch].max())
+                ids = np.full((len(batch), width), pad_id, dtype=np.int64)
+                mask = np.zeros((len(batch), width), dtype=np.int64)
+                for row, i in enumerate(batch):
+                    ids[row, :lengths[i]] = input_ids[i]
+                    mask[row, :lengths[i]] = 1
+                logits = np.asarray(self.model(input_ids=ids, attention_mask=mask).logits, dtype=np.float32)
+                probs[batch] = 1.0 / (1.0 + np.exp(-logits))
+        return probs
+
+    def _top_k(self, texts: List[str], k: int) -> List[List[str]]:
+        probs = self.predict_proba(texts)
+        k = min(k, probs.shape[1])
+        best = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(probs, best, axis=1), axis=1, kind="stable")
+        best = np.take_along_axis(best, order, axis=1)
+        return self.labels[best].tolist()
+
+    def top_k(self, texts: List[str], k: int = 2) -> List[List[str]]:
+        """Top-k labels per text, duplicates and cached texts are not run through the model"""
+        if not texts:
+            return []
+        unique = list(dict.fromkeys(texts))
+        found = self.cache.get_many(unique, k) if self.cache is not None else {}
+
+        missing = [text for text in unique if text not in found]
+        if missing:
+            labels = self._top_k(missing, k)
+            found.update(zip(missing, labels))
+            if self.cache is not None:
+                self.cache.put_many(missing, k, labels)
+        return [found[text] for text in texts]
@@ -0,0 +1,144 @@
+import uuid
+from datetime import datetime
+from typing import Dict, List
+from pydantic_core import to_jsonable_python
+from sqlalchemy import Text, case, cast, delete, func, update
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.future import select
+from weaviate import WeaviateAsyncClient
+from app.config.settings import settings
+from app.data_pipeline.push_to_weaviate import WriteResult, ingest_chunks
+from app.db.models.chunk_outbox import ChunkOutbox, OutboxState
+from app.shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _ids(chunk_ids) -> List[uuid.UUID]:
+    return [uuid.UUID(str(chunk_id)) for chunk_id in chunk_ids]
+
+
+def outbox_payload(chunk: dict) -> dict:
+    return to_jsonable_python(chunk)
+
+
+def restore_chunk(payload: dict) -> dict:
+    '''Chunk dict back from its JSON payload, timestamps as datetimes again'''
+    metadata = payload["metadata"]
+    metadata["timestamp"] = [datetime.fromisoformat(ts) for ts in metadata.get("timestamp") or []]
+    return payload
+
+
+async def stage_outbox(db, session_id: UUID | str, chunks: List[dict], embeddings: List[list], errors: Dict[str, str]) -> None:
+    '''Keeps computed chunks that did not reach Weaviate as pending rows, committed by the caller'''
+    if not chunks:
+        return
+    now = datetime.now()
+    stmt = insert(ChunkOutbox).values([
+        {
+            "chunk_id": uuid.UUID(str(chunk["id"])),
+            "session_id": session_id,
+            "payload": outbox_payload(chunk),
+            "embedding": [float(x) for x in embedding],
+            "state": OutboxState.PENDING,
+            "attempts": 1,
+            "last_error": errors.get(chunk["id"]),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for chunk, embedding in zip(chunks, embeddings)
+    ])
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ChunkOutbox.chunk_id],
+            set_={
+                "payload": stmt.excluded.payload,
+                "embedding": stmt.excluded.embedding,
+                "state": OutboxState.PENDING,
+                "attempts": ChunkOutbox.attempts + 1,
+                "last_error": stmt.excluded.last_error,
+                "updated_at": now,
+            }
+        )
+    )
+    logger.info(f"Staged {len(chunks)} unwritten chunks in the outbox for session {session_id}")
+
+
+async def pending_outbox(db, session_id: UUID | str, limit: int = settings.ingestion.outbox_replay_limit):
+    '''Pending rows of a session, oldest first, only what the replay needs'''
+    result = await db.execute(
+        select(ChunkOutbox.chunk_id, ChunkOutbox.payload, ChunkOutbox.embedding)
+        .where(ChunkOutbox.session_id == session_id)
+        .where(ChunkOutbox.state == OutboxState.PENDING)
+        .order_by(ChunkOutbox.created_at)
+        .limit(limit)
+    )
+    return result.all()
+
+
+async def mark_outbox(db, written: List[str], failed: Dict[str, str], max_attempts: int = settings.ingestion.outbox_max_attempts) -> None:
+    '''Records a replay, written rows are deleted and failed rows give up after max_attempts'''
+    now = datetime.now()
+    if written:
+        # Weaviate holds the chunk now, keeping its payload would only grow the table
+        await discard_outbox(db, written)
+    if failed:
+        await db.execute(
+            update(ChunkOutbox)
+            .where(ChunkOutbox.chunk_id.in_(_ids(failed)))
+            .values(
+                attempts=ChunkOutbox.attempts + 1,
+                last_error=case(failed, value=cast(ChunkOutbox.chunk_id, Text)),
+                state=case((ChunkOutbox.attempts + 1 >= max_attempts, OutboxState.FAILED), else_=OutboxState.PENDING),
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def discard_outbox(db, chunk_ids: List[str]) -> None:
+    '''Drops rows of chunks superseded by a later run'''
+    if chunk_ids:
+        await db.execute(
+            delete(ChunkOutbox).where(ChunkOutbox.chunk_id.in_(_ids(chunk_ids))).execution_options(synchronize_session=False)
+        )
+
+
+async def requeue_outbox(db, session_id: UUID | str | None = None) -> int:
+    '''Gives rows that exhausted their attempts a fresh set, replayed by the next ingestion of their session'''
+    stmt = update(ChunkOutbox).where(ChunkOutbox.state == OutboxState.FAILED)
+    if session_id is not None:
+        stmt = stmt.where(ChunkOutbox.session_id == session_id)
+    result = await db.execute(
+        stmt.values(state=OutboxState.PENDING, attempts=0, updated_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    logger.info(f"Requeued {result.rowcount} failed outbox chunks")
+    return result.rowcount
+
+
+async def outbox_sessions(db, limit: int = 500) -> List[UUID]:
+    '''Sessions with pending outbox rows, for the ingestion worker sweep'''
+    result = await db.execute(
+        select(ChunkOutbox.session_id)
+        .where(ChunkOutbox.state == OutboxState.PENDING)
+        .group_by(ChunkOutbox.session_id)
+        .order_by(func.min(ChunkOutbox.created_at))
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def replay_outbox(db, client: WeaviateAsyncClient, session_id: UUID | str) -> WriteResult:
+    '''
+    Writes a session's pending outbox rows to Weaviate from their stored payload and embedding,
+    nothing is chunked, tagged or embedded again. The session lease is held by the caller.
+    '''
+    rows = await pending_outbox(db, session_id)
+    if not rows:
+        return WriteResult()
+    chunks = [restore_chunk(row.payload) | {"id": str(row.chunk_id)} for row in rows]
+    result = await ingest_chunks(client, chunks, [row.embedding for row in rows])
+    await mark_outbox(db, result.written, result.failed)
+    logger.info(f"Replayed {len(result.written)}/{len(rows)} outbox chunks for session {session_id}")
+    return result
@@ -1,92 +1,109 @@
 import asyncio
+from itertools import zip_longest
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.future import select
-from app.db.models import ChatMessage, ChatSession, User
-from .helper.helperHead import gethead, updatehead, update_is_vectorized
+from .helper.helperMessages import session_user_name, message_pages, chunker_messages
+from .helper.helperHead import gethead, updatehead, update_is_vectorized, try_lease_session, pending_sessions
+from .helper.helperOutbox import replay_outbox, stage_outbox, discard_outbox, outbox_sessions
 from app.core.strategy.chunker import DialogChunker
 from weaviate import WeaviateAsyncClient
 from httpx import AsyncClient
-from app.schemas.db_models import HeadResponse, MessageModel
-from sqlalchemy.orm import joinedload
-from app.data_pipeline.push_to_weaviate import ingest_chunk
+from app.core.factory.providers import ModelProvider, HttpModelProvider
+from app.schemas.db_models import HeadResponse, MessageModel, ChunkerStateModel
+from app.data_pipeline.push_to_weaviate import delete_chunks, delete_session_chunks
+from app.data_pipeline.pipeline import IngestionPipeline
+from app.core.strategy.dedup import near_duplicate_filter
 from weaviate.util import generate_uuid5
-from tqdm import tqdm
 from app.conn.postgre_conn import get_db
-from app.conn.clients import post_json
+from app.config.settings import settings
+from typing import List
 from app.shared.logger import get_logger
 
 logger = get_logger(__name__)
-vectorizer_url = "http://127.0.0.1:8083/vectorize"
 
-async def ingest_ready_messages(session_id: UUID, client: WeaviateAsyncClient, http_client: AsyncClient):
-    """Ingest messages to vector database for a session with advisory lock"""
+async def ingest_ready_messages(session_id: UUID, client: WeaviateAsyncClient, provider: ModelProvider) -> bool:
+    """
+    Ingest messages to vector database for a session with advisory lock.
+    Chunks left in the outbox by an earlier run are written first, chunks that fail to write
+    are staged in the outbox with their embeddings in the same transaction as the head update.
+    Returns False without doing anything when another worker holds the session,
+    errors are logged and re-raised so the caller counts the run as failed.
+
+    The lease is a transaction-level advisory lock, deliberately: it is released by the same
+    commit that writes the head, chunker state and outbox rows, and cannot outlive a crashed
+    run on a pooled connection. The cost is one connection idle in transaction during the
+    model and Weaviate calls, keep idle_in_transaction_session_timeout above the longest run.
+    """
     logger.info(f"Starting ingestion for session {session_id}")
 
     try:
         async with get_db() as db:
+            # Held until the transaction ends, released on commit or when the session closes
+            if not await try_lease_session(db, session_id):
+                logger.info(f"Session {session_id} is being ingested by another worker, skipping")
+                return False
+            # Earlier failures are replayed from their stored embeddings, nothing is recomputed
+            await replay_outbox(db, client, session_id)
             head_response: HeadResponse = await gethead(db, session_id)
-            stmt = select(ChatMessage)\
-            .join(ChatSession, ChatMessage.session_id == ChatSession.id)\
-            .join(User, ChatSession.user_id == User.id)\
-            .filter(ChatMessage.session_id == session_id)\
-            .filter(ChatMessage.position > head_response.current_head)\
-            .options(joinedload(ChatMessage.session).joinedload(ChatSession.user))\
-            .order_by(ChatMessage.position.asc())
-            results = await db.execute(stmt)
-            messages = results.scalars().all()
-
-            if not messages:
+            saved_state = head_response.head.chunker_state if head_response.head else None
+            state = ChunkerStateModel.model_validate(saved_state) if saved_state else None
+            # Heads written before chunker state existed are re-chunked once from the start to seed it,
+            # their chunks carry per-run ids the new index-based ones do not overwrite, so they go first
+            start = head_response.current_head if state or not head_response.head else 0
+            if head_response.head and not state:
+                await delete_session_chunks(client, session_id)
+            if head_response.max_position <= start:
                 logger.info("No new messages")
-                return
+                await db.commit()
+                return True
 
-            messages_dict = [
-                {
-                    "session_id" : message.session_id,
-                    "name" : message.session.user.name,
-                    "role" : message.role.value,
-                    "content" : message.content,
-                    "session_position" : message.position,
-                    "message_created_at" : message.created_at,
-                }
-                for message in messages
-            ]
-            await client.connect()
+            name = await session_user_name(db, session_id)
+            # Read in keyset pages as the pipeline drains them, never the whole delta at once
+            pages = message_pages(db, session_id, settings.ingestion.message_page_size, after=start, until=head_response.max_position)
             chunker = DialogChunker()
-            chunks = await chunker.chunk(messages=messages_dict, http_client=http_client)
             # if client.collections.exists("DialogMemory"):
             #     logger.debug("Deleting collection")
             #     client.collections.delete("DialogMemory")
-            collection = client.collections.get("DialogMemory")
 
-            tasks = []
-            for chunk in tqdm(chunks, desc="Pushing chunks to Weaviate"):
-                try:
-                    exists = await collection.data.exists(chunk["id"])
-                    if not exists:
-                        logger.info(f"Inserting new chunk: {chunk['id']}")
-                        vector_resp = await post_json(http_client, vectorizer_url, {"text": [chunk['content']]})
-                        vector = vector_resp['vector'][0]
-                        tasks.append(ingest_chunk(client=client, chunk=chunk, embedding=vector))
-                    else:
-                        logger.info(f"Chunk {chunk['id']} already exists, skipping.")
-                except Exception as e:
-                    logger.error(f"Chunk ingestion failed for {chunk['id']}: {str(e)}")
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            if all(not isinstance(r, Exception) for r in results):
-                await updatehead(db, session_id, head_response)
-                await update_is_vectorized(db, messages)
-            else:
-                logger.warning("Some chunk ingestions failed; not updating head")
+            # Windows stream through dedup -> emotions -> embed -> insert while later ones are still being cut
+            pipeline = IngestionPipeline(client=client, provider=provider, chunker=chunker)
+            near_duplicates = near_duplicate_filter(state.near_duplicates if state else ())
+            messages = (chunker_messages(session_id, name, rows) async for rows in pages)
+            result = await pipeline.run(chunker.stream_pages(messages, state), near_duplicates=near_duplicates)
+            if result.unwritten:
+                chunks, vectors = zip(*result.unwritten)
+                await stage_outbox(db, session_id, list(chunks), list(vectors), result.write.failed)
+                logger.warning(f"{len(result.unwritten)} chunk ingestions failed; staged in the outbox for replay")
+            # The stored tail is stale unless this run kept a window with its id, a suppressed one replaces nothing
+            previous_tail = state.provisional_chunk_id if state else None
+            if previous_tail and previous_tail not in result.chunk_ids:
+                await delete_chunks(client, [previous_tail])
+                await discard_outbox(db, [previous_tail])
+            next_state = result.state or state
+            await updatehead(db, session_id, head_response, chunker_state=next_state.model_dump(mode="json") if next_state else None)
+            await update_is_vectorized(db, session_id, start + 1, head_response.max_position)
+            await db.commit()
+            return True
 
     except Exception as e:
-        logger.error(f"Ingestion of messages to vector database failed for session{session_id}: {str(e)}")
-            
+        logger.error(f"Ingestion of messages to vector database failed for session {session_id}: {str(e)}")
+        raise
+
+
+async def find_pending_sessions(limit: int = settings.ingestion.worker_sweep_limit) -> List[UUID]:
+    """Sessions with messages not yet ingested or chunks left in the outbox, for the ingestion worker sweep"""
+    async with get_db() as db:
+        behind = await pending_sessions(db, limit=limit)
+        outbox = await outbox_sessions(db, limit=limit)
+    # Interleaved so a large backlog behind the head cannot starve outbox replays
+    interleaved = [s for pair in zip_longest(behind, outbox) for s in pair if s is not None]
+    return list(dict.fromkeys(interleaved))[:limit]
+
 
 def main():
     sid = 'a4a33e50-c3ec-4672-b806-1c8ed51ad6d1'
     async def runner():
         async with AsyncClient() as http_client, WeaviateAsyncClient("http://localhost:8080") as wv_client:
-            await ingest_ready_messages(sid, wv_client, http_client)
+            await ingest_ready_messages(sid, wv_client, HttpModelProvider(http_client))
     asyncio.run(runner())
 
 if __name__== "__main__":
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+from app.config.settings import settings
+from app.shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class IngestionStats:
+    marked: int = 0
+    coalesced: int = 0
+    runs: int = 0
+    skipped_runs: int = 0
+    failed_runs: int = 0
+    sweeps: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    total_lag: float = 0.0
+
+    def observe(self, lag: float) -> None:
+        self.runs += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.total_lag += lag
+
+
+class IngestionWorker:
+    """
+    Out-of-band ingestion driven by "session dirty" events.
+    Events for a session that is already waiting are coalesced into its next run,
+    a session never runs twice at once (events during a run schedule one more run)
+    and at most concurrency sessions are ingested in parallel.
+    Lag is the time from the first unprocessed event of a session to the end of its run.
+
+    With a sweep callable, sessions it reports as pending are marked dirty every
+    sweep_interval seconds, so any number of workers share the backlog; ingest
+    returning False means the session was leased elsewhere and is counted as skipped.
+    """
+    def __init__(
+        self,
+        ingest: Callable[[Any], Awaitable[Any]],
+        concurrency: int = settings.ingestion.worker_concurrency,
+        coalesce_ms: float = settings.ingestion.worker_coalesce_ms,
+        name: str = "ingestion-worker",
+        sweep: Optional[Callable[[], Awaitable[List[Any]]]] = None,
+        sweep_interval: float = settings.ingestion.worker_sweep_interval_s,
+    ):
+        self.ingest = ingest
+        self.concurrency = concurrency
+        self.coalesce = coalesce_ms / 1000
+        self.name = name
+        self.sweep = sweep
+        self.sweep_interval = sweep_interval
+        self.stats = IngestionStats()
+        # session -> monotonic time of its oldest unprocessed event
+        self._dirty: Dict[Hashable, float] = {}
+        self._running: Set[Hashable] = set()
+        self._queue: asyncio.Queue | None = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._queue = asyncio.Queue()
+            self._tasks = [
+                asyncio.create_task(self._run(), name=f"{self.name}-{i}") for i in range(self.concurrency)
+            ]
+            if self.sweep is not None and self.sweep_interval > 0:
+                self._tasks.append(asyncio.create_task(self._sweep(), name=f"{self.name}-sweep"))
+            logger.info(f"{self.name} started (concurrency={self.concurrency}, coalesce={self.coalesce * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._dirty:
+            logger.warning(f"{self.name} stopped with {len(self._dirty)} sessions pending")
+        logger.info(f"{self.name} stopped")
+
+    def mark_dirty(self, session_id: Hashable) -> None:
+        """Schedules an ingestion run for the session, returns immediately"""
+        if not self._tasks:
+            raise RuntimeError(f"{self.name} not started")
+        self.stats.marked += 1
+        if session_id in self._dirty:
+            self.stats.coalesced += 1
+            return
+        self._dirty[session_id] = time.monotonic()
+        # A running session is queued again when its current run ends
+        if session_id not in self._running:
+            self._queue.put_nowait(session_id)
+
+    def metrics(self) -> dict:
+        now = time.monotonic()
+        return {
+            "pending_sessions": len(self._dirty),
+            "running_sessions": len(self._running),
+            "oldest_pending_seconds": round(now - min(self._dirty.values()), 3) if self._dirty else 0.0,
+            "events": self.stats.marked,
+            "coalesced_events": self.stats.coalesced,
+            "runs": self.stats.runs,
+            "skipped_runs": self.stats.skipped_runs,
+            "failed_runs": self.stats.failed_runs,
+            "sweeps": self.stats.sweeps,
+            "lag_seconds": {
+                "last": round(self.stats.last_lag, 3),
+                "max": round(self.stats.max_lag, 3),
+                "avg": round(self.stats.total_lag / self.stats.runs, 3) if self.stats.runs else 0.0,
+            },
+        }
+
+    async def _process(self, session_id: Hashable) -> None:
+        # Let a burst of turns settle into this run
+        if self.coalesce > 0:
+            await asyncio.sleep(self.coalesce)
+        since = self._dirty.pop(session_id)
+        self._running.add(session_id)
+        try:
+            if await self.ingest(session_id) is False:
+                self.stats.skipped_runs += 1
+        except Exception as e:
+            self.stats.failed_runs += 1
+            logger.error(f"{self.name} ingestion failed for session {session_id}: {str(e)}")
+        finally:
+            self._running.discard(session_id)
+            self.stats.observe(time.monotonic() - since)
+            if session_id in self._dirty:
+                self._queue.put_nowait(session_id)
+
+    async def _sweep(self) -> None:
+        while True:
+            try:
+                sessions = await self.sweep()
+                self.stats.sweeps += 1
+                for session_id in sessions:
+                    self.mark_dirty(session_id)
+                if sessions:
+                    logger.info(f"{self.name} sweep found {len(sessions)} pending sessions")
+            except Exception as e:
+                logger.error(f"{self.name} sweep failed: {str(e)}")
+            await asyncio.sleep(self.sweep_interval)
+
+    async def _run(self) -> None:
+        while True:
+            session_id = await self._queue.get()
+            try:
+                await self._process(session_id)
+            finally:
+                self._queue.task_done()
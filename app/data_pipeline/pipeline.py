@@ -0,0 +1,114 @@
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from weaviate import WeaviateAsyncClient
+from app.config.settings import settings
+from app.core.factory.providers import ModelProvider
+from app.core.strategy.chunker import DialogChunker, Window
+from app.core.strategy.dedup import NearDuplicateFilter
+from app.core.strategy.embedder import embed_texts
+from app.data_pipeline.push_to_weaviate import WriteResult, existing_chunk_ids, ingest_chunks
+from app.schemas.db_models import ChunkerStateModel
+from app.shared.logger import get_logger
+from app.shared.stages import run_stages
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class WindowBatch:
+    chunks: List[Dict] = field(default_factory=list)
+    emotion_texts: List[str] = field(default_factory=list)
+    vectors: List[List[float]] = field(default_factory=list)
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one ingestion run, state is None when no window was produced"""
+    write: WriteResult = field(default_factory=WriteResult)
+    # Chunks that failed to write, with their embedding, for the outbox
+    unwritten: List[Tuple[Dict, List[float]]] = field(default_factory=list)
+    # Windows kept after near-duplicate suppression, written now or already in Weaviate
+    chunk_ids: Set[str] = field(default_factory=set)
+    existing: int = 0
+    suppressed: int = 0
+    state: Optional[ChunkerStateModel] = None
+
+
+async def batched(windows: AsyncIterator[Window], size: int, result: PipelineResult, near_duplicates: Optional[NearDuplicateFilter] = None) -> AsyncIterator[WindowBatch]:
+    batch = WindowBatch()
+    async for window in windows:
+        if window.state is not None:
+            result.state = window.state
+        if near_duplicates is not None:
+            # A tail window is replaced by a later run, it must not suppress anything
+            provisional = window.state is not None and window.state.provisional_chunk_id == window.chunk["id"]
+            if not near_duplicates.keep(window.chunk, remember=not provisional):
+                result.suppressed += 1
+                continue
+        result.chunk_ids.add(window.chunk["id"])
+        batch.chunks.append(window.chunk)
+        batch.emotion_texts.append(window.emotion_text)
+        if len(batch.chunks) >= size:
+            yield batch
+            batch = WindowBatch()
+    if batch.chunks:
+        yield batch
+
+
+class IngestionPipeline:
+    """
+    Streams chunker windows through bounded-queue stages running concurrently:
+    drop chunks already in Weaviate, tag emotions, embed, batch insert.
+    Near-duplicate windows are suppressed before any of them when a filter is given.
+    """
+    def __init__(
+        self,
+        client: WeaviateAsyncClient,
+        provider: ModelProvider,
+        chunker: Optional[DialogChunker] = None,
+        batch_size: int = settings.ingestion.pipeline_batch_size,
+        queue_size: int = settings.ingestion.pipeline_queue_size,
+    ):
+        self.client = client
+        self.provider = provider
+        self.chunker = chunker or DialogChunker()
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    async def run(self, windows: AsyncIterator[Window], near_duplicates: Optional[NearDuplicateFilter] = None) -> PipelineResult:
+        result = PipelineResult()
+
+        async def dedup(batch: WindowBatch) -> None:
+            existing = await existing_chunk_ids(self.client, [chunk["id"] for chunk in batch.chunks])
+            if existing:
+                kept = [(c, t) for c, t in zip(batch.chunks, batch.emotion_texts) if str(c["id"]) not in existing]
+                batch.chunks = [c for c, _ in kept]
+                batch.emotion_texts = [t for _, t in kept]
+                result.existing += len(existing)
+
+        async def tag(batch: WindowBatch) -> None:
+            await self.chunker.tag_emotions(batch.chunks, batch.emotion_texts, self.provider)
+
+        async def embed(batch: WindowBatch) -> None:
+            batch.vectors = await embed_texts(self.provider, [chunk["content"] for chunk in batch.chunks], priority="bulk")
+
+        async def write(batch: WindowBatch) -> None:
+            written = await ingest_chunks(self.client, batch.chunks, batch.vectors)
+            result.write.written.extend(written.written)
+            result.write.failed.update(written.failed)
+            if written.failed:
+                result.unwritten.extend(
+                    (chunk, vector) for chunk, vector in zip(batch.chunks, batch.vectors) if chunk["id"] in written.failed
+                )
+
+        await run_stages(batched(windows, self.batch_size, result, near_duplicates), [dedup, tag, embed, write], self.queue_size)
+        if near_duplicates is not None and result.state is not None:
+            result.state = result.state.model_copy(update={
+                "last_chunk_id": near_duplicates.resolve(result.state.last_chunk_id),
+                "near_duplicates": near_duplicates.dump(),
+            })
+        logger.info(
+            f"Pipeline wrote {len(result.write.written)}/{len(result.chunk_ids)} kept chunks "
+            f"({result.existing} already in Weaviate, {result.suppressed} near duplicates, {len(result.write.failed)} failed)"
+        )
+        return result
@@ -1,38 +1,137 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Set
 from uuid import UUID
 from weaviate import WeaviateAsyncClient
+from weaviate.classes.data import DataObject
+from weaviate.classes.query import Filter
+from app.config.settings import settings
 from app.shared.logger import get_logger
 
 logger = get_logger(__name__)
 
-async def ingest_chunk(client: WeaviateAsyncClient, chunk: dict, embedding: list):
-    """Ingest chunks to weaviate db"""
-    try:
-        collection = client.collections.get("DialogMemory")
-
-        metadata = chunk["metadata"]
-        temporal = metadata.get("temporal_context", {})
-
-        logger.info(f"Ingesting chunks to Weaviate: {chunk['id']}")
-        await collection.data.insert(
-            properties={
-                "content": chunk["content"],
-                "session_id": UUID(str(metadata["session_id"])),
-                "username": metadata.get("username"),
-                "speakers": metadata.get("speakers"),
-                "emotions": metadata.get("emotions"),
-                "timestamp": metadata.get("timestamp"),
-                "temporal_context": {
-                    "start_index": temporal.get("start_index", -1),
-                    "end_index": temporal.get("end_index", -1),
-                    "session_position": temporal.get("session_position", []),
-                    "message_indices": temporal.get("message_indices", []),
-                    "prev_chunk_id": temporal.get("prev_chunk_id", None),
-                    "time_span_seconds": temporal.get("time_span_seconds", 0.0)
-                }
-            },
-            uuid=chunk["id"],
-            vector=embedding
-        )
-        logger.info("Ingestion successfull.")
-    except Exception as e:
-        logger.warning(f"Ingestion of chunks {chunk['id']} failed: {str(e)}")
\ No newline at end of file
+
+@dataclass
+class WriteResult:
+    """Outcome of a batched write, failed maps chunk id to the Weaviate error"""
+    written: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def chunk_properties(chunk: dict) -> dict:
+    metadata = chunk["metadata"]
+    temporal = metadata.get("temporal_context", {})
+    return {
+        "content": chunk["content"],
+        "session_id": UUID(str(metadata["session_id"])),
+        "username": metadata.get("username"),
+        "speakers": metadata.get("speakers"),
+        "emotions": metadata.get("emotions"),
+        "timestamp": metadata.get("timestamp"),
+        "temporal_context": {
+            "start_index": temporal.get("start_index", -1),
+            "end_index": temporal.get("end_index", -1),
+            "session_position": temporal.get("session_position", []),
+            "message_indices": temporal.get("message_indices", []),
+            "prev_chunk_id": temporal.get("prev_chunk_id", None),
+            "time_span_seconds": temporal.get("time_span_seconds", 0.0)
+        }
+    }
+
+
+async def existing_chunk_ids(
+    client: WeaviateAsyncClient,
+    ids: List[str],
+    batch_size: int = settings.ingestion.weaviate_lookup_batch_size,
+    concurrency: int = settings.ingestion.weaviate_concurrency,
+) -> Set[str]:
+    """
+    Resolves which chunk ids are already in weaviate db with one filtered id query
+    per batch_size ids, no properties or vectors are returned.
+    """
+    if not ids:
+        return set()
+
+    collection = client.collections.get("DialogMemory")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(part: List[str]) -> Set[str]:
+        async with semaphore:
+            response = await collection.query.fetch_objects(
+                filters=Filter.by_id().contains_any(part),
+                limit=len(part),
+                return_properties=[],
+            )
+        return {str(obj.uuid) for obj in response.objects}
+
+    unique = list(dict.fromkeys(str(i) for i in ids))
+    found = await asyncio.gather(*(lookup(unique[i:i + batch_size]) for i in range(0, len(unique), batch_size)))
+    return set().union(*found)
+
+
+async def delete_chunks(client: WeaviateAsyncClient, ids: List[str]) -> None:
+    """Removes chunks superseded by a later run, e.g. a tail window that has since completed"""
+    if not ids:
+        return
+    collection = client.collections.get("DialogMemory")
+    await collection.data.delete_many(where=Filter.by_id().contains_any(ids))
+    logger.info(f"Deleted {len(ids)} stale chunks from Weaviate")
+
+
+async def delete_session_chunks(client: WeaviateAsyncClient, session_id: UUID | str) -> None:
+    """Removes every chunk of a session, before it is re-chunked from the start"""
+    collection = client.collections.get("DialogMemory")
+    result = await collection.data.delete_many(where=Filter.by_property("session_id").equal(UUID(str(session_id))))
+    logger.info(f"Deleted {result.successful} chunks of session {session_id} from Weaviate")
+
+
+async def ingest_chunks(
+    client: WeaviateAsyncClient,
+    chunks: List[dict],
+    embeddings: List[list],
+    batch_size: int = settings.ingestion.weaviate_batch_size,
+    concurrency: int = settings.ingestion.weaviate_concurrency,
+) -> WriteResult:
+    """
+    Ingest chunks to weaviate db with insert_many over gRPC, batch_size objects per call
+    and at most concurrency calls in flight. Failures are reported per chunk so only
+    those need to be written again.
+    """
+    result = WriteResult()
+    if not chunks:
+        return result
+
+    collection = client.collections.get("DialogMemory")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def write(part: List[dict], vectors: List[list]):
+        async with semaphore:
+            try:
+                response = await collection.data.insert_many([
+                    DataObject(properties=chunk_properties(chunk), uuid=chunk["id"], vector=vector)
+                    for chunk, vector in zip(part, vectors)
+                ])
+            except Exception as e:
+                logger.warning(f"Batch of {len(part)} chunks failed: {str(e)}")
+                result.failed.update((chunk["id"], str(e)) for chunk in part)
+                return
+        for i, chunk in enumerate(part):
+            error = response.errors.get(i)
+            if error is None:
+                result.written.append(chunk["id"])
+            else:
+                result.failed[chunk["id"]] = error.message
+
+    await asyncio.gather(*(
+        write(chunks[i:i + batch_size], embeddings[i:i + batch_size])
+        for i in range(0, len(chunks), batch_size)
+    ))
+
+    logger.info(f"Ingested {len(result.written)}/{len(chunks)} chunks to Weaviate")
+    for chunk_id, error in result.failed.items():
+        logger.warning(f"Ingestion of chunk {chunk_id} failed: {error}")
+    return result
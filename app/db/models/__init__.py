@@ -2,4 +2,5 @@ from app.db.base import Base
 from .user import User
 from .chatmessage import ChatMessage
 from .chatsession import ChatSession
-from .ingestion_head import IngestionHead
\ No newline at end of file
+from .ingestion_head import IngestionHead
+from .chunk_outbox import ChunkOutbox
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Text, Enum, DateTime, UniqueConstraint, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, String, Text, Enum, DateTime, UniqueConstraint, Boolean, Index, false
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -21,4 +21,8 @@ class ChatMessage(Base):
     is_vectorized = Column(Boolean, default=False)
 
     session = relationship("ChatSession", back_populates="messages")
-    __table_args__ = (UniqueConstraint('session_id', 'position', 'role', name='uq_session_position_role'),)
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint('session_id', 'position', 'role', name='uq_session_position_role'),
+        # Backs the ingestion sweep, only the not yet vectorized tail of each session is indexed
+        Index('ix_chat_messages_unvectorized', 'session_id', 'position', postgresql_where=is_vectorized.is_(false())),
+    )
\ No newline at end of file
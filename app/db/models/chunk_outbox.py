@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, ForeignKey, Text, Enum, DateTime, Float, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from app.db.base import Base
+from datetime import datetime
+import enum
+
+
+class OutboxState(enum.Enum):
+    PENDING = "pending"  # computed, not in Weaviate yet
+    WRITTEN = "written"  # no longer stored, rows are deleted once written
+    FAILED = "failed"  # gave up after the maximum attempts, requeue with backfill --requeue-outbox
+
+
+class ChunkOutbox(Base):
+    __tablename__ = "chunk_outbox"
+    chunk_id = Column(UUID(as_uuid=True), primary_key=True)
+    session_id = Column(UUID(as_uuid=True), ForeignKey("chat_sessions.id"), nullable=False)
+    payload = Column(JSONB, nullable=False)  # chunk dict as produced by the chunker, emotions included
+    embedding = Column(ARRAY(Float), nullable=True)
+    state = Column(Enum(OutboxState), nullable=False, default=OutboxState.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (Index("ix_chunk_outbox_session_state", "session_id", "state"),)
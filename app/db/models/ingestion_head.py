@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import uuid
@@ -11,6 +11,7 @@ class IngestionHead(Base):
     session_id = Column(UUID(as_uuid=True), ForeignKey("chat_sessions.id"), primary_key=True)
     current_position = Column(Integer, nullable=False, default=0)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    chunker_state = Column(JSONB, nullable=True)
 
     session = relationship("ChatSession", back_populates="ingestion_head")
     __table_args__ = (UniqueConstraint('session_id', name='uq_session_head'),)
\ No newline at end of file
@@ -11,7 +11,10 @@ from app.core.factory.tools.recall_memories import recallMemory
 from app.core.weaviate.schema import DialogMemorySchema
 from app.core.strategy.recall import infer
 from app.data_pipeline.insert_to_db import insert_chat
-from app.data_pipeline.ingestMessage import ingest_ready_messages
+from app.data_pipeline.ingestMessage import ingest_ready_messages, find_pending_sessions
+from app.data_pipeline.ingestion_worker import IngestionWorker
+from app.core.strategy.embedder import get_embedding_cache
+from app.core.factory.providers import get_provider
 import httpx
 import asyncio
 import time
@@ -19,24 +22,32 @@ import uuid
 
 logger = get_logger(__name__)
 
-vectorizer_url = "http://127.0.0.1:8083"
-reranker_url = "http://127.0.0.1:8081"
-emotion_url = "http://127.0.0.1:8082"
 ollama_url = "http://localhost:11434/api/tags"
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.client = httpx.AsyncClient()
+    app.state.provider = get_provider(app.state.client)
     wc = WeaviateClient()
     await wc.init_client()
-    app.state.weaviate_client = wc.get()
-    await DialogMemorySchema().initialize_schema(app.state.weaviate_client)
+    app.state.weaviate = wc
+    async with wc.borrow() as client:
+        await DialogMemorySchema().initialize_schema(client)
+
+    async def ingest(session_id):
+        # Failed runs raise through the borrow, so the client is health-checked before its next use
+        async with wc.borrow() as client:
+            return await ingest_ready_messages(session_id=session_id, client=client, provider=app.state.provider)
 
     app.state.recall_tool = recallMemory()
+    app.state.ingestion = IngestionWorker(ingest, sweep=find_pending_sessions)
+    app.state.ingestion.start()
     logger.info("Main client initialized")
     
     yield
     
+    await app.state.ingestion.stop()
+    await app.state.provider.close()
     await app.state.client.aclose()
     await wc.close()
     app.state.recall_tool = None
@@ -50,20 +61,26 @@ logger.info("Starting app")
 async def health_root():
     return {"status": "ok"}
 
+@main.get("/metrics")
+async def metrics():
+    return {
+        "embedding_cache": get_embedding_cache().metrics(),
+        "ingestion": main.state.ingestion.metrics(),
+        "weaviate": main.state.weaviate.metrics()
+    }
+
 @main.get("/deep-health")
 async def deep_health():
     try:
-        v, r, e, o = await asyncio.gather(
-            get_json(main.state.client, f"{vectorizer_url}/health"),
-            get_json(main.state.client, f"{reranker_url}/health"),
-            get_json(main.state.client, f"{emotion_url}/health"),
+        m, o = await asyncio.gather(
+            main.state.provider.health(),
             get_json(main.state.client, f"{ollama_url}")
         )
         models = o.get("models", [])
         if any(model["name"] == "llama3.2:3b" for model in models):
-            return {"vectorizer":v, "reranker": r, "emotion": e, "ollama": models}
+            return {**m, "ollama": models}
         else:
-            return {"vectorizer":v, "reranker": r, "emotion": e, "ollama": "Ollama server not reachable"}
+            return {**m, "ollama": "Ollama server not reachable"}
         
     except Exception as e:
         logger.info(f"Exception:{e}")
@@ -81,8 +98,8 @@ async def inference_endpoint(input: InferenceQuery):
         t1 = time.time()
         response = await infer(
             user_query=query, 
-            weaviate_client=main.state.weaviate_client,
-            http_client=main.state.client,
+            weaviate_client=main.state.weaviate,
+            provider=main.state.provider,
             tools=main.state.recall_tool,
             session_id=session_id
         )
@@ -94,12 +111,9 @@ async def inference_endpoint(input: InferenceQuery):
         
         try:
             await insert_chat(query=query, response=response, session_id=uuid.UUID(session_id))
-            await ingest_ready_messages(
-                session_id=uuid.UUID(session_id), 
-                client=main.state.weaviate_client,
-                http_client=main.state.client
-            )
-            logger.info("Chat ingestion successfull!")
+            # Chunking, embedding and Weaviate writes happen out of band
+            main.state.ingestion.mark_dirty(uuid.UUID(session_id))
+            logger.info("Chat ingestion scheduled!")
         except Exception as e:
             logger.info(f"Chat ingestion unsucessfull! {e}")
         
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, UUID4
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
 class ChatMessageModel(BaseModel):
@@ -29,6 +29,7 @@ class IngestionHeadModel(BaseModel):
     session_id: UUID4
     current_position: int
     updated_at: Optional[datetime]
+    chunker_state: Optional[Dict[str, Any]] = None
 
     model_config = {
         "from_attributes" : True
@@ -47,3 +48,21 @@ class MessageModel(BaseModel):
     position: int
     created_at: datetime
     is_vectorized: bool
+
+
+class BufferedMessageModel(BaseModel):
+    index: int
+    session_id: UUID4
+    name: Optional[str]
+    role: str
+    content: str
+    session_position: int
+    message_created_at: datetime
+
+class ChunkerStateModel(BaseModel):
+    buffer: List[BufferedMessageModel] = []
+    counter: int = 0
+    last_chunk_id: Optional[str] = None
+    provisional_chunk_id: Optional[str] = None
+    # (simhash, chunk id) of recently kept chunks, for near-duplicate suppression across runs
+    near_duplicates: List[Tuple[int, str]] = []
@@ -1,14 +1,16 @@
 from pydantic import BaseModel, field_validator, Field
-from typing import List
+from typing import List, Union
 
 class EmotionInput(BaseModel):
-    text: str = Field(..., description="Input texts")
+    text: Union[str, List[str]] = Field(..., description="Input text, or a list of texts scored as one batch")
 
     @field_validator("text")
     def non_empty_texts(cls, v):
         if not v:
             raise ValueError("Text must not be empty.")
+        if isinstance(v, list) and not all(isinstance(item, str) and item.strip() for item in v):
+            raise ValueError("All items in 'text' must be non-empty strings.")
         return v
 
 class EmotionResponse(BaseModel):
-    emotions: List[str] = Field(..., description="Top k emotions")
\ No newline at end of file
+    emotions: Union[List[str], List[List[str]]] = Field(..., description="Top k emotions, one list per input text for batch input")
@@ -2,7 +2,7 @@ from pydantic import BaseModel, field_validator, Field
 from typing import List
 
 class RerankInput(BaseModel):
-    text_list: List[List[str]] = Field(..., description="List of list of input texts")
+    text_list: List[List[str]] = Field(..., description="List of [query, passage] pairs")
 
     @field_validator("text_list")
     def non_empty_texts(cls, v):
@@ -11,7 +11,9 @@ class RerankInput(BaseModel):
         for inner_list in v:
             if not isinstance(inner_list, list) or not all(isinstance(item, str) and item.strip() for item in inner_list):
                 raise ValueError("All items in 'text_list' must be non-empty strings.")
+            if len(inner_list) != 2:
+                raise ValueError("Each item in 'text_list' must be a [query, passage] pair.")
         return v
 
 class RerankResponse(BaseModel):
-    score: float = Field(0.0, description="Semantic score from reranker model")
\ No newline at end of file
+    scores: List[float] = Field(default_factory=list, description="Semantic scores from reranker model, one per input pair")
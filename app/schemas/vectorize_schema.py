@@ -1,8 +1,9 @@
 from pydantic import BaseModel, field_validator, Field
-from typing import List
+from typing import List, Literal, Optional
 
 class VectorInput(BaseModel):
     text: List[str] = Field(..., description="List of input texts")
+    priority: Optional[Literal["query", "bulk"]] = Field(None, description="Scheduling lane, inferred from the batch size when omitted")
 
     @field_validator("text")
     def non_empty_texts(cls, v):
@@ -13,4 +14,11 @@ class VectorInput(BaseModel):
         return v
     
 class VectorResponse(BaseModel):
-    vector: List[List[float]] = Field(..., description="Embedding vector")
\ No newline at end of file
+    vector: List[List[float]] = Field(..., description="Embedding vector")
+
+# Binary wire format: raw little-endian rows, shape sent as "rows,dim"
+EMBEDDING_MEDIA_TYPES = {
+    "application/x-embedding-f32": "<f4",
+    "application/x-embedding-f16": "<f2",
+}
+EMBEDDING_SHAPE_HEADER = "X-Embedding-Shape"
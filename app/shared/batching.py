@@ -0,0 +1,193 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+from app.shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Job:
+    items: List[Any]
+    future: asyncio.Future
+
+
+@dataclass
+class BatchStats:
+    requests: int = 0
+    items: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    histogram: Dict[int, int] = field(default_factory=dict)
+
+    def observe(self, size: int) -> None:
+        self.batches += 1
+        # power-of-two buckets: 1, 2, 4, 8, ...
+        bucket = 1 << max(size - 1, 0).bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching for model inference.
+    Collects items submitted by concurrent callers within a time window or up to
+    a maximum batch size, runs one batched call in a worker thread and fans the
+    results back out to the waiting callers.
+
+    Lanes are served in priority order (first lane first), a batch never mixes
+    lanes and large submissions are split so they cannot hold a worker for longer
+    than one batch.
+    """
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 64,
+        window_ms: float = 5.0,
+        executor: Optional[Executor] = None,
+        name: str = "batcher",
+        lanes: Sequence[str] = ("default",),
+        workers: int = 1,
+    ):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000
+        self.executor = executor
+        self.name = name
+        self.lane_names = list(lanes)
+        self.workers = workers
+        self.stats = BatchStats()
+        self._lanes: List[Deque[_Job]] = [deque() for _ in self.lane_names]
+        self._queued_items = [0 for _ in self.lane_names]
+        self._wakeup: asyncio.Event | None = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._wakeup = asyncio.Event()
+            self._tasks = [
+                asyncio.create_task(self._run(), name=f"{self.name}-{i}") for i in range(self.workers)
+            ]
+            logger.info(
+                f"{self.name} started (max_batch_size={self.max_batch_size}, "
+                f"window={self.window * 1000:.1f}ms, workers={self.workers}, lanes={self.lane_names})"
+            )
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Fail whatever is still waiting
+        for lane, queue in enumerate(self._lanes):
+            pending = [self._take(lane, queue.popleft()) for _ in range(len(queue))]
+            self._fail(pending, RuntimeError(f"{self.name} stopped"))
+        logger.info(f"{self.name} stopped")
+
+    async def submit(self, items: List[Any], lane: Optional[str] = None) -> List[Any]:
+        """Queues items for the next batch of the given lane and waits for their results"""
+        if not self._tasks:
+            raise RuntimeError(f"{self.name} not started")
+        if not items:
+            return []
+        index = self.lane_names.index(lane) if lane else 0
+        loop = asyncio.get_running_loop()
+
+        jobs = [
+            _Job(items=list(items[i:i + self.max_batch_size]), future=loop.create_future())
+            for i in range(0, len(items), self.max_batch_size)
+        ]
+        self.stats.requests += 1
+        self.stats.items += len(items)
+        self._queued_items[index] += len(items)
+        self._lanes[index].extend(jobs)
+        self._wakeup.set()
+
+        results = await asyncio.gather(*(job.future for job in jobs))
+        return [result for part in results for result in part]
+
+    def metrics(self) -> dict:
+        return {
+            "queue_depth": sum(len(queue) for queue in self._lanes),
+            "queued_items": sum(self._queued_items),
+            "lanes": {
+                name: {"queue_depth": len(queue), "queued_items": queued}
+                for name, queue, queued in zip(self.lane_names, self._lanes, self._queued_items)
+            },
+            "requests": self.stats.requests,
+            "items": self.stats.items,
+            "batches": self.stats.batches,
+            "failed_batches": self.stats.failed_batches,
+            "batch_size_histogram": {f"<={k}": v for k, v in sorted(self.stats.histogram.items())},
+        }
+
+    def _take(self, lane: int, job: _Job) -> _Job:
+        self._queued_items[lane] -= len(job.items)
+        return job
+
+    @staticmethod
+    def _fail(jobs: List[_Job], error: Exception) -> None:
+        for job in jobs:
+            if not job.future.done():
+                job.future.set_exception(error)
+
+    async def _collect(self, batch: List[_Job]) -> None:
+        loop = asyncio.get_running_loop()
+        while not any(self._lanes):
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+        lane = next(i for i, queue in enumerate(self._lanes) if queue)
+        queue = self._lanes[lane]
+        batch.append(self._take(lane, queue.popleft()))
+        size = len(batch[0].items)
+        deadline = loop.time() + self.window
+        while size < self.max_batch_size:
+            if queue:
+                if size + len(queue[0].items) > self.max_batch_size:
+                    break
+                job = self._take(lane, queue.popleft())
+                batch.append(job)
+                size += len(job.items)
+                continue
+            # Close early when a higher priority lane has work waiting
+            if any(self._lanes[:lane]):
+                break
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+    async def _execute(self, batch: List[_Job]) -> None:
+        items = [item for job in batch for item in job.items]
+        self.stats.observe(len(items))
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, self.fn, items)
+            if len(results) != len(items):
+                raise ValueError(f"{self.name} returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            self.stats.failed_batches += 1
+            logger.error(f"{self.name} batch of {len(items)} failed: {str(e)}")
+            self._fail(batch, e)
+            return
+
+        offset = 0
+        for job in batch:
+            if not job.future.done():
+                job.future.set_result(list(results[offset:offset + len(job.items)]))
+            offset += len(job.items)
+
+    async def _run(self) -> None:
+        while True:
+            batch: List[_Job] = []
+            try:
+                await self._collect(batch)
+                await self._execute(batch)
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError(f"{self.name} stopped"))
+                raise
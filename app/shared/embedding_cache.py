@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.shared.cache_store import SqliteStore
+from app.shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache keyed by model name and text hash.
+    In-memory LRU tier in front of an optional SQLite tier, vectors are kept as float32.
+    Async callers use aget_many/aput_many so disk IO never blocks the event loop.
+    """
+    def __init__(self, model_name: str, max_entries: int = 50_000, path: Optional[str] = None, disk_max_entries: Optional[int] = None):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.store = SqliteStore(path, table="embeddings", max_entries=disk_max_entries) if path else None
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, text: str) -> str:
+        return f"{self.model_name}:{text_hash(text)}"
+
+    def get_many(self, texts: List[str]) -> Dict[int, np.ndarray]:
+        """Returns the cached vectors by position in texts"""
+        found, cold = self._lookup(texts)
+        blobs = self.store.get_many(list(cold)) if cold and self.store is not None else {}
+        return self._load(found, cold, blobs)
+
+    async def aget_many(self, texts: List[str]) -> Dict[int, np.ndarray]:
+        """get_many with the SQLite lookup in a worker thread, for callers on the event loop"""
+        found, cold = self._lookup(texts)
+        blobs = await asyncio.to_thread(self.store.get_many, list(cold)) if cold and self.store is not None else {}
+        return self._load(found, cold, blobs)
+
+    def put_many(self, texts: List[str], vectors) -> None:
+        rows = self._remember_all(texts, vectors)
+        if self.store is not None:
+            self._write(rows)
+
+    async def aput_many(self, texts: List[str], vectors) -> None:
+        """put_many with the SQLite write in a worker thread, for callers on the event loop"""
+        rows = self._remember_all(texts, vectors)
+        if self.store is not None:
+            await asyncio.to_thread(self._write, rows)
+
+    def _lookup(self, texts: List[str]) -> Tuple[Dict[int, np.ndarray], Dict[str, List[int]]]:
+        """Memory tier hits by position, and the positions of every key it misses"""
+        found: Dict[int, np.ndarray] = {}
+        cold: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            key = self.key(text)
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                found[i] = vector
+                self.hits += 1
+            else:
+                cold.setdefault(key, []).append(i)
+        return found, cold
+
+    def _load(self, found: Dict[int, np.ndarray], cold: Dict[str, List[int]], blobs: Dict[str, bytes]) -> Dict[int, np.ndarray]:
+        for key, blob in blobs.items():
+            vector = np.frombuffer(blob, dtype=np.float32)
+            self._remember(key, vector)
+            for i in cold.pop(key):
+                found[i] = vector
+                self.hits += 1
+                self.disk_hits += 1
+
+        self.misses += sum(len(positions) for positions in cold.values())
+        return found
+
+    def _remember_all(self, texts: List[str], vectors) -> List[Tuple[str, bytes]]:
+        rows = []
+        for text, vector in zip(texts, vectors):
+            key = self.key(text)
+            vector = np.asarray(vector, dtype=np.float32)
+            self._remember(key, vector)
+            rows.append((key, vector.tobytes()))
+        return rows
+
+    def _write(self, rows: List[Tuple[str, bytes]]) -> None:
+        try:
+            self.store.put_many(rows)
+        except Exception as e:
+            logger.warning(f"Embedding cache disk write failed: {str(e)}")
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "model_name": self.model_name,
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "disk_evictions": self.store.evictions if self.store is not None else 0,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,59 @@
+import json
+from typing import Dict, List, Optional
+from app.shared.cache_store import MemoryStore, SqliteStore
+from app.shared.embedding_cache import text_hash
+from app.shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EmotionCache:
+    """
+    Emotion label cache keyed by model version, k and text hash.
+    Backed by a SQLite file shared between worker processes when a path is given,
+    by an in-process store otherwise; both bound size and expire entries after a TTL.
+    """
+    def __init__(self, model_version: str, max_entries: int = 20_000, path: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        self.model_version = model_version
+        if path:
+            self.backend = "sqlite"
+            self.store = SqliteStore(path, table="emotions", max_entries=max_entries, ttl_seconds=ttl_seconds)
+        else:
+            self.backend = "memory"
+            self.store = MemoryStore(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str, k: int) -> str:
+        return f"{self.model_version}:k{k}:{text_hash(text)}"
+
+    def get_many(self, texts: List[str], k: int) -> Dict[str, List[str]]:
+        """Returns the cached labels by text, texts should be unique"""
+        keys = {self.key(text, k): text for text in texts}
+        try:
+            rows = self.store.get_many(list(keys))
+        except Exception as e:
+            logger.warning(f"Emotion cache read failed: {str(e)}")
+            rows = {}
+        self.hits += len(rows)
+        self.misses += len(keys) - len(rows)
+        return {keys[key]: json.loads(value) for key, value in rows.items()}
+
+    def put_many(self, texts: List[str], k: int, labels: List[List[str]]) -> None:
+        rows = [(self.key(text, k), json.dumps(label).encode("utf-8")) for text, label in zip(texts, labels)]
+        try:
+            self.store.put_many(rows)
+        except Exception as e:
+            logger.warning(f"Emotion cache write failed: {str(e)}")
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "model_version": self.model_version,
+            "entries": len(self.store),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.store.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Sequence
+from app.shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DONE = object()
+
+
+async def run_stages(source: AsyncIterator[Any], stages: Sequence[Callable[[Any], Awaitable[None]]], queue_size: int) -> None:
+    """
+    Runs every stage concurrently on items pulled from source, in order, each hop
+    through a bounded queue. The source is only pulled as fast as the slowest stage
+    drains, so memory stays flat and total time approaches the slowest stage.
+    A failing stage cancels the others and the error propagates.
+    """
+    queues = [asyncio.Queue(queue_size) for _ in stages]
+
+    async def feed() -> None:
+        async for item in source:
+            await queues[0].put(item)
+        await queues[0].put(_DONE)
+
+    async def work(i: int, fn: Callable[[Any], Awaitable[None]]) -> None:
+        following = queues[i + 1] if i + 1 < len(queues) else None
+        while (item := await queues[i].get()) is not _DONE:
+            await fn(item)
+            if following is not None:
+                await following.put(item)
+        if following is not None:
+            await following.put(_DONE)
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(feed())
+            for i, fn in enumerate(stages):
+                group.create_task(work(i, fn))
+    except ExceptionGroup as errors:
+        raise errors.exceptions[0]
@@ -0,0 +1,103 @@
+"""
+Benchmark: ORM hydration with joinedload vs the Core column projection for the
+ingestion message query, on an in-memory SQLite copy of the chat tables.
+
+Run from the repository root:
+    python -m benchmarks.bench_message_query
+"""
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, joinedload
+from app.db.base import Base
+from app.db.models import ChatMessage, ChatSession, User
+from app.db.models.chatmessage import MessageRole
+from app.data_pipeline.helper.helperMessages import MessageRow, message_rows_stmt, user_name_stmt, chunker_messages
+
+SIZES = (1_000, 10_000, 50_000)
+REPEATS = 5
+
+
+def seed(session: Session, n: int) -> uuid.UUID:
+    user = User(id=uuid.uuid4(), name="Sam", email=f"sam{n}@example.com", username="sam", api_key="key")
+    chat = ChatSession(id=uuid.uuid4(), user_id=user.id, started_at=datetime(2025, 1, 1))
+    start = datetime(2025, 1, 1)
+    session.add_all([user, chat])
+    session.flush()
+    session.execute(
+        ChatMessage.__table__.insert(),
+        [
+            {
+                "id": uuid.uuid4(),
+                "session_id": chat.id,
+                "role": MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT,
+                "content": f"message {i} " + "lorem ipsum " * 20,
+                "position": i + 1,
+                "created_at": start + timedelta(seconds=7 * i),
+                "is_vectorized": False,
+            }
+            for i in range(n)
+        ],
+    )
+    session.commit()
+    return chat.id
+
+
+def orm_messages(session: Session, session_id: uuid.UUID) -> list:
+    """The original query: full entities with session and user joined in per row"""
+    stmt = select(ChatMessage)\
+        .join(ChatSession, ChatMessage.session_id == ChatSession.id)\
+        .join(User, ChatSession.user_id == User.id)\
+        .filter(ChatMessage.session_id == session_id)\
+        .filter(ChatMessage.position > 0)\
+        .options(joinedload(ChatMessage.session).joinedload(ChatSession.user))\
+        .order_by(ChatMessage.position.asc())
+    messages = session.execute(stmt).scalars().all()
+    result = [
+        {
+            "session_id" : message.session_id,
+            "name" : message.session.user.name,
+            "role" : message.role.value,
+            "content" : message.content,
+            "session_position" : message.position,
+            "message_created_at" : message.created_at,
+        }
+        for message in messages
+    ]
+    session.expunge_all()
+    return result
+
+
+def projected_messages(session: Session, session_id: uuid.UUID) -> list:
+    name = session.execute(user_name_stmt(session_id)).scalar_one_or_none()
+    rows = [MessageRow._make(row) for row in session.execute(message_rows_stmt(session_id))]
+    return chunker_messages(session_id, name, rows)
+
+
+def timed(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    engine = create_engine("sqlite://")
+    tables = [User.__table__, ChatSession.__table__, ChatMessage.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+
+    print(f"{'messages':>9} {'orm (ms)':>10} {'projection (ms)':>16} {'speedup':>8}")
+    with Session(engine) as session:
+        for n in SIZES:
+            session_id = seed(session, n)
+            assert orm_messages(session, session_id) == projected_messages(session, session_id)
+            t_orm = timed(lambda: orm_messages(session, session_id))
+            t_proj = timed(lambda: projected_messages(session, session_id))
+            print(f"{n:>9} {t_orm * 1e3:>10.1f} {t_proj * 1e3:>16.1f} {t_orm / t_proj:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: torch vs ONNX vs int8 ONNX backends for the embedding and cross-encoder models on CPU.
+Each backend is loaded in a fresh process so RSS numbers are not polluted by the others.
+Reports single-call latency, batch throughput, resident memory and score drift against torch.
+
+Run from the repository root:
+    python -m benchmarks.bench_model_backends
+"""
+import multiprocessing as mp
+import time
+import numpy as np
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+BATCH = 256
+REPEATS = 5
+
+QUERIES = [
+    "What did I say about my trip to the mountains?",
+    "Do you remember my sister's name?",
+    "I have been feeling tired lately, did we talk about that?",
+    "What was the book you recommended last week?",
+]
+PASSAGES = [
+    "User: We finally went hiking near the lake last weekend.\nAssistant: That sounds wonderful, how was the weather?",
+    "User: My sister Anna is visiting next month.\nAssistant: You must be excited to see her.",
+    "User: Work has been draining and I sleep badly.\nAssistant: That sounds exhausting, have you been able to rest?",
+    "User: Thanks for the book tip, I started reading it.\nAssistant: I hope you enjoy it, tell me what you think.",
+]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def best_of(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_backend(kind: str, backend: str) -> dict:
+    from app.core.factory.backends import load_embedding_model, load_reranker_model
+
+    base_rss = rss_mb()
+    texts = [f"{p} ({i})" for i, p in enumerate(PASSAGES * (BATCH // len(PASSAGES)))]
+    if kind == "embedding":
+        model = load_embedding_model(backend=backend, device="cpu")
+        single = lambda: model.encode(QUERIES[:1], convert_to_numpy=True)
+        batch = lambda: model.encode(texts, batch_size=64, convert_to_numpy=True)
+        outputs = model.encode(PASSAGES + QUERIES, convert_to_numpy=True)
+    else:
+        model = load_reranker_model(backend=backend, device="cpu")
+        pairs = [[q, p] for q in QUERIES for p in PASSAGES]
+        big = [[QUERIES[i % len(QUERIES)], t] for i, t in enumerate(texts)]
+        single = lambda: model.predict(pairs[:1], convert_to_numpy=True)
+        batch = lambda: model.predict(big, batch_size=64, convert_to_numpy=True)
+        outputs = model.predict(pairs, convert_to_numpy=True)
+
+    single()  # warm up
+    return {
+        "latency_ms": best_of(single) * 1e3,
+        "throughput": BATCH / best_of(batch),
+        "rss_mb": rss_mb() - base_rss,
+        "outputs": np.asarray(outputs),
+    }
+
+
+def drift(kind: str, baseline: np.ndarray, outputs: np.ndarray) -> str:
+    if kind == "embedding":
+        cos = np.sum(baseline * outputs, axis=1) / (
+            np.linalg.norm(baseline, axis=1) * np.linalg.norm(outputs, axis=1)
+        )
+        return f"min cos {cos.min():.5f}"
+    return f"max |d| {np.abs(baseline - outputs).max():.5f}"
+
+
+def main():
+    ctx = mp.get_context("spawn")
+    for kind in ("embedding", "reranker"):
+        print(f"\n{kind}")
+        print(f"{'backend':>10} {'latency (ms)':>13} {'items/s':>9} {'RSS (MB)':>9} {'drift vs torch':>18}")
+        results = {}
+        for backend in BACKENDS:
+            with ctx.Pool(1) as pool:
+                results[backend] = pool.apply(run_backend, (kind, backend))
+        baseline = results["torch"]["outputs"]
+        for backend, r in results.items():
+            print(
+                f"{backend:>10} {r['latency_ms']:>13.2f} {r['throughput']:>9.1f} {r['rss_mb']:>9.1f}"
+                f" {drift(kind, baseline, r['outputs']):>18}"
+            )
+
+
+if __name__ == "__main__":
+    main()
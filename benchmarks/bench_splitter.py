@@ -0,0 +1,84 @@
+"""
+Benchmark: native DialogSplitter vs LangChain's RecursiveCharacterTextSplitter,
+import (startup) time in a fresh interpreter and split throughput on long assistant messages.
+LangChain is no longer a dependency, its columns are skipped unless langchain-text-splitters is installed.
+
+Run from the repository root:
+    python -m benchmarks.bench_splitter
+"""
+import importlib.util
+import random
+import statistics
+import subprocess
+import sys
+import time
+from app.core.strategy.splitter import DialogSplitter
+
+MESSAGES = 2000
+REPEATS = 5
+IMPORT_RUNS = 5
+WORDS = (
+    "the model answers with a short explanation of how memory retrieval works and why recent "
+    "turns matter more than older ones while emotions and continuity adjust the final ranking"
+).split()
+
+
+def make_messages(n: int) -> list:
+    rng = random.Random(n)
+
+    def sentence() -> str:
+        return " ".join(rng.choices(WORDS, k=rng.randint(5, 30))).capitalize() + rng.choice([".", "!", "?"])
+
+    return [
+        "\n\n".join(" ".join(sentence() for _ in range(rng.randint(2, 8))) for _ in range(rng.randint(1, 6)))
+        for _ in range(n)
+    ]
+
+
+def import_seconds(statement: str) -> float:
+    """Median wall time of a fresh interpreter running the import"""
+    times = []
+    for _ in range(IMPORT_RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def timed(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    messages = make_messages(MESSAGES)
+    total_chars = sum(len(m) for m in messages)
+    native = DialogSplitter(chunk_size=500, chunk_overlap=50)
+    splitters = {"native": native}
+
+    has_langchain = importlib.util.find_spec("langchain_text_splitters") is not None
+    if has_langchain:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        splitters["langchain"] = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
+    else:
+        print("langchain-text-splitters not installed, LangChain columns skipped\n")
+
+    baseline = import_seconds("pass")
+    print(f"{'splitter':>10} {'import (ms)':>12} {'split (ms)':>11} {'msgs/s':>9} {'MB/s':>7} {'chunks':>7} {'max len':>8}")
+    for name, splitter in splitters.items():
+        module = "app.core.strategy.splitter" if name == "native" else "langchain_text_splitters"
+        startup = import_seconds(f"import {module}") - baseline
+        chunks = [chunk for message in messages for chunk in splitter.split_text(message)]
+        seconds = timed(lambda: [splitter.split_text(message) for message in messages])
+        print(
+            f"{name:>10} {startup * 1e3:>12.1f} {seconds * 1e3:>11.1f} {MESSAGES / seconds:>9.0f}"
+            f" {total_chars / seconds / 1e6:>7.1f} {len(chunks):>7} {max(map(len, chunks)):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# conftest.py
+
+import sys
+import os
+import uuid
+import pytest
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from app.data_pipeline.push_to_weaviate import WriteResult
+
+
+class FakeProvider:
+    """Emotion tagging stand-in, every text is neutral"""
+    def __init__(self):
+        self.emotion_calls = 0
+
+    async def emotions_batch(self, texts):
+        self.emotion_calls += 1
+        return [["neutral"] for _ in texts]
+
+
+class FakeWeaviate:
+    """Embeds to zeros and records every written batch, ids in existing count as already stored"""
+    def __init__(self):
+        self.existing = set()
+        self.batches = []
+
+    @property
+    def written(self):
+        return [chunk for batch in self.batches for chunk in batch]
+
+    async def existing_chunk_ids(self, client, ids):
+        return {i for i in ids if i in self.existing}
+
+    async def embed_texts(self, provider, texts, priority="bulk"):
+        return [[0.0] for _ in texts]
+
+    async def ingest_chunks(self, client, chunks, embeddings):
+        self.batches.append(list(chunks))
+        return WriteResult(written=[chunk["id"] for chunk in chunks])
+
+
+class RecordingResult:
+    def __init__(self, rows, rowcount):
+        self.rows = rows
+        self.rowcount = rowcount
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+
+class RecordingSession:
+    """Async session stand-in that records every statement compiled for Postgres, results come from rows"""
+    def __init__(self, rows=(), rowcount=0):
+        self.rows = list(rows)
+        self.rowcount = rowcount
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return RecordingResult(self.rows, self.rowcount)
+
+
+class SqliteDb:
+    """Async session stand-in over an in-memory SQLite copy of the chat tables"""
+    def __init__(self):
+        from app.db.base import Base
+        from app.db.models import ChatMessage, ChatSession, User
+
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[User.__table__, ChatSession.__table__, ChatMessage.__table__])
+        self.session = Session(engine)
+        self.queries = 0
+
+    async def execute(self, stmt):
+        self.queries += 1
+        return self.session.execute(stmt)
+
+    async def commit(self):
+        self.session.commit()
+
+    def add_chat(self, roles_by_position) -> uuid.UUID:
+        """One session, a message per (position, role) pair, inserted in the given order"""
+        from app.db.models import ChatMessage, ChatSession, User
+
+        user = User(id=uuid.uuid4(), name="Sam", email=f"{uuid.uuid4()}@example.com", username="sam", api_key="key")
+        chat = ChatSession(id=uuid.uuid4(), user_id=user.id, started_at=datetime(2025, 1, 1))
+        self.session.add_all([user, chat])
+        self.session.flush()
+        self.session.add_all([
+            ChatMessage(
+                session_id=chat.id, role=role, content=f"{role.value} {position}", position=position,
+                created_at=datetime(2025, 1, 1) + timedelta(seconds=i), is_vectorized=False,
+            )
+            for i, (position, role) in enumerate(roles_by_position)
+        ])
+        self.session.commit()
+        return chat.id
+
+
+def _make_messages(n, session_id=None, content=lambda i: f"message {i}", step_seconds=1):
+    session_id = session_id or uuid.uuid4()
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "session_id": session_id,
+            "name": "sam",
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": content(i),
+            "session_position": i + 1,
+            "message_created_at": start + timedelta(seconds=step_seconds * i),
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def provider():
+    return FakeProvider()
+
+
+@pytest.fixture
+def make_messages():
+    """Chunker message dicts of one session, alternating user and assistant"""
+    return _make_messages
+
+
+@pytest.fixture
+def fake_weaviate(monkeypatch):
+    """Patches the Weaviate and embedding calls of the ingestion pipeline and the backfill"""
+    from app.data_pipeline import backfill, pipeline
+
+    fake = FakeWeaviate()
+    for module in (pipeline, backfill):
+        for name in ("existing_chunk_ids", "embed_texts", "ingest_chunks"):
+            if hasattr(module, name):
+                monkeypatch.setattr(module, name, getattr(fake, name))
+    return fake
+
+
+@pytest.fixture
+def recording_db():
+    """Builds a RecordingSession, recording_db(rows=..., rowcount=...)"""
+    return RecordingSession
+
+
+@pytest.fixture
+def sqlite_db():
+    db = SqliteDb()
+    yield db
+    db.session.close()
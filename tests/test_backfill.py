@@ -0,0 +1,158 @@
+# test_backfill.py
+
+import asyncio
+import sys
+import os
+import uuid
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.data_pipeline import backfill as backfill_module
+from app.data_pipeline.backfill import Backfill, read_checkpoint
+from app.core.strategy.chunker import DialogChunker
+from app.db.models.chatmessage import MessageRole
+from app.schemas.db_models import ChunkerStateModel, HeadResponse, IngestionHeadModel
+
+
+def test_streamed_pages_write_the_same_chunks_as_a_full_chunk(monkeypatch, tmp_path, provider, make_messages, fake_weaviate):
+    sessions = {}
+    for size in [0, 3, 17, 40]:
+        session_id = uuid.uuid4()
+        sessions[session_id] = make_messages(size, session_id=session_id, step_seconds=5)
+    sessions = dict(sorted(sessions.items()))
+    completed = []
+
+    async def stream_sessions(after, page_size):
+        for session_id in sessions:
+            if after is None or session_id > after:
+                yield session_id
+
+    async def stream_messages(session_id, page_size):
+        messages = sessions[session_id]
+        for i in range(0, len(messages), page_size):
+            yield messages[i:i + page_size]
+
+    async def complete(self, page):
+        completed.append(page.session_id)
+
+    monkeypatch.setattr(backfill_module, "stream_sessions", stream_sessions)
+    monkeypatch.setattr(backfill_module, "stream_messages", stream_messages)
+    async def prepare(self, session_id):
+        pass
+
+    monkeypatch.setattr(Backfill, "_complete", complete)
+    monkeypatch.setattr(Backfill, "_prepare", prepare)
+
+    checkpoint = str(tmp_path / "backfill.json")
+    job = Backfill(client=None, provider=provider, page_size=6, queue_size=2, checkpoint_path=checkpoint)
+    progress = asyncio.run(job.run())
+    written = {chunk["id"]: chunk for chunk in fake_weaviate.written}
+
+    expected = {}
+    for messages in sessions.values():
+        for chunk in asyncio.run(DialogChunker().chunk(messages, provider)):
+            expected[chunk["id"]] = chunk
+    assert written.keys() == expected.keys()
+    assert all(written[i]["metadata"]["temporal_context"] == expected[i]["metadata"]["temporal_context"] for i in expected)
+
+    assert progress.sessions == 4 and progress.messages == 60 and progress.chunks == len(expected)
+    assert completed == [session_id for session_id, messages in sessions.items() if messages]
+    assert read_checkpoint(checkpoint) == list(sessions)[-1]
+
+
+@pytest.mark.parametrize("page_size", [1, 3, 5, 7])
+def test_pages_ending_inside_a_position_lose_no_messages(monkeypatch, sqlite_db, page_size):
+    # Position 4 has only the user row, so pages of every size fall in the middle of a pair at some point
+    pairs = [(p, r) for p in range(1, 9) for r in (MessageRole.USER, MessageRole.ASSISTANT) if (p, r) != (4, MessageRole.ASSISTANT)]
+    session_id = sqlite_db.add_chat(reversed(pairs))
+
+    @asynccontextmanager
+    async def get_db():
+        yield sqlite_db
+
+    monkeypatch.setattr(backfill_module, "get_db", get_db)
+
+    async def collect():
+        return [page async for page in backfill_module.stream_messages(session_id, page_size)]
+
+    pages = asyncio.run(collect())
+    seen = [(m["session_position"], m["role"]) for page in pages for m in page]
+    assert sorted(seen) == sorted((p, r.value) for p, r in pairs) and len(seen) == len(set(seen))
+    assert all(len(page) <= page_size for page in pages)
+    assert [p for p, _ in seen] == sorted(p for p, _ in seen)
+
+
+class HeadStore:
+    """Records what _prepare and _complete do to a session with the given stored head"""
+    def __init__(self, monkeypatch, current_position=0, chunker_state=None):
+        self.session_id = uuid.uuid4()
+        self.head = IngestionHeadModel(
+            session_id=self.session_id, current_position=current_position, updated_at=datetime(2025, 1, 1), chunker_state=chunker_state,
+        ) if current_position else None
+        self.deleted, self.discarded, self.session_deleted, self.heads = [], [], [], []
+
+        @asynccontextmanager
+        async def get_db():
+            async def commit():
+                pass
+            yield type("Db", (), {"commit": staticmethod(commit)})()
+
+        async def try_lease_session(db, session_id):
+            return True
+
+        async def gethead(db, session_id):
+            return HeadResponse(head=self.head, current_head=current_position, max_position=40)
+
+        async def updatehead(db, session_id, head, chunker_state=None, forward_only=False):
+            self.heads.append((head.max_position, chunker_state, forward_only))
+
+        async def update_is_vectorized(db, session_id, first, last):
+            pass
+
+        async def delete_chunks(client, ids):
+            self.deleted.extend(ids)
+
+        async def delete_session_chunks(client, session_id):
+            self.session_deleted.append(session_id)
+
+        async def discard_outbox(db, ids):
+            self.discarded.extend(ids)
+
+        for name, fn in locals().items():
+            if hasattr(backfill_module, name) and callable(fn):
+                monkeypatch.setattr(backfill_module, name, fn)
+
+    def page(self, max_position, provisional):
+        state = ChunkerStateModel(counter=max_position, provisional_chunk_id=provisional)
+        return backfill_module.SessionPage(session_id=self.session_id, messages=0, max_position=max_position, last=True, state=state)
+
+
+def test_complete_moves_the_head_forward_and_drops_the_old_tail(monkeypatch):
+    store = HeadStore(monkeypatch, current_position=10, chunker_state={"counter": 10, "provisional_chunk_id": "worker-tail"})
+    job = Backfill(client=None, provider=None, checkpoint_path=None)
+    asyncio.run(job._complete(store.page(30, "backfill-tail")))
+
+    assert store.deleted == ["worker-tail"] and store.discarded == ["worker-tail"]
+    assert [(position, forward) for position, _, forward in store.heads] == [(30, True)]
+
+
+def test_complete_never_moves_the_head_back(monkeypatch):
+    store = HeadStore(monkeypatch, current_position=35, chunker_state={"counter": 35, "provisional_chunk_id": "worker-tail"})
+    job = Backfill(client=None, provider=None, checkpoint_path=None)
+    asyncio.run(job._complete(store.page(30, "backfill-tail")))
+
+    assert store.heads == []
+    assert store.deleted == ["backfill-tail"] and store.discarded == ["backfill-tail"]
+
+
+def test_legacy_head_chunks_are_dropped_before_the_first_page(monkeypatch):
+    store = HeadStore(monkeypatch, current_position=12, chunker_state=None)
+    job = Backfill(client=None, provider=None, checkpoint_path=None)
+    asyncio.run(job._prepare(store.session_id))
+    assert store.session_deleted == [store.session_id]
+
+    # The backfill's state replaces the legacy head even though it is not ahead of it
+    asyncio.run(job._complete(store.page(12, None)))
+    assert [position for position, _, _ in store.heads] == [12] and store.deleted == []
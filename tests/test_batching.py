@@ -0,0 +1,104 @@
+# test_batching.py
+
+import asyncio
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.shared.batching import MicroBatcher
+
+
+def test_concurrent_requests_share_one_batch():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(double, max_batch_size=64, window_ms=50)
+        batcher.start()
+        try:
+            results = await asyncio.gather(*(batcher.submit([i, i + 100]) for i in range(5)))
+            return results, batcher.metrics()
+        finally:
+            await batcher.stop()
+
+    results, metrics = asyncio.run(run())
+
+    assert results == [[2 * i, 2 * (i + 100)] for i in range(5)]
+    assert len(calls) == 1 and len(calls[0]) == 10
+    assert metrics["batches"] == 1
+    assert metrics["batch_size_histogram"] == {"<=16": 1}
+    assert metrics["queue_depth"] == 0 and metrics["queued_items"] == 0
+
+
+def test_max_batch_size_closes_batch_early():
+    sizes = []
+
+    def identity(items):
+        sizes.append(len(items))
+        return items
+
+    async def run():
+        batcher = MicroBatcher(identity, max_batch_size=4, window_ms=1000)
+        batcher.start()
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.submit([i, i]) for i in range(4))), timeout=5
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert results == [[i, i] for i in range(4)]
+    assert sizes == [4, 4]
+
+
+def test_failures_propagate_to_every_caller():
+    def broken(items):
+        raise ValueError("model down")
+
+    async def run():
+        batcher = MicroBatcher(broken, window_ms=20)
+        batcher.start()
+        try:
+            return await asyncio.gather(batcher.submit([1]), batcher.submit([2]), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_submit_requires_start():
+    batcher = MicroBatcher(lambda items: items)
+    with pytest.raises(RuntimeError):
+        asyncio.run(batcher.submit([1]))
+
+
+def test_query_lane_is_served_before_bulk():
+    calls = []
+
+    def record(items):
+        calls.append(list(items))
+        return items
+
+    async def run():
+        batcher = MicroBatcher(record, max_batch_size=2, window_ms=1, lanes=("query", "bulk"))
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.submit(["b1", "b2", "b3", "b4", "b5"], lane="bulk"),
+                batcher.submit(["q1"], lane="query"),
+            )
+        finally:
+            await batcher.stop()
+
+    bulk, query = asyncio.run(run())
+
+    assert bulk == ["b1", "b2", "b3", "b4", "b5"] and query == ["q1"]
+    assert calls == [["q1"], ["b1", "b2"], ["b3", "b4"], ["b5"]]
@@ -0,0 +1,87 @@
+# test_cognitive_scoring.py
+
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.strategy.cognitive_scoring import CognitiveScorer
+
+WEIGHTS = {"semantic": 0.5, "emotional": 0.2, "temporal": 0.2, "associative": 0.1}
+
+
+@pytest.fixture
+def scorer():
+    return CognitiveScorer(weights=WEIGHTS, em_score=1.2, cont_score=1.3, weight_thres=0.8)
+
+
+@pytest.fixture
+def now():
+    return datetime(2025, 7, 20, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def fake_chunks(now):
+    return [
+        SimpleNamespace(
+            properties={
+                "content": f"chunk content {i}",
+                "emotions": ["happy"] if i % 2 == 0 else ["sad"],
+                "timestamp": [now - timedelta(hours=i, minutes=7 * i), now - timedelta(hours=i + 1)],
+                "temporal_context": {"prev_chunk_id": f"chunk_00{i-1}"} if i > 0 else {},
+                "cognitive_weight": 1.0 if i % 2 == 0 else 0.6,
+            },
+            metadata=None,
+        )
+        for i in range(7)
+    ]
+
+
+def scalar_score(chunk, semantic_score, context, now):
+    props = chunk.properties
+    emotion_score = 1.2 if context["emotion"] in props.get("emotions", []) else 1.0
+    recency = (now - max(props["timestamp"])).total_seconds() / 3600
+    recency_score = np.exp(-recency / 24)
+    continuity_score = 1.3 if props.get("temporal_context", {}).get("prev_chunk_id") == context.get("last_chunk_id") else 1.0
+    weight = props.get("cognitive_weight", 1.0)
+    boost = min(1.2, 1.0 + (weight - 0.8) * 2) if weight > 0.8 else 1.0
+    return (
+        WEIGHTS["semantic"] * semantic_score +
+        WEIGHTS["emotional"] * emotion_score +
+        WEIGHTS["temporal"] * recency_score +
+        WEIGHTS["associative"] * continuity_score
+    ) * boost
+
+
+def test_scores_match_scalar_formula(scorer, fake_chunks, now):
+    context = {"emotion": "happy", "last_chunk_id": "chunk_002"}
+    semantic = [0.3, -1.2, 2.5, 0.0, 0.7, 0.7, -0.1]
+
+    scores = scorer.score(scorer.columns(fake_chunks, semantic, context, now=now))
+    expected = [scalar_score(c, s, context, now) for c, s in zip(fake_chunks, semantic)]
+
+    assert scores.tolist() == expected
+
+
+def test_missing_timestamps_count_as_now(scorer, now):
+    chunk = SimpleNamespace(properties={"emotions": [], "timestamp": []}, metadata=None)
+    cols = scorer.columns([chunk], [0.0], {"emotion": "happy"}, now=now)
+    assert cols["age_us"].tolist() == [0]
+
+
+@pytest.mark.parametrize("top_k", [None, 1, 3, 6])
+def test_rank_matches_stable_sort(top_k):
+    scores = np.array([0.5, 0.9, 0.5, 0.1, 0.9, 0.5, 0.3])
+    expected = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:top_k]
+    assert CognitiveScorer.rank(scores, top_k).tolist() == expected
+
+
+def test_rerank_returns_sorted_tuples(scorer, fake_chunks):
+    results = scorer.rerank(fake_chunks, [0.8] * len(fake_chunks), {"emotion": "happy"}, top_k=4)
+
+    assert len(results) == 4
+    assert all(isinstance(score, float) and props for score, props, meta in results)
+    assert [r[0] for r in results] == sorted((r[0] for r in results), reverse=True)
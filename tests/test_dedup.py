@@ -0,0 +1,82 @@
+# test_dedup.py
+
+import asyncio
+import sys
+import os
+import uuid
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.strategy.chunker import DialogChunker
+from app.core.strategy.dedup import NearDuplicateFilter, simhash, hamming
+from app.data_pipeline.pipeline import IngestionPipeline
+
+TEXT = "sam: i could not sleep again last night, the deadline keeps me awake and i feel anxious about it"
+
+
+def make_chunk(content, prev=None):
+    return {
+        "id": str(uuid.uuid4()),
+        "content": content,
+        "metadata": {"temporal_context": {"prev_chunk_id": prev}},
+    }
+
+
+def test_simhash_distance():
+    assert hamming(simhash(TEXT), simhash(TEXT)) == 0
+    assert hamming(simhash(TEXT), simhash(TEXT.upper() + " ")) == 0
+    unrelated = "assistant: the weather in lisbon is sunny with a light breeze coming from the ocean today"
+    assert hamming(simhash(TEXT), simhash(unrelated)) > 10
+
+
+def test_filter_suppresses_and_relinks():
+    near = NearDuplicateFilter(max_distance=3, history=16)
+    first = make_chunk(TEXT)
+    copy = make_chunk(TEXT, prev=first["id"])
+    after = make_chunk("assistant: try writing the tasks down before bed", prev=copy["id"])
+
+    assert near.keep(first)
+    assert not near.keep(copy)
+    assert near.keep(after)
+    assert after["metadata"]["temporal_context"]["prev_chunk_id"] == first["id"]
+    assert near.resolve(copy["id"]) == first["id"] and near.suppressed == 1
+
+    # Kept signatures carry over to the next run through the chunker state
+    resumed = NearDuplicateFilter(max_distance=3, history=16, seen=near.dump())
+    assert not resumed.keep(make_chunk(TEXT))
+
+
+def test_history_is_bounded():
+    near = NearDuplicateFilter(max_distance=3, history=2)
+    assert near.keep(make_chunk(TEXT))
+    assert near.keep(make_chunk("first unrelated line about cooking pasta with garlic"))
+    assert near.keep(make_chunk("second unrelated line about running in the park at dawn"))
+    assert len(near.dump()) == 2
+    assert near.keep(make_chunk(TEXT))
+
+
+def test_provisional_chunks_are_not_remembered():
+    near = NearDuplicateFilter(max_distance=3, history=16)
+    assert near.keep(make_chunk(TEXT), remember=False)
+    assert near.keep(make_chunk(TEXT))
+
+
+def repeated(i):
+    return "same question again" if i % 2 == 0 else "same answer again"
+
+
+def test_pipeline_skips_repeated_windows(provider, make_messages, fake_weaviate):
+    messages = make_messages(40, content=repeated)
+
+    chunker = DialogChunker()
+    pipeline = IngestionPipeline(client=None, provider=provider, chunker=chunker, batch_size=4, queue_size=1)
+    result = asyncio.run(pipeline.run(chunker.stream(messages), near_duplicates=NearDuplicateFilter(max_distance=3)))
+
+    written = fake_weaviate.written
+    # Suppressed windows are not kept, so a stale tail they would have replaced still gets deleted
+    assert result.suppressed > 0
+    assert {chunk["id"] for chunk in written} == result.chunk_ids
+    ids = {chunk["id"] for chunk in written}
+    for chunk in written[1:]:
+        assert chunk["metadata"]["temporal_context"]["prev_chunk_id"] in ids
+    assert result.state.last_chunk_id in ids and result.state.near_duplicates
+
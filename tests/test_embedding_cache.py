@@ -0,0 +1,74 @@
+# test_embedding_cache.py
+
+import asyncio
+import threading
+import numpy as np
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.shared.embedding_cache import EmbeddingCache
+
+
+def vec(seed):
+    return np.random.default_rng(seed).normal(size=8).astype(np.float32)
+
+
+def test_memory_tier_hits_and_misses():
+    cache = EmbeddingCache("model-a", max_entries=10)
+    assert cache.get_many(["hello", "world"]) == {}
+
+    cache.put_many(["hello"], [vec(1)])
+    found = cache.get_many(["world", "hello", "hello"])
+
+    assert sorted(found) == [1, 2]
+    np.testing.assert_array_equal(found[1], vec(1))
+    metrics = cache.metrics()
+    assert metrics["hits"] == 2 and metrics["misses"] == 3
+
+
+def test_lru_eviction_counts():
+    cache = EmbeddingCache("model-a", max_entries=2)
+    cache.put_many(["a", "b", "c"], [vec(1), vec(2), vec(3)])
+
+    assert cache.get_many(["a"]) == {}
+    assert cache.metrics()["evictions"] == 1
+
+
+def test_disk_tier_survives_restart_and_is_model_scoped(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    cache = EmbeddingCache("model-a", path=path)
+    cache.put_many(["hello"], [vec(1)])
+    cache.store.close()
+
+    warm = EmbeddingCache("model-a", path=path)
+    found = warm.get_many(["hello"])
+    np.testing.assert_array_equal(found[0], vec(1))
+    assert warm.metrics()["disk_hits"] == 1
+
+    other = EmbeddingCache("model-b", path=path)
+    assert other.get_many(["hello"]) == {}
+
+
+def test_async_disk_tier_runs_off_the_event_loop(tmp_path):
+    cache = EmbeddingCache("model-a", path=str(tmp_path / "embeddings.sqlite"))
+    threads = []
+    get_many, put_many = cache.store.get_many, cache.store.put_many
+
+    def recording(fn):
+        def wrapper(*args):
+            threads.append(threading.get_ident())
+            return fn(*args)
+        return wrapper
+
+    cache.store.get_many, cache.store.put_many = recording(get_many), recording(put_many)
+
+    async def run():
+        await cache.aput_many(["hello"], [vec(1)])
+        cache._memory.clear()
+        return await cache.aget_many(["hello", "world"]), threading.get_ident()
+
+    found, loop_thread = asyncio.run(run())
+    np.testing.assert_array_equal(found[0], vec(1))
+    assert len(threads) == 2 and loop_thread not in threads
+    assert cache.metrics()["disk_hits"] == 1 and cache.metrics()["misses"] == 1
@@ -0,0 +1,60 @@
+# test_emotion_api.py
+
+import sys
+import os
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.factory.api import emotion_api
+from app.data_pipeline.helper.helperOnnx import OnnxEmotionEngine
+from app.shared.emotion_cache import EmotionCache
+from tests.test_emotion_engine import FakeModel, FakeTokenizer, TEXTS
+
+
+class LoopCheckingModel(FakeModel):
+    """Records whether each forward pass ran with an event loop running in its thread"""
+    def __call__(self, input_ids, attention_mask):
+        try:
+            asyncio.get_running_loop()
+            self.on_loop = getattr(self, "on_loop", []) + [True]
+        except RuntimeError:
+            self.on_loop = getattr(self, "on_loop", []) + [False]
+        return super().__call__(input_ids, attention_mask)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    model = LoopCheckingModel()
+    engine = OnnxEmotionEngine(model=model, tokenizer=FakeTokenizer(), cache=EmotionCache(model_version="fake", max_entries=100), bucket_width=4, batch_size=2)
+    # No lifespan, the engine runs on the fakes instead of the ONNX model
+    monkeypatch.setattr(emotion_api.app.state, "model", model, raising=False)
+    monkeypatch.setattr(emotion_api.app.state, "engine", engine, raising=False)
+    return TestClient(emotion_api.app)
+
+
+def test_single_text_returns_one_label_list(client):
+    response = client.post("/emotion-score", json={"text": TEXTS[0]})
+    assert response.status_code == 200
+    emotions = response.json()["emotions"]
+    assert len(emotions) == 2 and all(isinstance(label, str) for label in emotions)
+
+
+def test_batch_returns_a_label_list_per_text_in_order(client):
+    response = client.post("/emotion-score", json={"text": TEXTS})
+    assert response.status_code == 200
+    emotions = response.json()["emotions"]
+    assert emotions == [client.post("/emotion-score", json={"text": text}).json()["emotions"] for text in TEXTS]
+
+
+def test_inference_runs_off_the_event_loop(client):
+    client.post("/emotion-score", json={"text": TEXTS})
+    client.post("/emotion-score", json={"text": "one more text"})
+    assert client.get("/health").status_code == 200
+    assert emotion_api.app.state.model.on_loop and not any(emotion_api.app.state.model.on_loop)
+
+
+@pytest.mark.parametrize("text", ["", [], ["ok", " "], ["ok", 3]])
+def test_empty_or_invalid_input_is_rejected(client, text):
+    assert client.post("/emotion-score", json={"text": text}).status_code == 422
@@ -0,0 +1,46 @@
+# test_emotion_cache.py
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.shared.emotion_cache import EmotionCache
+
+
+def test_memory_backend_hits_misses_and_k_scope():
+    cache = EmotionCache("emo@256", max_entries=10)
+    assert cache.get_many(["hello"], k=2) == {}
+
+    cache.put_many(["hello"], 2, [["joy", "love"]])
+    assert cache.get_many(["hello", "world"], k=2) == {"hello": ["joy", "love"]}
+    assert cache.get_many(["hello"], k=3) == {}
+
+    metrics = cache.metrics()
+    assert metrics["backend"] == "memory"
+    assert metrics["hits"] == 1 and metrics["misses"] == 3
+
+
+def test_size_and_ttl_eviction():
+    cache = EmotionCache("emo@256", max_entries=2)
+    cache.put_many(["a", "b", "c"], 2, [["joy"], ["anger"], ["fear"]])
+    assert cache.get_many(["a"], k=2) == {}
+    assert cache.metrics()["evictions"] == 1
+
+    expiring = EmotionCache("emo@256", ttl_seconds=0.01)
+    expiring.put_many(["a"], 2, [["joy"]])
+    time.sleep(0.02)
+    assert expiring.get_many(["a"], k=2) == {}
+
+
+def test_sqlite_backend_shared_between_instances_and_version_scoped(tmp_path):
+    path = str(tmp_path / "emotions.sqlite")
+    writer = EmotionCache("emo@256", path=path)
+    reader = EmotionCache("emo@256", path=path)
+
+    writer.put_many(["hello"], 2, [["joy", "love"]])
+    assert reader.get_many(["hello"], k=2) == {"hello": ["joy", "love"]}
+    assert reader.metrics()["backend"] == "sqlite"
+
+    other = EmotionCache("emo@128", path=path)
+    assert other.get_many(["hello"], k=2) == {}
@@ -0,0 +1,125 @@
+# test_emotion_engine.py
+
+import sys
+import os
+import zlib
+import numpy as np
+from types import SimpleNamespace
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.data_pipeline.helper.helperOnnx import OnnxEmotionEngine
+from app.shared.emotion_cache import EmotionCache
+
+LABELS = ["admiration", "anger", "joy", "sadness", "neutral", "fear"]
+VOCAB = 97
+
+
+class FakeTokenizer:
+    """Word-level stand-in for the RoBERTa tokenizer: <s> words </s>, pad id 1"""
+    pad_token_id = 1
+
+    def __call__(self, texts, truncation=False, max_length=None, padding=False):
+        assert padding is False
+        encoded = []
+        for text in texts:
+            ids = [0] + [3 + zlib.crc32(word.encode()) % VOCAB for word in text.split()] + [2]
+            if truncation and max_length is not None:
+                ids = ids[:max_length]
+            encoded.append(ids)
+        return {"input_ids": encoded}
+
+
+class FakeModel:
+    """Logits are the mean of per-token rows over unmasked positions, so padding must not matter"""
+    def __init__(self):
+        self.config = SimpleNamespace(id2label=dict(enumerate(LABELS)))
+        self.table = np.random.default_rng(7).normal(size=(VOCAB + 3, len(LABELS)))
+        self.shapes = []
+
+    def __call__(self, input_ids, attention_mask):
+        self.shapes.append(input_ids.shape)
+        mask = attention_mask[..., None].astype(np.float64)
+        logits = (self.table[input_ids] * mask).sum(axis=1) / mask.sum(axis=1)
+        return SimpleNamespace(logits=logits)
+
+
+def pipeline_labels(model, tokenizer, text, k, max_tokens=None):
+    """What the old text-classification pipeline (top_k=None, sigmoid) produced: one unpadded text at a time"""
+    ids = tokenizer([text], truncation=max_tokens is not None, max_length=max_tokens)["input_ids"][0]
+    logits = model(input_ids=np.array([ids]), attention_mask=np.ones((1, len(ids)), dtype=np.int64)).logits[0]
+    scores = 1.0 / (1.0 + np.exp(-logits))
+    ranked = sorted(({"label": LABELS[i], "score": s} for i, s in enumerate(scores)), key=lambda x: x["score"], reverse=True)
+    return [label["label"] for label in ranked[:k]]
+
+
+TEXTS = [
+    "thank you so much, this is wonderful",
+    "i am scared of the exam tomorrow",
+    "why would you do that",
+    "ok",
+    "i miss my grandmother, she used to bake bread every sunday and the house smelled warm",
+]
+
+
+def make_engine(**kwargs):
+    model = FakeModel()
+    options = {"max_tokens": 64, "bucket_width": 4, "batch_size": 2}
+    options.update(kwargs)
+    return OnnxEmotionEngine(model=model, tokenizer=FakeTokenizer(), **options), model
+
+
+def test_labels_match_the_old_pipeline():
+    engine, _ = make_engine()
+    for k in (1, 2, 3):
+        expected = [pipeline_labels(FakeModel(), FakeTokenizer(), text, k) for text in TEXTS]
+        assert engine.top_k(TEXTS, k=k) == expected
+
+
+def test_batches_are_padded_to_their_bucket_only():
+    engine, model = make_engine()
+    lengths = np.array([len(ids) for ids in FakeTokenizer()(TEXTS)["input_ids"]])
+    buckets = engine.buckets(lengths)
+
+    assert sorted(i for idx in buckets.values() for i in idx.tolist()) == list(range(len(TEXTS)))
+    for size, indices in buckets.items():
+        assert size % 4 == 0 and all(size - 4 < lengths[i] <= size for i in indices)
+
+    engine.predict_proba(TEXTS)
+    assert all(rows <= 2 for rows, _ in model.shapes)
+    assert max(width for _, width in model.shapes) == lengths.max()
+    assert min(width for _, width in model.shapes) < lengths.max()
+
+
+def test_long_texts_are_truncated_to_max_tokens():
+    engine, model = make_engine(max_tokens=8)
+    long_text = " ".join(f"word{i}" for i in range(50))
+
+    labels = engine.top_k([long_text], k=2)
+    assert max(width for _, width in model.shapes) == 8
+    assert labels == [pipeline_labels(FakeModel(), FakeTokenizer(), long_text, 2, max_tokens=8)]
+
+
+def test_single_text_and_batch_paths_agree():
+    engine, _ = make_engine()
+    batch = engine.top_k(TEXTS + TEXTS[:2], k=2)
+    assert batch == [engine.top_k([text], k=2)[0] for text in TEXTS + TEXTS[:2]]
+    assert engine.top_k([], k=2) == []
+
+
+def test_probabilities_are_sigmoid_scores_in_input_order():
+    engine, _ = make_engine()
+    probs = engine.predict_proba(TEXTS)
+    assert probs.shape == (len(TEXTS), len(LABELS))
+    assert np.all((probs > 0) & (probs < 1))
+    single = np.vstack([engine.predict_proba([text]) for text in TEXTS])
+    np.testing.assert_allclose(probs, single, rtol=1e-6)
+
+
+def test_cached_and_duplicate_texts_skip_the_model():
+    cache = EmotionCache(model_version="fake", max_entries=100)
+    engine, model = make_engine(cache=cache)
+
+    first = engine.top_k(TEXTS + TEXTS, k=2)
+    calls = len(model.shapes)
+    assert engine.top_k(TEXTS, k=2) == first[:len(TEXTS)]
+    assert len(model.shapes) == calls
@@ -0,0 +1,44 @@
+# test_head_bookkeeping.py
+
+import asyncio
+import sys
+import os
+import uuid
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.data_pipeline.helper.helperHead import updatehead, update_is_vectorized, pending_sessions
+from app.schemas.db_models import HeadResponse
+
+
+def test_head_is_one_upsert(recording_db):
+    db = recording_db()
+    head = HeadResponse(head=None, current_head=0, max_position=12)
+    asyncio.run(updatehead(db, uuid.uuid4(), head, chunker_state={"counter": 12}))
+
+    assert len(db.statements) == 1
+    assert db.statements[0].startswith("INSERT INTO ingestion_heads")
+    assert "ON CONFLICT (session_id) DO UPDATE" in db.statements[0]
+
+
+def test_forward_only_head_never_moves_back(recording_db):
+    db = recording_db()
+    head = HeadResponse(head=None, current_head=None, max_position=12)
+    asyncio.run(updatehead(db, uuid.uuid4(), head, chunker_state={"counter": 12}, forward_only=True))
+
+    assert "DO UPDATE SET" in db.statements[0]
+    assert "WHERE ingestion_heads.current_position < excluded.current_position OR ingestion_heads.chunker_state IS NULL" in db.statements[0]
+
+
+def test_is_vectorized_is_one_ranged_update(recording_db):
+    db = recording_db()
+    asyncio.run(update_is_vectorized(db, uuid.uuid4(), 5, 12))
+
+    assert len(db.statements) == 1
+    assert db.statements[0].startswith("UPDATE chat_messages SET is_vectorized")
+    assert "BETWEEN" in db.statements[0]
+
+
+def test_pending_sessions_scans_unvectorized_messages_only(recording_db):
+    db = recording_db()
+    assert asyncio.run(pending_sessions(db, limit=10)) == []
+    assert "chat_messages.is_vectorized IS false" in db.statements[0]
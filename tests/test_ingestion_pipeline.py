@@ -0,0 +1,27 @@
+# test_ingestion_pipeline.py
+
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.data_pipeline.pipeline import IngestionPipeline
+from app.core.strategy.chunker import DialogChunker
+
+
+def test_streams_new_windows_in_batches(provider, make_messages, fake_weaviate):
+    messages = make_messages(50)
+    chunker = DialogChunker()
+    full = asyncio.run(chunker.chunk(messages, provider))
+    fake_weaviate.existing = {full[0]["id"], full[1]["id"]}
+    provider.emotion_calls = 0
+
+    pipeline = IngestionPipeline(client=None, provider=provider, chunker=chunker, batch_size=4, queue_size=1)
+    result = asyncio.run(pipeline.run(chunker.stream(messages)))
+
+    batches = fake_weaviate.batches
+    assert len(batches) == -(-len(full) // 4)
+    assert [c["id"] for c in fake_weaviate.written] == [c["id"] for c in full if c["id"] not in fake_weaviate.existing]
+    assert result.write.ok and result.existing == 2
+    assert result.chunk_ids == {c["id"] for c in full}
+    assert result.state.counter == 50 and provider.emotion_calls == len(batches)
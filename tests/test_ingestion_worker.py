@@ -0,0 +1,131 @@
+# test_ingestion_worker.py
+
+import asyncio
+import sys
+import os
+from contextlib import asynccontextmanager
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.data_pipeline import ingestMessage
+from app.data_pipeline.ingestion_worker import IngestionWorker
+
+
+class Recorder:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.runs = []
+        self.active = 0
+        self.max_active = 0
+        self.sessions_active = set()
+
+    async def __call__(self, session_id):
+        assert session_id not in self.sessions_active, "session ingested twice at once"
+        self.sessions_active.add(session_id)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        self.sessions_active.discard(session_id)
+        self.runs.append(session_id)
+
+
+async def drain(worker):
+    while worker.metrics()["pending_sessions"] or worker.metrics()["running_sessions"]:
+        await asyncio.sleep(0.005)
+
+
+def test_burst_for_one_session_is_coalesced():
+    async def run():
+        recorder = Recorder()
+        worker = IngestionWorker(recorder, concurrency=2, coalesce_ms=10)
+        worker.start()
+        for _ in range(5):
+            worker.mark_dirty("a")
+        await drain(worker)
+        await worker.stop()
+        return recorder, worker.metrics()
+
+    recorder, metrics = asyncio.run(run())
+    assert recorder.runs == ["a"]
+    assert metrics["events"] == 5 and metrics["coalesced_events"] == 4
+    assert metrics["runs"] == 1 and metrics["lag_seconds"]["max"] > 0
+
+
+def test_event_during_run_schedules_one_more_run():
+    async def run():
+        recorder = Recorder(delay=0.05)
+        worker = IngestionWorker(recorder, concurrency=2, coalesce_ms=0)
+        worker.start()
+        worker.mark_dirty("a")
+        await asyncio.sleep(0.02)
+        worker.mark_dirty("a")
+        worker.mark_dirty("a")
+        await drain(worker)
+        await worker.stop()
+        return recorder
+
+    assert asyncio.run(run()).runs == ["a", "a"]
+
+
+def test_sessions_run_with_bounded_concurrency():
+    async def run():
+        recorder = Recorder()
+        worker = IngestionWorker(recorder, concurrency=3, coalesce_ms=0)
+        worker.start()
+        for session in range(10):
+            worker.mark_dirty(session)
+        await drain(worker)
+        await worker.stop()
+        return recorder
+
+    recorder = asyncio.run(run())
+    assert sorted(recorder.runs) == list(range(10))
+    assert recorder.max_active == 3
+
+
+def test_sweep_marks_pending_sessions_and_counts_skips():
+    async def run():
+        runs = []
+
+        async def ingest(session_id):
+            runs.append(session_id)
+            # "b" is leased by another worker
+            return session_id != "b"
+
+        async def sweep():
+            return ["a", "b"]
+
+        worker = IngestionWorker(ingest, concurrency=2, coalesce_ms=0, sweep=sweep, sweep_interval=60)
+        worker.start()
+        await asyncio.sleep(0.02)
+        await drain(worker)
+        await worker.stop()
+        return runs, worker.metrics()
+
+    runs, metrics = asyncio.run(run())
+    assert sorted(runs) == ["a", "b"]
+    assert metrics["sweeps"] == 1 and metrics["skipped_runs"] == 1
+
+
+def test_failed_ingestion_is_counted(monkeypatch):
+    @asynccontextmanager
+    async def get_db():
+        raise ConnectionError("postgres down")
+        yield
+
+    monkeypatch.setattr(ingestMessage, "get_db", get_db)
+
+    async def run():
+        worker = IngestionWorker(
+            lambda session_id: ingestMessage.ingest_ready_messages(session_id, client=None, provider=None),
+            concurrency=1, coalesce_ms=0,
+        )
+        worker.start()
+        worker.mark_dirty("a")
+        await asyncio.sleep(0.01)
+        await drain(worker)
+        await worker.stop()
+        return worker.metrics()
+
+    metrics = asyncio.run(run())
+    assert metrics["runs"] == 1 and metrics["failed_runs"] == 1
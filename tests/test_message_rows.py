@@ -0,0 +1,14 @@
+# test_message_rows.py
+
+import sys
+import os
+import uuid
+from sqlalchemy.dialects import postgresql
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.data_pipeline.helper.helperMessages import message_rows_stmt
+
+
+def test_rows_of_one_position_have_a_stable_order():
+    sql = str(message_rows_stmt(uuid.uuid4(), after=3, until=9, limit=50).compile(dialect=postgresql.dialect()))
+    assert "ORDER BY chat_messages.position ASC, chat_messages.role ASC" in sql
@@ -0,0 +1,22 @@
+# test_model_backends.py
+
+import sys
+import os
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# The loader needs the serving extras, skip where they are not installed
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("optimum.onnxruntime")
+
+from app.core.factory.backends import _quantized_file
+
+
+@pytest.mark.parametrize("quantization, file_name", [
+    ("arm64", "onnx/model_qint8_arm64.onnx"),
+    ("avx2", "onnx/model_quint8_avx2.onnx"),
+    ("avx512", "onnx/model_qint8_avx512.onnx"),
+    ("avx512_vnni", "onnx/model_qint8_avx512_vnni.onnx"),
+])
+def test_quantized_file_matches_sentence_transformers_export(quantization, file_name):
+    assert _quantized_file(quantization) == file_name
@@ -0,0 +1,113 @@
+# test_outbox.py
+
+import asyncio
+import sys
+import os
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.data_pipeline import ingestMessage
+from app.data_pipeline.helper import helperOutbox
+from app.data_pipeline.helper.helperOutbox import stage_outbox, replay_outbox, outbox_payload, restore_chunk
+from app.data_pipeline.push_to_weaviate import WriteResult
+
+
+def make_chunk(session_id):
+    return {
+        "id": str(uuid.uuid4()),
+        "content": "sam: hello",
+        "metadata": {
+            "session_id": session_id,
+            "emotions": ["joy"],
+            "timestamp": [datetime(2025, 1, 1, tzinfo=timezone.utc)],
+            "temporal_context": {"prev_chunk_id": None},
+        },
+    }
+
+
+def test_payload_round_trip():
+    chunk = make_chunk(uuid.uuid4())
+    restored = restore_chunk(outbox_payload(chunk))
+    assert restored["metadata"]["timestamp"] == chunk["metadata"]["timestamp"]
+    assert restored["metadata"]["session_id"] == str(chunk["metadata"]["session_id"])
+    assert restored["metadata"]["emotions"] == ["joy"]
+
+
+def test_stage_is_one_upsert(recording_db):
+    db = recording_db()
+    session_id = uuid.uuid4()
+    chunks = [make_chunk(session_id) for _ in range(3)]
+    asyncio.run(stage_outbox(db, session_id, chunks, [[0.1, 0.2]] * 3, {chunks[0]["id"]: "timeout"}))
+
+    assert len(db.statements) == 1
+    assert db.statements[0].startswith("INSERT INTO chunk_outbox")
+    assert "ON CONFLICT (chunk_id) DO UPDATE" in db.statements[0]
+
+
+def test_replay_writes_stored_embeddings_only(monkeypatch, recording_db):
+    session_id = uuid.uuid4()
+    chunks = [make_chunk(session_id) for _ in range(2)]
+    rows = [
+        SimpleNamespace(chunk_id=uuid.UUID(c["id"]), payload=outbox_payload(c), embedding=[float(i)])
+        for i, c in enumerate(chunks)
+    ]
+    calls = []
+
+    async def ingest_chunks(client, chunks, embeddings):
+        calls.append((chunks, embeddings))
+        return WriteResult(written=[chunks[0]["id"]], failed={chunks[1]["id"]: "unavailable"})
+
+    monkeypatch.setattr(helperOutbox, "ingest_chunks", ingest_chunks)
+    db = recording_db(rows)
+    result = asyncio.run(replay_outbox(db, None, session_id))
+
+    replayed, embeddings = calls[0]
+    assert [c["id"] for c in replayed] == [c["id"] for c in chunks]
+    assert embeddings == [[0.0], [1.0]]
+    assert result.written == [chunks[0]["id"]] and list(result.failed) == [chunks[1]["id"]]
+    # One select, then one set-based statement each for written and failed rows, written rows are gone
+    assert len(db.statements) == 3
+    assert db.statements[1].startswith("DELETE FROM chunk_outbox WHERE chunk_outbox.chunk_id IN")
+    assert "attempts=(chunk_outbox.attempts +" in db.statements[2]
+
+
+def test_replay_without_rows_writes_nothing(monkeypatch, recording_db):
+    async def ingest_chunks(client, chunks, embeddings):
+        raise AssertionError("nothing to replay")
+
+    monkeypatch.setattr(helperOutbox, "ingest_chunks", ingest_chunks)
+    db = recording_db()
+    assert asyncio.run(replay_outbox(db, None, uuid.uuid4())).ok
+    assert len(db.statements) == 1
+
+
+def test_requeue_resets_failed_rows(recording_db):
+    db = recording_db(rowcount=2)
+    assert asyncio.run(helperOutbox.requeue_outbox(db, uuid.uuid4())) == 2
+    assert db.statements[0].startswith("UPDATE chunk_outbox SET state=")
+    assert "chunk_outbox.state = " in db.statements[0] and "chunk_outbox.session_id = " in db.statements[0]
+
+
+def test_sweep_interleaves_outbox_sessions(monkeypatch):
+    behind = [uuid.uuid4() for _ in range(4)]
+    outbox = [uuid.uuid4() for _ in range(2)]
+
+    @asynccontextmanager
+    async def get_db():
+        yield None
+
+    async def pending_sessions(db, limit):
+        return behind[:limit]
+
+    async def outbox_sessions(db, limit):
+        return outbox[:limit]
+
+    monkeypatch.setattr(ingestMessage, "get_db", get_db)
+    monkeypatch.setattr(ingestMessage, "pending_sessions", pending_sessions)
+    monkeypatch.setattr(ingestMessage, "outbox_sessions", outbox_sessions)
+
+    # A full page of sessions behind their head still leaves room for the outbox
+    assert asyncio.run(ingestMessage.find_pending_sessions(limit=4)) == [behind[0], outbox[0], behind[1], outbox[1]]
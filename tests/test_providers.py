@@ -0,0 +1,135 @@
+# test_providers.py
+
+import asyncio
+import json
+import threading
+import time
+import types
+import httpx
+import numpy as np
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config.settings import settings
+from app.core.factory.local import reranker_local, vectorizer_local
+from app.core.factory.providers import HttpModelProvider, LocalModelProvider, get_provider
+from app.schemas.vectorize_schema import EMBEDDING_SHAPE_HEADER
+
+
+class SlowModel:
+    """Loads slowly and records the thread of every call"""
+    loads = 0
+
+    def __init__(self, *args, **kwargs):
+        time.sleep(0.05)
+        SlowModel.loads += 1
+        self.threads = set()
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.threads.add(threading.current_thread().name)
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+    def predict(self, pairs, batch_size=32, convert_to_numpy=True):
+        self.threads.add(threading.current_thread().name)
+        return np.array([float(len(passage)) for _, passage in pairs])
+
+
+class FakeEmotionModel:
+    loads = 0
+
+    def __init__(self, k=2):
+        FakeEmotionModel.loads += 1
+
+    def get_emotions(self, text):
+        return ["joy", "neutral"]
+
+    def get_emotions_batch(self, texts):
+        return [["joy", "neutral"] for _ in texts]
+
+
+@pytest.fixture
+def local(monkeypatch):
+    SlowModel.loads = FakeEmotionModel.loads = 0
+    monkeypatch.setattr(vectorizer_local, "load_embedding_model", SlowModel)
+    monkeypatch.setattr(reranker_local, "load_reranker_model", SlowModel)
+    monkeypatch.setattr(vectorizer_local.EmbeddingFactory, "_embedding_instance", None)
+    monkeypatch.setattr(reranker_local.RerankerFactory, "_reranker_instance", None)
+    # RoBertEmotionGo downloads the tokenizer, the provider only needs the class it imports lazily
+    monkeypatch.setitem(sys.modules, "app.core.strategy.get_emotions", types.SimpleNamespace(RoBertEmotionGo=FakeEmotionModel))
+    provider = LocalModelProvider(workers=4)
+    yield provider
+    asyncio.run(provider.close())
+
+
+def test_local_models_load_once_under_concurrent_first_use(local):
+    async def run():
+        return await asyncio.gather(
+            *(local.embed([f"text {i}"]) for i in range(4)),
+            *(local.rerank([["q", "passage"]]) for _ in range(4)),
+            *(local.emotions_batch(["hi", "there"]) for _ in range(4)),
+        )
+
+    results = asyncio.run(run())
+    assert SlowModel.loads == 2 and FakeEmotionModel.loads == 1
+    assert all(r.shape == (1, 4) for r in results[:4])
+    assert results[4:8] == [[7.0]] * 4 and results[8:] == [[["joy", "neutral"]] * 2] * 4
+
+
+def test_local_inference_runs_on_the_model_pool(local):
+    async def run():
+        await local.embed(["a", "b"])
+        await local.rerank([["q", "p"]])
+        return threading.current_thread().name
+
+    loop_thread = asyncio.run(run())
+    threads = vectorizer_local.EmbeddingFactory._embedding_instance.threads | reranker_local.RerankerFactory._reranker_instance.threads
+    assert threads and all(name.startswith("model") for name in threads) and loop_thread not in threads
+
+
+def test_http_provider_calls_each_service():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        body = json.loads(request.content) if request.content else None
+        if request.url.path == "/vectorize":
+            vectors = np.arange(len(body["text"]) * 3, dtype=np.float32).reshape(-1, 3)
+            return httpx.Response(200, content=vectors.tobytes(), headers={
+                "content-type": "application/x-embedding-f32", EMBEDDING_SHAPE_HEADER: f"{len(body['text'])},3",
+            })
+        if request.url.path == "/rerank":
+            return httpx.Response(200, json={"scores": [0.5] * len(body["text_list"])})
+        if request.url.path == "/emotion-score":
+            labels = [["joy"] for _ in body["text"]] if isinstance(body["text"], list) else ["joy"]
+            return httpx.Response(200, json={"emotions": labels})
+        return httpx.Response(200, json={"status_ok": True})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = HttpModelProvider(client)
+            return (
+                await provider.embed(["a", "b"], priority="query"),
+                await provider.rerank([["q", "a"], ["q", "b"]]),
+                await provider.emotions("hi"),
+                await provider.emotions_batch(["hi", "there"]),
+                await provider.health(),
+            )
+
+    vectors, scores, single, batch, health = asyncio.run(run())
+    np.testing.assert_array_equal(vectors, np.arange(6, dtype=np.float32).reshape(2, 3))
+    assert scores == [0.5, 0.5] and single == ["joy"] and batch == [["joy"], ["joy"]]
+    assert set(health) == {"vectorizer", "reranker", "emotion"}
+
+    sent = {(r.url.port, r.url.path): r for r in requests}
+    assert json.loads(sent[(8083, "/vectorize")].content) == {"text": ["a", "b"], "priority": "query"}
+    assert json.loads(sent[(8081, "/rerank")].content) == {"text_list": [["q", "a"], ["q", "b"]]}
+
+
+@pytest.mark.parametrize("mode, cls", [("local", LocalModelProvider), ("http", HttpModelProvider)])
+def test_get_provider_follows_the_setting(monkeypatch, mode, cls):
+    monkeypatch.setattr(settings.serving, "model_provider", mode)
+    provider = get_provider(httpx.AsyncClient())
+    assert type(provider) is cls
+    asyncio.run(provider.close())
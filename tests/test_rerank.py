@@ -0,0 +1,73 @@
+# test_rerank.py
+
+import asyncio
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.factory.api import reranker_api
+from app.core.strategy.congnitive_reranker import cognitive_relevance_rerank
+from app.schemas.rerank_schema import RerankInput
+
+CONTEXT = {"emotion": "joy", "timestamp": datetime(2025, 7, 20, tzinfo=timezone.utc)}
+
+
+class FakeCrossEncoder:
+    """Scores a pair by the length of its passage"""
+    def predict(self, pairs, batch_size=32, convert_to_numpy=True):
+        return np.array([float(len(passage)) for _, passage in pairs])
+
+
+class FakeProvider:
+    def __init__(self, drop=0):
+        self.drop = drop
+        self.pairs = []
+
+    async def rerank(self, pairs):
+        self.pairs.append(pairs)
+        return [float(len(passage)) for _, passage in pairs][self.drop:]
+
+
+def make_chunks(contents):
+    return [
+        SimpleNamespace(properties={"content": content, "emotions": [], "timestamp": [], "temporal_context": {}}, metadata=None)
+        for content in contents
+    ]
+
+
+@pytest.mark.parametrize("text_list", [[], [["query"]], [["query", "passage", "extra"]], [["query", " "]], [["query", 3]], ["query"]])
+def test_input_must_be_non_empty_pairs(text_list):
+    with pytest.raises(ValidationError):
+        RerankInput(text_list=text_list)
+
+
+def test_endpoint_returns_one_score_per_pair(monkeypatch):
+    monkeypatch.setattr(reranker_api, "load_reranker_model", FakeCrossEncoder)
+
+    with TestClient(reranker_api.app) as client:
+        response = client.post("/rerank", json={"text_list": [["q", "a"], ["q", "abc"], ["q", "ab"]]})
+        assert response.status_code == 200
+        assert response.json() == {"scores": [1.0, 3.0, 2.0]}
+        assert client.post("/rerank", json={"text_list": [["q", "a", "b"]]}).status_code == 422
+
+
+def test_empty_candidates_are_dropped_before_the_batch():
+    provider = FakeProvider()
+    chunks = make_chunks(["a longer passage", "", "  ", None, "short"])
+    ranked = asyncio.run(cognitive_relevance_rerank("query", chunks, CONTEXT, provider))
+
+    assert provider.pairs == [[["query", "a longer passage"], ["query", "short"]]]
+    assert [props["content"] for _, props, _ in ranked] == ["a longer passage", "short"]
+    assert asyncio.run(cognitive_relevance_rerank("query", make_chunks(["", " "]), CONTEXT, provider)) == []
+    assert len(provider.pairs) == 1
+
+
+def test_score_count_mismatch_raises():
+    with pytest.raises(ValueError, match="2 scores for 3 candidates"):
+        asyncio.run(cognitive_relevance_rerank("query", make_chunks(["a", "b", "c"]), CONTEXT, FakeProvider(drop=1)))
@@ -0,0 +1,77 @@
+# test_retrieval_profiles.py
+
+import asyncio
+import sys
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.strategy import memory_retriever
+from app.core.weaviate.profiles import LEAN, DEBUG
+
+
+class FakeCollection:
+    def __init__(self):
+        self.calls = []
+        self.query = self
+
+    async def hybrid(self, **kwargs):
+        self.calls.append(kwargs)
+        props = {
+            "content": "sam: hello",
+            "emotions": ["joy"],
+            "timestamp": [datetime(2025, 1, 1, tzinfo=timezone.utc)],
+            "temporal_context": {"prev_chunk_id": None},
+        }
+        return SimpleNamespace(objects=[SimpleNamespace(properties=props, metadata=SimpleNamespace(explain_score="fusion"))])
+
+
+class FakePool:
+    def __init__(self):
+        self.collection = FakeCollection()
+        self.collections = self
+
+    def get(self, name):
+        return self.collection
+
+    @asynccontextmanager
+    async def borrow(self):
+        yield self
+
+
+class FakeProvider:
+    async def rerank(self, pairs):
+        return [0.9 for _ in pairs]
+
+
+async def embed_texts(provider, texts, priority="bulk"):
+    return [[0.0] for _ in texts]
+
+
+def run(monkeypatch, context):
+    monkeypatch.setattr(memory_retriever, "embed_texts", embed_texts)
+    pool = FakePool()
+    result = asyncio.run(memory_retriever.retrieve(pool, FakeProvider(), "hello?", context, top_k=5))
+    return result, pool.collection.calls[0]
+
+
+def test_default_profile_projects_used_fields(monkeypatch):
+    result, call = run(monkeypatch, {"session_id": "s", "emotion": "joy"})
+
+    assert call["return_properties"] == LEAN.return_properties
+    names = [p if isinstance(p, str) else p.name for p in call["return_properties"]]
+    assert names == ["content", "emotions", "timestamp", "temporal_context"]
+    assert call["return_properties"][-1].properties == ["prev_chunk_id"]
+    assert not call["return_metadata"].explain_score
+    assert result["description"] == "Memory found"
+    assert result["top_chunks"][0]["explanation"]["semantic"] is None
+
+
+def test_debug_profile_returns_full_payload_and_explanation(monkeypatch):
+    result, call = run(monkeypatch, {"session_id": "s", "emotion": "joy", "debug": True})
+
+    assert call["return_properties"] is DEBUG.return_properties is None
+    assert call["return_metadata"].explain_score and call["return_metadata"].score
+    assert result["top_chunks"][0]["explanation"]["semantic"] == "fusion"
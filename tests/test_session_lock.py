@@ -0,0 +1,31 @@
+# test_session_lock.py
+
+import subprocess
+import sys
+import os
+import uuid
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.data_pipeline.helper.helperHead import session_lock_key
+
+
+def test_lock_key_is_signed_int64_and_accepts_uuid_or_str():
+    session_id = uuid.uuid4()
+    key = session_lock_key(session_id)
+    assert -2**63 <= key < 2**63
+    assert key == session_lock_key(str(session_id))
+    assert key != session_lock_key(uuid.uuid4())
+
+
+def test_lock_key_is_stable_across_processes():
+    session_id = "78774669-bb58-4f76-963b-507e77c82f4e"
+    code = (
+        "from app.data_pipeline.helper.helperHead import session_lock_key;"
+        f"print(session_lock_key('{session_id}'))"
+    )
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    keys = {
+        subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout.split()[-1]
+        for _ in range(2)
+    }
+    assert keys == {str(session_lock_key(session_id))}
@@ -0,0 +1,59 @@
+# test_splitter.py
+
+import sys
+import os
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.strategy.splitter import DialogSplitter
+
+SENTENCES = [f"Sentence number {i} talks about memory and retrieval." for i in range(40)]
+
+
+def test_short_text_is_one_chunk():
+    assert DialogSplitter(chunk_size=500).split_text("Hello there. How are you?") == ["Hello there. How are you?"]
+
+
+def test_chunks_respect_size_and_end_on_sentences():
+    text = " ".join(SENTENCES)
+    chunks = DialogSplitter(chunk_size=200, chunk_overlap=60).split_text(text)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+    # every sentence survives
+    assert all(any(sentence in chunk for chunk in chunks) for sentence in SENTENCES)
+
+
+def test_consecutive_chunks_overlap():
+    chunks = DialogSplitter(chunk_size=200, chunk_overlap=60).split_text(" ".join(SENTENCES))
+    for previous, following in zip(chunks, chunks[1:]):
+        last_sentence = previous.rsplit(". ", 1)[-1]
+        assert following.startswith(last_sentence)
+
+
+def test_paragraphs_split_before_sentences():
+    paragraphs = [" ".join(SENTENCES[i:i + 3]) for i in range(0, 12, 3)]
+    chunks = DialogSplitter(chunk_size=180, chunk_overlap=0).split_text("\n\n".join(paragraphs))
+    assert chunks == paragraphs
+
+
+def test_unbroken_text_is_cut_by_characters():
+    chunks = DialogSplitter(chunk_size=20, chunk_overlap=5).split_text("a" * 65)
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) >= 65
+
+
+def test_token_length_function():
+    class WordTokenizer:
+        def encode(self, text, add_special_tokens=False):
+            return text.split()
+
+    splitter = DialogSplitter.from_tokenizer(WordTokenizer(), chunk_size=20, chunk_overlap=0)
+    chunks = splitter.split_text(" ".join(SENTENCES))
+    assert all(len(chunk.split()) <= 20 for chunk in chunks)
+
+
+def test_overlap_larger_than_size_is_rejected():
+    with pytest.raises(ValueError):
+        DialogSplitter(chunk_size=10, chunk_overlap=20)
@@ -0,0 +1,62 @@
+# test_stages.py
+
+import asyncio
+import sys
+import os
+import time
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.shared.stages import run_stages
+
+
+async def numbers(n, pulled):
+    for i in range(n):
+        pulled.append(i)
+        yield i
+
+
+def test_items_pass_every_stage_in_order():
+    seen = {"a": [], "b": []}
+
+    async def a(item):
+        seen["a"].append(item)
+
+    async def b(item):
+        seen["b"].append(item)
+
+    asyncio.run(run_stages(numbers(20, []), [a, b], queue_size=2))
+    assert seen["a"] == seen["b"] == list(range(20))
+
+
+def test_stages_overlap_so_time_approaches_the_slowest_stage():
+    async def stage(item):
+        await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    asyncio.run(run_stages(numbers(20, []), [stage, stage, stage], queue_size=2))
+    elapsed = time.perf_counter() - start
+    # Sequential would be 20 * 3 * 10ms
+    assert elapsed < 0.45
+
+
+def test_source_is_pulled_no_faster_than_the_queues_drain():
+    pulled, done = [], []
+
+    async def slow(item):
+        await asyncio.sleep(0.005)
+        # source may run ahead by at most the queued items plus the one in hand
+        assert len(pulled) - len(done) <= 2 + 2
+        done.append(item)
+
+    asyncio.run(run_stages(numbers(30, pulled), [slow], queue_size=2))
+    assert len(done) == 30
+
+
+def test_stage_failure_propagates():
+    async def boom(item):
+        if item == 3:
+            raise ValueError("bad item")
+
+    with pytest.raises(ValueError, match="bad item"):
+        asyncio.run(run_stages(numbers(10, []), [boom], queue_size=1))
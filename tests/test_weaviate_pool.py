@@ -0,0 +1,148 @@
+# test_weaviate_pool.py
+
+import asyncio
+import sys
+import os
+import pytest
+from contextlib import asynccontextmanager
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.conn.weaviate_client import WeaviateClient
+from app.data_pipeline import ingestMessage
+
+
+class FakeClient:
+    created = 0
+
+    def __init__(self):
+        FakeClient.created += 1
+        self.id = FakeClient.created
+        self.connects = 0
+        self.closed = False
+        self.ready = True
+
+    async def connect(self):
+        self.connects += 1
+
+    def is_connected(self):
+        return not self.closed
+
+    async def is_ready(self):
+        return self.ready
+
+    async def close(self):
+        self.closed = True
+
+
+def make_pool(monkeypatch, size=2, health_interval=60.0):
+    pool = WeaviateClient(size=size, health_interval=health_interval)
+    monkeypatch.setattr(pool, "_new_client", FakeClient)
+    asyncio.run(pool.init_client())
+    return pool
+
+
+def test_clients_connect_once_and_are_shared(monkeypatch):
+    pool = make_pool(monkeypatch)
+
+    async def run():
+        seen = []
+        for _ in range(4):
+            async with pool.borrow() as client:
+                seen.append(client)
+        return seen
+
+    seen = asyncio.run(run())
+    assert {c.id for c in seen} == {c.client.id for c in pool._slots}
+    assert all(c.connects == 1 and not c.closed for c in seen)
+    assert pool.metrics()["borrows"] == 4 and pool.metrics()["reconnects"] == 0
+
+
+def test_concurrent_borrows_spread_over_the_pool(monkeypatch):
+    pool = make_pool(monkeypatch)
+
+    async def run():
+        async with pool.borrow() as first, pool.borrow() as second:
+            return first, second, pool.metrics()["active"]
+
+    first, second, active = asyncio.run(run())
+    assert first is not second and active == [1, 1]
+    assert pool.metrics()["active"] == [0, 0]
+
+
+def test_unready_client_is_replaced_on_borrow(monkeypatch):
+    pool = make_pool(monkeypatch, size=1, health_interval=0.0)
+    stale = pool.get()
+    stale.ready = False
+
+    async def run():
+        async with pool.borrow() as client:
+            return client
+
+    client = asyncio.run(run())
+    assert client is not stale and stale.closed
+    assert pool.get() is client and pool.metrics()["reconnects"] == 1
+
+
+def test_replaced_client_stays_open_until_its_borrowers_finish(monkeypatch):
+    pool = make_pool(monkeypatch, size=1, health_interval=0.0)
+    stale = pool.get()
+
+    async def run():
+        async with pool.borrow() as held:
+            stale.ready = False
+            async with pool.borrow() as fresh:
+                # The held client is retired, not closed under the borrower still using it
+                assert fresh is not held and not held.closed
+                assert pool.metrics()["retired"] == 1
+            assert not held.closed
+        return held, fresh
+
+    held, fresh = asyncio.run(run())
+    assert held is stale and stale.closed and not fresh.closed
+    assert pool.metrics()["retired"] == 0 and pool.metrics()["reconnects"] == 1
+
+
+def test_error_inside_borrow_forces_a_check(monkeypatch):
+    pool = make_pool(monkeypatch, size=1, health_interval=3600.0)
+    stale = pool.get()
+
+    async def failing():
+        async with pool.borrow():
+            stale.ready = False
+            raise ConnectionError("channel dropped")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(failing())
+
+    async def run():
+        async with pool.borrow() as client:
+            return client
+
+    assert asyncio.run(run()) is not stale and pool.metrics()["failed_checks"] == 1
+
+
+def test_close_closes_every_client(monkeypatch):
+    pool = make_pool(monkeypatch, size=3)
+    clients = [slot.client for slot in pool._slots]
+    asyncio.run(pool.close())
+    assert all(c.closed for c in clients)
+    with pytest.raises(RuntimeError):
+        pool.get()
+
+
+def test_failed_ingestion_flags_the_borrowed_client(monkeypatch):
+    @asynccontextmanager
+    async def get_db():
+        raise ConnectionError("weaviate unavailable")
+        yield
+
+    monkeypatch.setattr(ingestMessage, "get_db", get_db)
+    pool = make_pool(monkeypatch, size=1, health_interval=3600.0)
+
+    async def ingest():
+        async with pool.borrow() as client:
+            return await ingestMessage.ingest_ready_messages("s", client=client, provider=None)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(ingest())
+    assert pool._slots[0].checked_at == float("-inf")
@@ -0,0 +1,109 @@
+# test_weaviate_writer.py
+
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+from uuid import UUID, uuid4, uuid5, NAMESPACE_DNS
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.data_pipeline.push_to_weaviate import ingest_chunks, existing_chunk_ids, delete_session_chunks
+
+
+def chunk_id(i):
+    return str(uuid5(NAMESPACE_DNS, f"chunk-{i}"))
+
+
+def make_chunk(i):
+    return {
+        "id": chunk_id(i),
+        "content": f"content {i}",
+        "metadata": {"session_id": uuid4(), "emotions": [], "temporal_context": {}},
+    }
+
+
+class FakeCollection:
+    def __init__(self, fail_ids=(), fail_calls=()):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_ids = set(fail_ids)
+        self.fail_calls = set(fail_calls)
+        self.data = self
+
+    async def insert_many(self, objects):
+        call = len(self.calls)
+        self.calls.append(objects)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if call in self.fail_calls:
+            raise RuntimeError("unavailable")
+        errors = {
+            i: SimpleNamespace(message="rejected")
+            for i, obj in enumerate(objects) if str(obj.uuid) in self.fail_ids
+        }
+        return SimpleNamespace(errors=errors)
+
+
+def fake_client(collection):
+    return SimpleNamespace(collections=SimpleNamespace(get=lambda name: collection))
+
+
+def test_slices_and_bounds_concurrency():
+    collection = FakeCollection()
+    chunks = [make_chunk(i) for i in range(10)]
+    result = asyncio.run(ingest_chunks(fake_client(collection), chunks, [[0.1]] * 10, batch_size=3, concurrency=2))
+
+    assert [len(call) for call in collection.calls] == [3, 3, 3, 1]
+    assert collection.max_in_flight == 2
+    assert result.ok and sorted(result.written) == sorted(c["id"] for c in chunks)
+
+
+def test_reports_object_and_batch_failures():
+    collection = FakeCollection(fail_ids={chunk_id(1)}, fail_calls={1})
+    chunks = [make_chunk(i) for i in range(4)]
+    result = asyncio.run(ingest_chunks(fake_client(collection), chunks, [[0.1]] * 4, batch_size=2, concurrency=1))
+
+    assert not result.ok
+    assert result.written == [chunk_id(0)]
+    assert result.failed == {chunk_id(1): "rejected", chunk_id(2): "unavailable", chunk_id(3): "unavailable"}
+
+
+class FakeQuery:
+    def __init__(self, stored):
+        self.stored = stored
+        self.calls = []
+
+    async def fetch_objects(self, filters, limit, return_properties):
+        ids = filters.value
+        self.calls.append(ids)
+        assert return_properties == [] and limit == len(ids)
+        return SimpleNamespace(objects=[SimpleNamespace(uuid=UUID(i)) for i in ids if i in self.stored])
+
+
+def test_existing_chunk_ids_in_few_queries():
+    ids = [chunk_id(i) for i in range(7)]
+    query = FakeQuery(stored={ids[1], ids[5]})
+    client = fake_client(SimpleNamespace(query=query))
+
+    existing = asyncio.run(existing_chunk_ids(client, ids + [ids[1]], batch_size=3))
+
+    assert existing == {ids[1], ids[5]}
+    assert [len(call) for call in query.calls] == [3, 3, 1]
+
+
+def test_delete_session_chunks_filters_on_session():
+    session_id = uuid4()
+    wheres = []
+
+    async def delete_many(where):
+        wheres.append(where)
+        return SimpleNamespace(successful=3)
+
+    collection = SimpleNamespace(data=SimpleNamespace(delete_many=delete_many))
+    asyncio.run(delete_session_chunks(fake_client(collection), str(session_id)))
+
+    assert len(wheres) == 1
+    assert wheres[0].target == "session_id" and wheres[0].value == session_id
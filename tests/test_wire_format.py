@@ -0,0 +1,46 @@
+# test_wire_format.py
+
+import asyncio
+import httpx
+import numpy as np
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.conn.clients import post_embeddings
+
+VECTORS = np.arange(12, dtype=np.float32).reshape(3, 4) / 7
+
+
+def fetch(handler, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await post_embeddings(client, "http://vectorizer/vectorize", {"text": ["a", "b", "c"]}, **kwargs)
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("media_type,dtype", [("application/x-embedding-f32", "<f4"), ("application/x-embedding-f16", "<f2")])
+def test_binary_response_is_decoded(media_type, dtype):
+    def handler(request):
+        assert request.headers["accept"].startswith(media_type)
+        return httpx.Response(
+            200,
+            content=VECTORS.astype(dtype).tobytes(),
+            headers={"content-type": media_type, "X-Embedding-Shape": "3,4"},
+        )
+
+    vectors = fetch(handler, media_type=media_type)
+
+    assert vectors.shape == (3, 4) and vectors.dtype == np.dtype(dtype)
+    np.testing.assert_array_equal(vectors, VECTORS.astype(dtype))
+
+
+def test_json_fallback():
+    def handler(request):
+        return httpx.Response(200, json={"vector": VECTORS.tolist()})
+
+    vectors = fetch(handler)
+
+    assert vectors.dtype == np.float32
+    np.testing.assert_array_equal(vectors, VECTORS)